@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping
+
+import numpy as np
+
+from app.tabular import TableFormatError, list_column_views
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ID_COLUMNS = ("item_id", "symbol")
+
+
+class ArrowFormatError(ValueError):
+    pass
+
+
+def is_arrow_media_type(value: str | None) -> bool:
+    return bool(value) and ARROW_STREAM_MEDIA_TYPE in value.lower()
+
+
+def parse_query_parameters(params: Mapping[str, str]) -> Dict[str, Any]:
+    # Query values are JSON-decoded when possible so `horizon=12` and
+    # `quantiles=[0.1,0.5,0.9]` arrive with their natural types.
+    parsed: Dict[str, Any] = {}
+    for key, value in params.items():
+        try:
+            parsed[key] = json.loads(value)
+        except json.JSONDecodeError:
+            parsed[key] = value
+    return parsed
+
+
+def read_series_table(body: bytes) -> List[Dict[str, Any]]:
+    import polars as pl
+
+    try:
+        frame = pl.read_ipc_stream(io.BytesIO(body))
+    except Exception as exc:
+        raise ArrowFormatError("Request body must be an Arrow IPC stream.") from exc
+    if "target" not in frame.columns:
+        raise ArrowFormatError("Arrow request must contain a list<float> `target` column.")
+
+    try:
+        views = list_column_views(frame["target"])
+    except TableFormatError as exc:
+        raise ArrowFormatError(str(exc)) from exc
+    series: List[Dict[str, Any]] = [{"target": view} for view in views]
+    for column in ID_COLUMNS:
+        if column in frame.columns:
+            for item, value in zip(series, frame[column].to_list()):
+                item[column] = value
+    return series
+
+
+def write_forecast_table(
+    forecasts: List[Dict[str, Any]],
+    series: List[Dict[str, Any]] | None = None,
+) -> bytes:
+    return _write_stream(forecast_frame(forecasts, series))
+
+
+def forecast_frame(
+    forecasts: List[Dict[str, Any]],
+    series: List[Dict[str, Any]] | None = None,
+) -> pl.DataFrame:
+    import polars as pl
+
+    if not forecasts:
+        return pl.DataFrame({"mean": pl.Series([], dtype=pl.List(pl.Float64))})
+    if any("mean" not in forecast for forecast in forecasts):
+        raise ArrowFormatError("Arrow responses are only available for tasks that return mean forecasts.")
+
+    columns: Dict[str, pl.Series] = {}
+    if series is not None:
+        for column in ID_COLUMNS:
+            if any(column in item for item in series):
+                columns[column] = pl.Series(column, [item.get(column) for item in series])
+    columns["mean"] = _matrix_column("mean", [forecast["mean"] for forecast in forecasts])
+
+    quantile_names = list((forecasts[0].get("quantiles") or {}).keys())
+    for name in quantile_names:
+        columns[f"q{name}"] = _matrix_column(
+            f"q{name}",
+            [(forecast.get("quantiles") or {}).get(name) or [] for forecast in forecasts],
+        )
+    return pl.DataFrame(list(columns.values()))
+
+
+def _matrix_column(name: str, rows: List[Any]) -> pl.Series:
+    import polars as pl
+
+    lengths = {len(row) for row in rows}
+    if len(lengths) == 1:
+        # Equal-length rows become one 2-D buffer and a fixed-size list column.
+        return pl.Series(name, np.asarray(rows, dtype=np.float64))
+    return pl.Series(name, [np.asarray(row, dtype=np.float64) for row in rows], dtype=pl.List(pl.Float64))
+
+
+def _write_stream(frame: pl.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    frame.write_ipc_stream(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+from app.metrics import Histogram
+from app.providers.base import ModelProvider
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+WAIT_SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+InvokeRunner = Callable[[ModelProvider, str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+async def invoke_inline(provider: ModelProvider, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return provider.invoke(task, payload)
+
+
+@dataclass(slots=True)
+class _PendingRequest:
+    series: List[Dict[str, Any]]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass(slots=True)
+class _PendingBatch:
+    provider: ModelProvider
+    task: str
+    params: Dict[str, Any]
+    requests: List[_PendingRequest] = field(default_factory=list)
+    size: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        max_batch_size: int,
+        max_wait_ms: float,
+        runner: InvokeRunner = invoke_inline,
+    ) -> None:
+        self.runner = runner
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.batch_size = Histogram("batch_size", BATCH_SIZE_BUCKETS)
+        self.wait_seconds = Histogram("batch_wait_seconds", WAIT_SECONDS_BUCKETS)
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        self._running: set[asyncio.Task] = set()
+        self.split_batches = 0
+
+    async def submit(self, provider: ModelProvider, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        request = provider.batch_request(task, payload)
+        if request is None:
+            return await self.runner(provider, task, payload)
+
+        group, series_payload = request
+        key = (id(provider), group)
+        series = list(series_payload.get("series") or [])
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.get(key)
+        if batch is not None and batch.size + len(series) > self.max_batch_size:
+            self._flush(key, batch)
+            batch = None
+        if batch is None:
+            params = {name: value for name, value in series_payload.items() if name != "series"}
+            batch = _PendingBatch(provider=provider, task=task, params=params)
+            self._pending[key] = batch
+            batch.timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush, key, batch)
+
+        batch.requests.append(_PendingRequest(series=series, future=future, enqueued_at=time.perf_counter()))
+        batch.size += len(series)
+        if batch.size >= self.max_batch_size:
+            self._flush(key, batch)
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batch_size": self.batch_size.snapshot(),
+            "wait_seconds": self.wait_seconds.snapshot(),
+            "split_batches": self.split_batches,
+        }
+
+    def _flush(self, key: Hashable, batch: _PendingBatch) -> None:
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        running = asyncio.ensure_future(self._run(batch))
+        self._running.add(running)
+        running.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        started = time.perf_counter()
+        for request in batch.requests:
+            self.wait_seconds.observe(started - request.enqueued_at)
+        self.batch_size.observe(batch.size)
+
+        series = [item for request in batch.requests for item in request.series]
+        try:
+            output = await self._invoke(batch, series)
+        except Exception as exc:
+            if len(batch.requests) == 1:
+                self._resolve(batch.requests[0], exc=exc)
+                return
+            # One malformed request must not fail the callers merged with it,
+            # so each request is retried on its own and only the culprit fails.
+            self.split_batches += 1
+            await asyncio.gather(*(self._run_alone(batch, request) for request in batch.requests))
+            return
+
+        offset = 0
+        for request in batch.requests:
+            count = len(request.series)
+            self._resolve(request, {**output, "forecasts": output["forecasts"][offset : offset + count]})
+            offset += count
+
+    async def _run_alone(self, batch: _PendingBatch, request: _PendingRequest) -> None:
+        try:
+            output = await self._invoke(batch, request.series)
+        except Exception as exc:
+            self._resolve(request, exc=exc)
+        else:
+            self._resolve(request, output)
+
+    async def _invoke(self, batch: _PendingBatch, series: List[Dict[str, Any]]) -> Dict[str, Any]:
+        output = await self.runner(batch.provider, batch.task, {**batch.params, "series": series})
+        forecasts = output.get("forecasts")
+        if not isinstance(forecasts, list) or len(forecasts) != len(series):
+            raise RuntimeError("Provider returned a forecast count that does not match the batched series.")
+        return output
+
+    @staticmethod
+    def _resolve(request: _PendingRequest, output: Dict[str, Any] | None = None, exc: Exception | None = None) -> None:
+        if request.future.done():
+            return
+        if exc is not None:
+            request.future.set_exception(exc)
+        else:
+            request.future.set_result(output)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import multiprocessing as mp
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from app.arrow import forecast_frame
+from app.providers.base import ModelProvider
+from app.tabular import TableFormatError, collect_series, scan_table
+from app.workers import core_sets, pin_process
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+logger = logging.getLogger("unitshub.bulk")
+
+MANIFEST = "_unitshub_bulk.json"
+TABLE_PATTERNS = ("**/*.parquet", "**/*.csv")
+
+
+@dataclass(frozen=True, slots=True)
+class BulkJob:
+    input_path: str
+    output_dir: str
+    target_column: str
+    series_id_column: str
+    horizon: int
+    timestamp_column: str | None = None
+    task: str | None = None
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    batch_size: int = 256
+    # Each input file is split into this many units by hashing the series id,
+    # which bounds memory per unit and makes checkpoints finer grained.
+    hash_buckets: int = 1
+
+    def fingerprint(self) -> Dict[str, Any]:
+        # Everything that changes which rows land in a part file or what they contain.
+        config = asdict(self)
+        config.pop("output_dir")
+        config.pop("batch_size")
+        return config
+
+
+@dataclass(frozen=True, slots=True)
+class WorkUnit:
+    index: int
+    path: str
+    bucket: int
+
+    @property
+    def name(self) -> str:
+        return f"part-{self.index:05d}.parquet"
+
+    @property
+    def empty_name(self) -> str:
+        # Marks a unit that had no series; see forecast_unit.
+        return f"part-{self.index:05d}.empty"
+
+    def done(self, output_dir: str) -> bool:
+        return any(os.path.exists(os.path.join(output_dir, name)) for name in (self.name, self.empty_name))
+
+
+def input_files(path: str) -> List[str]:
+    if os.path.isdir(path):
+        for pattern in TABLE_PATTERNS:
+            files = sorted(glob.glob(os.path.join(path, pattern), recursive=True))
+            if files:
+                return files
+        files = []
+    elif glob.has_magic(path):
+        files = sorted(glob.glob(path, recursive=True))
+    else:
+        files = [path] if os.path.exists(path) else []
+    if not files:
+        raise TableFormatError(f"No Parquet or CSV files found at [{path}].")
+    return files
+
+
+def plan_units(job: BulkJob) -> List[WorkUnit]:
+    buckets = max(1, job.hash_buckets)
+    return [
+        WorkUnit(index=file_index * buckets + bucket, path=path, bucket=bucket)
+        for file_index, path in enumerate(input_files(job.input_path))
+        for bucket in range(buckets)
+    ]
+
+
+def prepare_output(job: BulkJob, model: Dict[str, Any], restart: bool = False) -> Tuple[List[WorkUnit], int]:
+    # Completed units are the part files already on disk; anything else is
+    # (re)done, so a crashed run resumes where it stopped.
+    import polars as pl
+
+    os.makedirs(job.output_dir, exist_ok=True)
+    manifest_path = os.path.join(job.output_dir, MANIFEST)
+    # Hash buckets depend on polars' hash function, so the version is part of the config.
+    config = {**job.fingerprint(), "model": model, "polars": pl.__version__}
+    units = plan_units(job)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as handle:
+            previous = json.load(handle)
+        if previous.get("config") != config:
+            if not restart:
+                raise ValueError(
+                    f"[{job.output_dir}] holds a run with a different configuration; "
+                    "use another output directory or restart the run."
+                )
+            for name in os.listdir(job.output_dir):
+                if name.startswith("part-"):
+                    os.unlink(os.path.join(job.output_dir, name))
+    with open(manifest_path, "w", encoding="utf-8") as handle:
+        json.dump({"config": config, "units": len(units)}, handle, indent=2, default=str)
+
+    pending = [unit for unit in units if not unit.done(job.output_dir)]
+    return pending, len(units) - len(pending)
+
+
+def read_unit(job: BulkJob, unit: WorkUnit) -> Tuple[List[Any], List[np.ndarray]]:
+    import polars as pl
+
+    frame = scan_table(unit.path)
+    if job.hash_buckets > 1:
+        frame = frame.filter(pl.col(job.series_id_column).hash(seed=0) % job.hash_buckets == unit.bucket)
+    if job.timestamp_column:
+        frame = frame.sort(job.timestamp_column)
+    try:
+        ids, views = collect_series(frame, job.target_column, job.series_id_column)
+    except pl.exceptions.PolarsError as exc:
+        raise TableFormatError(f"Could not read [{unit.path}]: {exc}") from exc
+    return ids or [], views
+
+
+def forecast_unit(provider: ModelProvider, job: BulkJob, task: str, unit: WorkUnit) -> int:
+    import polars as pl
+
+    ids, views = read_unit(job, unit)
+    if not ids:
+        # A part without rows would have null-typed columns and no quantile
+        # columns, which breaks reading the output directory as one dataset.
+        open(os.path.join(job.output_dir, unit.empty_name), "w").close()
+        return 0
+
+    forecasts: List[Dict[str, Any]] = []
+    for start in range(0, len(views), job.batch_size):
+        batch = views[start : start + job.batch_size]
+        payload = {**job.parameters, "series": [{"target": view} for view in batch], "horizon": job.horizon}
+        output = provider.invoke(task, payload)
+        results = output.get("forecasts") or []
+        if len(results) != len(batch):
+            raise RuntimeError("Provider returned a forecast count that does not match the batch.")
+        forecasts.extend(results)
+
+    frame = forecast_frame(forecasts).insert_column(0, pl.Series(job.series_id_column, ids))
+    _write_part(frame, os.path.join(job.output_dir, unit.name))
+    return len(ids)
+
+
+def _write_part(frame: pl.DataFrame, path: str) -> None:
+    # Written under a temporary name so a crash never leaves a part that looks complete.
+    tmp_path = f"{path}.tmp"
+    frame.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def run_units(
+    factory: Callable[[], ModelProvider],
+    model_path: str,
+    device: str,
+    job: BulkJob,
+    units: List[WorkUnit],
+    cores: List[int] | None = None,
+    threads: int = 0,
+    mmap_weights: bool = True,
+) -> int:
+    if cores is not None:
+        pin_process(cores, threads)
+    provider = factory()
+    provider.load(model_path, device)
+    if mmap_weights and device == "cpu":
+        provider.map_weights(model_path)
+    task = job.task or provider.default_legacy_task()
+    if not task or not provider.supports_task(task):
+        raise ValueError(f"Bulk forecasting needs a univariate forecast task; [{task}] is not supported.")
+
+    total = 0
+    for unit in units:
+        started = time.perf_counter()
+        count = forecast_unit(provider, job, task, unit)
+        elapsed = time.perf_counter() - started
+        total += count
+        logger.info(
+            "Unit %s (%s, bucket %d): %d series in %.1fs (%.0f series/s).",
+            unit.name,
+            unit.path,
+            unit.bucket,
+            count,
+            elapsed,
+            count / elapsed if elapsed else 0.0,
+        )
+    provider.unload()
+    return total
+
+
+def _shard_main(*args: Any) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    run_units(*args)
+
+
+def run_bulk(
+    job: BulkJob,
+    factory: Callable[[], ModelProvider],
+    model_path: str,
+    device: str = "cpu",
+    model: Dict[str, Any] | None = None,
+    processes: int = 1,
+    threads_per_process: int = 0,
+    mmap_weights: bool = True,
+    restart: bool = False,
+) -> Dict[str, Any]:
+    pending, completed = prepare_output(job, model or {"path": model_path}, restart)
+    logger.info("%d units to forecast, %d already complete.", len(pending), completed)
+    started = time.perf_counter()
+    processes = min(max(1, processes), len(pending))
+
+    if processes <= 1:
+        if pending:
+            run_units(factory, model_path, device, job, pending, mmap_weights=mmap_weights)
+    else:
+        # Round-robin shards, each pinned to its own contiguous core range like
+        # the inference workers. Units are independent, so a failed shard only
+        # leaves its own units to redo on the next run.
+        context = mp.get_context("spawn")
+        shards = []
+        for index, cores in enumerate(core_sets(processes)):
+            threads = threads_per_process or max(1, len(cores))
+            args = (factory, model_path, device, job, pending[index::processes], cores, threads, mmap_weights)
+            process = context.Process(target=_shard_main, args=args, name=f"unitshub-bulk-{index}")
+            process.start()
+            shards.append(process)
+        for process in shards:
+            process.join()
+        failed = [process.name for process in shards if process.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Bulk shards failed: {', '.join(failed)}. Rerun the job to resume.")
+
+    import polars as pl
+
+    paths = [os.path.join(job.output_dir, unit.name) for unit in pending]
+    paths = [path for path in paths if os.path.exists(path)]
+    return {
+        "units": len(pending) + completed,
+        "forecast_units": len(pending),
+        "skipped_units": completed,
+        "series": pl.scan_parquet(paths).select(pl.len()).collect().item() if paths else 0,
+        "seconds": time.perf_counter() - started,
+        "output_dir": job.output_dir,
+    }
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Set
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: Dict[str, Any]
+    size: int
+    expires_at: float
+
+
+def cache_directives(header: str | None) -> Set[str]:
+    if not header:
+        return set()
+    return {part.strip().split("=", 1)[0].lower() for part in header.split(",") if part.strip()}
+
+
+def payload_digest(model_key: str, task: str, payload: Dict[str, Any]) -> str:
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(model_key.encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(task.encode("utf-8"))
+    _feed(hasher, payload)
+    return hasher.hexdigest()
+
+
+def _feed(hasher: Any, value: Any) -> None:
+    # Numeric sequences are hashed as raw float64 bytes so lists and NumPy
+    # views of the same series share a key without a JSON round trip.
+    if isinstance(value, np.ndarray):
+        hasher.update(b"a")
+        hasher.update(np.ascontiguousarray(value, dtype=np.float64).tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b"{")
+        for key in sorted(value):
+            # Length-prefixed so a key can never run into the value that follows it.
+            encoded = str(key).encode("utf-8")
+            hasher.update(len(encoded).to_bytes(8, "little"))
+            hasher.update(encoded)
+            _feed(hasher, value[key])
+        hasher.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (int, float)) and not isinstance(value[0], bool):
+            try:
+                array = np.asarray(value, dtype=np.float64)
+            except (TypeError, ValueError):
+                array = None
+            if array is not None and array.ndim == 1:
+                _feed(hasher, array)
+                return
+        hasher.update(b"[")
+        for item in value:
+            _feed(hasher, item)
+            hasher.update(b",")
+        hasher.update(b"]")
+    else:
+        hasher.update(json.dumps(value, default=str).encode("utf-8"))
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: float,
+        disk_dir: str | None = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = float(ttl_seconds)
+        self.disk_dir = disk_dir
+        # A non-positive limit leaves the disk tier unbounded.
+        self.disk_max_bytes = int(disk_max_bytes)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Running estimate of the disk tier size; every sweep recounts it from the directory.
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            with self._disk_lock:
+                self._sweep_disk(self.disk_max_bytes)
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                self._remove(key)
+
+        value = self._read_disk(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._store(key, value, len(json.dumps(value, separators=(",", ":"))), now)
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        encoded = json.dumps(value, separators=(",", ":"), default=_json_default)
+        now = time.time()
+        self._store(key, value, len(encoded), now)
+        self._write_disk(key, encoded)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": True,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_dir": self.disk_dir,
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes,
+                "disk_evictions": self.disk_evictions,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _store(self, key: str, value: Dict[str, Any], size: int, now: float) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(value=value, size=size, expires_at=now + self.ttl_seconds)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir or "", f"{key}.json")
+
+    def _read_disk(self, key: str, now: float) -> Dict[str, Any] | None:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if os.path.getmtime(path) + self.ttl_seconds <= now:
+                os.unlink(path)
+                return None
+            with open(path, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, encoded: str) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        with self._disk_lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    handle.write(encoded)
+                replaced = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                return
+            self._disk_bytes += len(encoded) - replaced
+            if 0 < self.disk_max_bytes < self._disk_bytes:
+                # Prune below the limit so a full tier is not rescanned on every write.
+                self._sweep_disk(self.disk_max_bytes * 9 // 10)
+
+    def _sweep_disk(self, limit: int) -> None:
+        # Expired files go first, then the oldest results until the tier fits in `limit`.
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            try:
+                stat = entry.stat()
+                if stat.st_mtime + self.ttl_seconds <= now:
+                    os.unlink(entry.path)
+                    continue
+            except OSError:
+                continue
+            # Temporary files still being written are left alone until they expire.
+            if entry.name.endswith(".json"):
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        if limit > 0:
+            for _, size, path in sorted(files):
+                if total <= limit:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+                self.disk_evictions += 1
+        self._disk_bytes = total
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
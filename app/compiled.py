@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import torch
+
+
+logger = logging.getLogger("unitshub.compiled")
+
+
+class BucketedCompiledForward:
+    # Runs a (values, padding, freq) forward through torch.compile graphs
+    # specialised to fixed (batch, length) buckets. Inputs are padded up to the
+    # nearest bucket: extra rows repeat row 0, extra steps are left-padded and
+    # masked. Shapes beyond every bucket run eagerly.
+    def __init__(
+        self,
+        forward: Callable[..., Any],
+        buckets: List[Tuple[int, int]],
+        backend: str = "inductor",
+        mode: str | None = None,
+    ) -> None:
+        self.forward = forward
+        self.buckets = sorted(set(buckets), key=lambda bucket: (bucket[1], bucket[0]))
+        self.backend = backend
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.padded_rows = 0
+        self.padded_steps = 0
+        self.failed: str | None = None
+        self.compile_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        dynamo_config = torch._dynamo.config
+        limit_name = "recompile_limit" if hasattr(dynamo_config, "recompile_limit") else "cache_size_limit"
+        setattr(dynamo_config, limit_name, max(getattr(dynamo_config, limit_name), 2 * len(self.buckets)))
+        self._compiled = torch.compile(self._run, dynamic=False, backend=backend, mode=mode)
+
+    def __call__(self, past_values: torch.Tensor, past_values_padding: torch.Tensor, freq: torch.Tensor, **kwargs: Any):
+        if self.failed is not None or kwargs:
+            return self._eager(past_values, past_values_padding, freq, **kwargs)
+
+        batch_size, length = past_values.shape
+        bucket = self._bucket_for(batch_size, length)
+        if bucket is None:
+            chunk = self._largest_batch(length)
+            if chunk is None:
+                return self._eager(past_values, past_values_padding, freq)
+            # Larger batches are split into bucket-sized chunks.
+            parts = [
+                self(past_values[start : start + chunk], past_values_padding[start : start + chunk], freq[start : start + chunk])
+                for start in range(0, batch_size, chunk)
+            ]
+            return _concat_outputs(parts)
+
+        bucket_batch, bucket_length = bucket
+        values, padding, freqs = _pad_inputs(past_values, past_values_padding, freq, bucket_batch, bucket_length)
+        key = f"{bucket_batch}x{bucket_length}"
+        started = time.perf_counter()
+        try:
+            output = self._compiled(values, padding, freqs)
+        except Exception as exc:
+            logger.warning("Compiled forward failed for bucket %s; using eager execution: %s", key, exc)
+            self.failed = str(exc)
+            return self._eager(past_values, past_values_padding, freq)
+        with self._lock:
+            self.hits += 1
+            self.padded_rows += bucket_batch - batch_size
+            self.padded_steps += (bucket_length - length) * batch_size
+            if key not in self.compile_seconds:
+                # The first call of each bucket traces and compiles its graph.
+                self.compile_seconds[key] = time.perf_counter() - started
+        return _slice_output(output, batch_size)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "mode": self.mode,
+                "buckets": [f"{batch}x{length}" for batch, length in self.buckets],
+                "compiled_buckets": dict(self.compile_seconds),
+                "compile_seconds": sum(self.compile_seconds.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / calls if calls else None,
+                "padded_rows": self.padded_rows,
+                "padded_steps": self.padded_steps,
+                "failed": self.failed,
+            }
+
+    def _run(self, past_values: torch.Tensor, past_values_padding: torch.Tensor, freq: torch.Tensor):
+        return self.forward(past_values=past_values, past_values_padding=past_values_padding, freq=freq)
+
+    def _eager(self, past_values: torch.Tensor, past_values_padding: torch.Tensor, freq: torch.Tensor, **kwargs: Any):
+        with self._lock:
+            self.misses += 1
+        return self.forward(past_values=past_values, past_values_padding=past_values_padding, freq=freq, **kwargs)
+
+    def _bucket_for(self, batch_size: int, length: int) -> Tuple[int, int] | None:
+        for bucket in self.buckets:
+            if bucket[1] >= length and bucket[0] >= batch_size:
+                return bucket
+        return None
+
+    def _largest_batch(self, length: int) -> int | None:
+        batches = [batch for batch, bucket_length in self.buckets if bucket_length >= length]
+        return max(batches) if batches else None
+
+
+def _pad_inputs(
+    values: torch.Tensor,
+    padding: torch.Tensor,
+    freq: torch.Tensor,
+    batch_size: int,
+    length: int,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    extra_steps = length - values.shape[1]
+    if extra_steps:
+        values = torch.nn.functional.pad(values, (extra_steps, 0), value=0.0)
+        padding = torch.nn.functional.pad(padding, (extra_steps, 0), value=1.0)
+    extra_rows = batch_size - values.shape[0]
+    if extra_rows:
+        values = torch.cat([values, values[:1].expand(extra_rows, -1)])
+        padding = torch.cat([padding, padding[:1].expand(extra_rows, -1)])
+        freq = torch.cat([freq, freq[:1].expand(extra_rows, *freq.shape[1:])])
+    return values.contiguous(), padding.contiguous(), freq.contiguous()
+
+
+def _slice_output(output: Any, batch_size: int) -> Any:
+    for name, value in list(output.items()):
+        if isinstance(value, torch.Tensor) and value.dim() and value.shape[0] > batch_size:
+            output[name] = value[:batch_size]
+    return output
+
+
+def _concat_outputs(parts: List[Any]) -> Any:
+    merged = parts[0]
+    for name, value in list(merged.items()):
+        if isinstance(value, torch.Tensor) and value.dim():
+            merged[name] = torch.cat([part[name] for part in parts])
+    return merged
@@ -4,6 +4,23 @@ import os
 from dataclasses import dataclass
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
 @dataclass(slots=True)
 class Settings:
     model_type: str = "chronos"
@@ -12,6 +29,44 @@ class Settings:
     app_version: str = "2.0.0"
     kronos_tokenizer_path: str | None = None
     kronos_runtime_path: str | None = None
+    kronos_max_batch: int = 64
+    cpu_precision: str = "fp32"
+    torch_compile: bool = False
+    compile_buckets: str = "1x512,8x512,32x512"
+    compile_backend: str = "inductor"
+    model_runtime: str = "transformers"
+    onnx_intra_op_threads: int = 0
+    onnx_inter_op_threads: int = 0
+    onnx_graph_optimization: str = "all"
+    batching_enabled: bool = False
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 5.0
+    inference_workers: int = 1
+    max_queue_depth: int = 64
+    inference_processes: int = 0
+    threads_per_process: int = 0
+    worker_timeout_seconds: float = 300.0
+    stream_chunk_size: int = 64
+    response_float_digits: int = 0
+    result_cache_enabled: bool = False
+    result_cache_max_bytes: int = 256 * 1024 * 1024
+    result_cache_ttl_seconds: float = 300.0
+    result_cache_dir: str | None = None
+    result_cache_disk_max_bytes: int = 1024 * 1024 * 1024
+    models: str | None = None
+    model_memory_budget_mb: int = 0
+    background_loading: bool = True
+    warmup_shapes: str = "1x128,8x512"
+    warmup_horizon: int = 16
+    mmap_weights: bool = True
+    jobs_db_path: str = "/app/data/jobs.db"
+    jobs_concurrency: int = 1
+    jobs_max_queued: int = 1000
+    jobs_chunk_size: int = 64
+    jobs_result_ttl_seconds: float = 86400.0
+    sessions_max: int = 10000
+    session_ttl_seconds: float = 3600.0
+    session_max_window: int = 2048
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -22,6 +77,44 @@ class Settings:
             app_version=os.getenv("APP_VERSION", "2.0.0"),
             kronos_tokenizer_path=os.getenv("KRONOS_TOKENIZER_PATH"),
             kronos_runtime_path=os.getenv("KRONOS_RUNTIME_PATH"),
+            kronos_max_batch=_env_int("KRONOS_MAX_BATCH", 64),
+            cpu_precision=os.getenv("CPU_PRECISION", "fp32"),
+            torch_compile=_env_bool("TORCH_COMPILE", False),
+            compile_buckets=os.getenv("COMPILE_BUCKETS", "1x512,8x512,32x512"),
+            compile_backend=os.getenv("COMPILE_BACKEND", "inductor"),
+            model_runtime=os.getenv("MODEL_RUNTIME", "transformers").lower(),
+            onnx_intra_op_threads=_env_int("ONNX_INTRA_OP_THREADS", 0),
+            onnx_inter_op_threads=_env_int("ONNX_INTER_OP_THREADS", 0),
+            onnx_graph_optimization=os.getenv("ONNX_GRAPH_OPTIMIZATION", "all"),
+            batching_enabled=_env_bool("BATCHING_ENABLED", False),
+            batch_max_size=_env_int("BATCH_MAX_SIZE", 32),
+            batch_max_wait_ms=_env_float("BATCH_MAX_WAIT_MS", 5.0),
+            inference_workers=_env_int("INFERENCE_WORKERS", 1),
+            max_queue_depth=_env_int("MAX_QUEUE_DEPTH", 64),
+            inference_processes=_env_int("INFERENCE_PROCESSES", 0),
+            threads_per_process=_env_int("THREADS_PER_PROCESS", 0),
+            worker_timeout_seconds=_env_float("WORKER_TIMEOUT_SECONDS", 300.0),
+            stream_chunk_size=_env_int("STREAM_CHUNK_SIZE", 64),
+            response_float_digits=_env_int("RESPONSE_FLOAT_DIGITS", 0),
+            result_cache_enabled=_env_bool("RESULT_CACHE_ENABLED", False),
+            result_cache_max_bytes=_env_int("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024),
+            result_cache_ttl_seconds=_env_float("RESULT_CACHE_TTL_SECONDS", 300.0),
+            result_cache_dir=os.getenv("RESULT_CACHE_DIR") or None,
+            result_cache_disk_max_bytes=_env_int("RESULT_CACHE_DISK_MAX_BYTES", 1024 * 1024 * 1024),
+            models=os.getenv("MODELS") or None,
+            model_memory_budget_mb=_env_int("MODEL_MEMORY_BUDGET_MB", 0),
+            background_loading=_env_bool("BACKGROUND_LOADING", True),
+            warmup_shapes=os.getenv("WARMUP_SHAPES", "1x128,8x512"),
+            warmup_horizon=_env_int("WARMUP_HORIZON", 16),
+            mmap_weights=_env_bool("MMAP_WEIGHTS", True),
+            jobs_db_path=os.getenv("JOBS_DB_PATH") or "/app/data/jobs.db",
+            jobs_concurrency=_env_int("JOBS_CONCURRENCY", 1),
+            jobs_max_queued=_env_int("JOBS_MAX_QUEUED", 1000),
+            jobs_chunk_size=_env_int("JOBS_CHUNK_SIZE", 64),
+            jobs_result_ttl_seconds=_env_float("JOBS_RESULT_TTL_SECONDS", 86400.0),
+            sessions_max=_env_int("SESSIONS_MAX", 10000),
+            session_ttl_seconds=_env_float("SESSION_TTL_SECONDS", 3600.0),
+            session_max_window=_env_int("SESSION_MAX_WINDOW", 2048),
         )
 
     def model_path(self) -> str:
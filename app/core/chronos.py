@@ -1,6 +1,5 @@
 import torch
 import numpy as np
-from chronos import BaseChronosPipeline
 from .interface import TimeSeriesModel
 from typing import List, Dict, Any
 
@@ -12,6 +11,8 @@ class ChronosEngine(TimeSeriesModel):
         """
         Load Chronos model. Supports both Chronos v1 and v2 via BaseChronosPipeline.
         """
+        from chronos import BaseChronosPipeline
+
         self.pipeline = BaseChronosPipeline.from_pretrained(
             model_path,
             device_map=device,
@@ -1,4 +1,3 @@
-from transformers import TimesFmModelForPrediction
 import torch
 from .interface import TimeSeriesModel
 from typing import List, Dict, Any
@@ -35,6 +34,8 @@ class TimesFMEngine(TimeSeriesModel):
         Load TimesFM 2.5 (PyTorch) model from HuggingFace.
         model_path: HF repo id or local directory.
         """
+        from transformers import TimesFmModelForPrediction
+
         self.device = torch.device(device)
         
         # Use float32 on CPU as bfloat16 has limited support for some operations
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from app.metrics import LATENCY_SECONDS_BUCKETS, Histogram
+
+
+T = TypeVar("T")
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class InferenceExecutor:
+    def __init__(self, max_workers: int, max_queue_depth: int) -> None:
+        self.max_workers = max(1, int(max_workers))
+        # A non-positive depth disables admission control.
+        self.max_queue_depth = int(max_queue_depth)
+        self.queue_wait = Histogram("inference_queue_wait_seconds", LATENCY_SECONDS_BUCKETS)
+        self.run_seconds = Histogram("inference_run_seconds", LATENCY_SECONDS_BUCKETS)
+        self.rejected = 0
+        self._pool: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return max(0, self._in_flight - self.max_workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.max_queue_depth > 0 and self._in_flight >= self.max_workers + self.max_queue_depth:
+                self.rejected += 1
+                raise QueueFullError(
+                    f"Inference queue is full ({self.max_queue_depth} waiting requests). Retry later."
+                )
+            self._in_flight += 1
+
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            self.queue_wait.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                self.run_seconds.observe(time.perf_counter() - started)
+
+        try:
+            future = self._get_pool().submit(call)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def wait_for_idle_worker(self, interval: float = 0.005) -> None:
+        # Background work calls this before each run so it only takes a worker
+        # nobody else is waiting for; interactive calls never queue behind it.
+        while True:
+            with self._lock:
+                if self._in_flight < self.max_workers:
+                    return
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.max_workers),
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "run_seconds": self.run_seconds.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="unitshub-inference",
+                )
+            return self._pool
+
+    def _release(self, _: Future | None) -> None:
+        with self._lock:
+            self._in_flight -= 1
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+import orjson
+
+from app.executor import QueueFullError
+from app.responses import dumps
+
+
+logger = logging.getLogger("unitshub.jobs")
+
+# Lanes are served in this order; the interactive lane always goes first.
+JOB_LANES = ("interactive", "batch")
+FINISHED_STATES = {"succeeded", "failed"}
+
+ProgressCallback = Callable[[int], Awaitable[None]]
+JobRunner = Callable[["JobRecord", Dict[str, Any], ProgressCallback], Awaitable[bytes]]
+
+
+@dataclass(slots=True)
+class JobRecord:
+    id: str
+    task: str
+    model: str | None
+    lane: str
+    total: int
+    status: str = "queued"
+    completed: int = 0
+    error: str | None = None
+    created_at: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def view(self) -> Dict[str, Any]:
+        view = asdict(self)
+        view["progress"] = {
+            "completed": view.pop("completed"),
+            "total": view.pop("total"),
+        }
+        return view
+
+
+class JobStore(ABC):
+    @abstractmethod
+    def add(self, record: JobRecord, payload: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> JobRecord | None:
+        pass
+
+    @abstractmethod
+    def update(self, record: JobRecord) -> None:
+        pass
+
+    @abstractmethod
+    def payload(self, job_id: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def finish(self, record: JobRecord, result: bytes | None) -> None:
+        pass
+
+    @abstractmethod
+    def result(self, job_id: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def unfinished(self) -> List[JobRecord]:
+        pass
+
+    @abstractmethod
+    def prune(self, finished_before: float) -> int:
+        pass
+
+
+_COLUMNS = (
+    "id",
+    "task",
+    "model",
+    "lane",
+    "total",
+    "status",
+    "completed",
+    "error",
+    "created_at",
+    "started_at",
+    "finished_at",
+)
+
+
+class SQLiteJobStore(JobStore):
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use, so building the app (even at import time) never touches the disk.
+        if self._connection is not None:
+            return self._connection
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, task TEXT NOT NULL, model TEXT, lane TEXT NOT NULL, total INTEGER NOT NULL, "
+            "status TEXT NOT NULL, completed INTEGER NOT NULL, error TEXT, created_at REAL NOT NULL, "
+            "started_at REAL, finished_at REAL, payload BLOB, result BLOB)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._connection = connection
+        return connection
+
+    def add(self, record: JobRecord, payload: bytes) -> None:
+        values = asdict(record)
+        with self._lock:
+            self._connect().execute(
+                f"INSERT INTO jobs ({', '.join(_COLUMNS)}, payload) VALUES ({', '.join('?' * (len(_COLUMNS) + 1))})",
+                [values[column] for column in _COLUMNS] + [payload],
+            )
+
+    def get(self, job_id: str) -> JobRecord | None:
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return JobRecord(*row) if row is not None else None
+
+    def update(self, record: JobRecord) -> None:
+        values = asdict(record)
+        with self._lock:
+            self._connect().execute(
+                f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in _COLUMNS[1:])} WHERE id = ?",
+                [values[column] for column in _COLUMNS[1:]] + [record.id],
+            )
+
+    def payload(self, job_id: str) -> bytes | None:
+        with self._lock:
+            row = self._connect().execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def finish(self, record: JobRecord, result: bytes | None) -> None:
+        # The payload is only needed to (re)run the job, so it is dropped with the same write.
+        values = asdict(record)
+        with self._lock:
+            self._connect().execute(
+                f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in _COLUMNS[1:])}, "
+                "payload = NULL, result = ? WHERE id = ?",
+                [values[column] for column in _COLUMNS[1:]] + [result, record.id],
+            )
+
+    def result(self, job_id: str) -> bytes | None:
+        with self._lock:
+            row = self._connect().execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def unfinished(self) -> List[JobRecord]:
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [JobRecord(*row) for row in rows]
+
+    def prune(self, finished_before: float) -> int:
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                (finished_before,),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class JobQueue:
+    def __init__(
+        self,
+        store: JobStore,
+        runner: JobRunner,
+        concurrency: int = 1,
+        max_queued: int = 1000,
+        result_ttl_seconds: float = 86400.0,
+    ) -> None:
+        self.store = store
+        self.runner = runner
+        self.concurrency = max(1, int(concurrency))
+        # A non-positive limit disables admission control.
+        self.max_queued = int(max_queued)
+        self.result_ttl_seconds = float(result_ttl_seconds)
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self._queue: asyncio.PriorityQueue | None = None
+        self._sequence = itertools.count()
+        self._queued = {lane: 0 for lane in JOB_LANES}
+        self._running = 0
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.PriorityQueue()
+        # Jobs that were queued or running when the process stopped start over.
+        for record in await asyncio.to_thread(self.store.unfinished):
+            if record.status == "running":
+                record.status, record.completed, record.started_at = "queued", 0, None
+                await asyncio.to_thread(self.store.update, record)
+            self._enqueue(record)
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"unitshub-jobs-{index}") for index in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, task: str, model: str | None, lane: str, payload: Dict[str, Any], total: int) -> JobRecord:
+        if lane not in JOB_LANES:
+            raise ValueError(f"Unknown job priority [{lane}]; expected one of {', '.join(JOB_LANES)}.")
+        if self.max_queued > 0 and sum(self._queued.values()) >= self.max_queued:
+            raise QueueFullError(f"Job queue is full ({self.max_queued} queued jobs). Retry later.")
+        record = JobRecord(
+            id=uuid.uuid4().hex,
+            task=task,
+            model=model,
+            lane=lane,
+            total=total,
+            created_at=time.time(),
+        )
+        await asyncio.to_thread(self._add, record, payload)
+        self.submitted += 1
+        self._enqueue(record)
+        return record
+
+    async def get(self, job_id: str) -> JobRecord | None:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def result(self, job_id: str) -> bytes | None:
+        return await asyncio.to_thread(self.store.result, job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "max_queued": self.max_queued,
+            "queued": dict(self._queued),
+            "running": self._running,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    def _add(self, record: JobRecord, payload: Dict[str, Any]) -> None:
+        if self.result_ttl_seconds > 0:
+            self.store.prune(time.time() - self.result_ttl_seconds)
+        self.store.add(record, dumps(payload))
+
+    def _enqueue(self, record: JobRecord) -> None:
+        self._queued[record.lane] += 1
+        self._queue.put_nowait((JOB_LANES.index(record.lane), next(self._sequence), record.id, record.lane))
+
+    async def _work(self) -> None:
+        while True:
+            _, _, job_id, lane = await self._queue.get()
+            self._queued[lane] -= 1
+            self._running += 1
+            try:
+                await self._run(job_id)
+            except Exception as exc:
+                logger.exception("Job [%s] could not be recorded: %s", job_id, exc)
+            finally:
+                self._running -= 1
+
+    async def _run(self, job_id: str) -> None:
+        record = await asyncio.to_thread(self.store.get, job_id)
+        payload = await asyncio.to_thread(self.store.payload, job_id)
+        if record is None or payload is None:
+            return
+        record.status, record.started_at = "running", time.time()
+        await asyncio.to_thread(self.store.update, record)
+
+        async def progress(completed: int) -> None:
+            # Progress is persisted at chunk boundaries, off the event loop like every other store call.
+            record.completed = completed
+            await asyncio.to_thread(self.store.update, record)
+
+        try:
+            result = await self.runner(record, orjson.loads(payload), progress)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Job [%s] failed: %s", job_id, exc)
+            record.status, record.error, result = "failed", str(exc) or type(exc).__name__, None
+            self.failed += 1
+        else:
+            record.status, record.completed = "succeeded", record.total
+            self.succeeded += 1
+        record.finished_at = time.time()
+        await asyncio.to_thread(self.store.finish, record, result)
@@ -1,35 +1,71 @@
 from __future__ import annotations
 
-import io
+import asyncio
 import json
 import logging
+import os
+import time
 from contextlib import AsyncExitStack, asynccontextmanager
-from typing import TypeVar
+from functools import partial
+from typing import Callable, TypeVar
 
 import dotenv
-import polars as pl
-import torch
 from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, Security, UploadFile
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel, ValidationError
 
+from app.arrow import (
+    ARROW_STREAM_MEDIA_TYPE,
+    ArrowFormatError,
+    is_arrow_media_type,
+    parse_query_parameters,
+    read_series_table,
+    write_forecast_table,
+)
+from app.batching import MicroBatcher
+from app.cache import ResultCache, cache_directives, payload_digest
 from app.config import Settings
+from app.executor import InferenceExecutor, QueueFullError
+from app.jobs import FINISHED_STATES, JOB_LANES, JobQueue, JobRecord, JobStore, ProgressCallback, SQLiteJobStore
 from app.mcp import BearerAuthASGI, create_mcp_server
+from app.metrics import MetricsMiddleware, PrometheusText, ServiceMetrics, record_stages
+from app.pool import (
+    ModelPool,
+    ModelSpec,
+    ModelUnavailableError,
+    UnknownModelError,
+    parse_model_specs,
+    parse_warmup_shapes,
+)
 from app.providers import ModelProvider, create_provider
+from app.providers.base import legacy_forecasts
+from app.responses import ForecastJSONResponse
+from app.sessions import ForecastSession, SessionStore, UnknownSessionError
+from app.streaming import NDJSON_MEDIA_TYPE, RequestStreamingResponse, iter_ndjson_chunks, ndjson_line
+from app.tabular import TableFormatError, read_table_series, spool_upload
+from app.weights import process_memory
+from app.workers import ProcessProvider
 from app.schemas import (
     ChronosForecastRequest,
     ChronosForecastResponse,
     InvokeRequest,
     InvokeResponse,
+    JobRequest,
+    JobStatus,
+    SessionAppendRequest,
+    SessionCreateRequest,
+    SessionResponse,
     KronosForecastRequest,
     KronosForecastResponse,
     KronosGeneratePathsRequest,
     KronosGeneratePathsResponse,
+    ModelDescriptor,
     ModelSchemaResponse,
-    TimeSeriesInstance,
     TimesFMForecastRequest,
     TimesFMForecastResponse,
     UnifiedRequest,
@@ -47,9 +83,68 @@ BodyModel = TypeVar("BodyModel", bound=BaseModel)
 def create_app(
     settings: Settings | None = None,
     provider: ModelProvider | None = None,
+    provider_factory: Callable[[ModelSpec], ModelProvider] | None = None,
+    job_store: JobStore | None = None,
 ) -> FastAPI:
     settings = settings or Settings.from_env()
     mcp_server = None
+    warmup_shapes = parse_warmup_shapes(settings.warmup_shapes)
+
+    def build_provider(spec: ModelSpec) -> ModelProvider:
+        factory = partial(create_provider, settings, spec.model_type, spec.model_id)
+        if settings.inference_processes > 1:
+            return ProcessProvider(
+                factory,
+                settings.inference_processes,
+                threads_per_process=settings.threads_per_process,
+                mmap_weights=settings.mmap_weights,
+                warmup=(warmup_shapes, settings.warmup_horizon),
+                invoke_timeout=settings.worker_timeout_seconds,
+            )
+        return factory()
+
+    pool = ModelPool(
+        parse_model_specs(settings),
+        provider_factory or build_provider,
+        None,
+        settings.model_memory_budget_mb * 1024 * 1024,
+        warmup_shapes=warmup_shapes,
+        warmup_horizon=settings.warmup_horizon,
+        mmap_weights=settings.mmap_weights,
+    )
+    # Each worker process needs a front-end thread blocked on its results.
+    executor = InferenceExecutor(
+        max(settings.inference_workers, settings.inference_processes),
+        settings.max_queue_depth,
+    )
+
+    metrics = ServiceMetrics()
+
+    def model_label(current_provider: ModelProvider) -> str:
+        return current_provider.instance_id or pool.default_id
+
+    def invoke_with_stages(current_provider: ModelProvider, task: str, payload: dict) -> dict:
+        with record_stages(metrics.provider_stage_seconds, model_label(current_provider), task):
+            return current_provider.invoke(task, payload)
+
+    async def invoke_in_executor(current_provider: ModelProvider, task: str, payload: dict) -> dict:
+        return await executor.run(invoke_with_stages, current_provider, task, payload)
+
+    result_cache = (
+        ResultCache(
+            settings.result_cache_max_bytes,
+            settings.result_cache_ttl_seconds,
+            settings.result_cache_dir,
+            settings.result_cache_disk_max_bytes,
+        )
+        if settings.result_cache_enabled
+        else None
+    )
+    batcher = (
+        MicroBatcher(settings.batch_max_size, settings.batch_max_wait_ms, runner=invoke_in_executor)
+        if settings.batching_enabled
+        else None
+    )
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
@@ -57,28 +152,45 @@ def create_app(
             if mcp_server is not None:
                 await stack.enter_async_context(mcp_server.session_manager.run())
 
+            stack.callback(executor.shutdown)
+
             if provider is not None:
+                pool.register(pool.default_id, provider)
                 app.state.provider = provider
+                await jobs.start()
+                stack.push_async_callback(jobs.stop)
                 yield
                 return
 
-            model_provider = create_provider(settings)
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            logger.info(
-                "Initializing UniTS-Hub v2 with model=[%s] on device=[%s]",
-                settings.model_type,
-                device,
-            )
+            logger.info("Initializing UniTS-Hub v2 with model=[%s]", pool.default_id)
+
+            def load_default_model() -> None:
+                # Creating the provider imports its runtime (torch and friends),
+                # so it happens here rather than on the startup path.
+                try:
+                    app.state.provider = pool.provider(pool.default_id)
+                    pool.load(pool.default_id)
+                    logger.info("Model [%s] loaded successfully on [%s].", pool.default_id, pool.device)
+                except Exception as exc:
+                    logger.exception("Failed to load model [%s]: %s", pool.default_id, exc)
+
+            if settings.background_loading:
+                # Serve /health while the weights load so readiness can be probed.
+                loading = asyncio.create_task(asyncio.to_thread(load_default_model))
+            else:
+                loading = None
+                load_default_model()
+            # Recovered jobs wait for the default model, so the queue starts with it loading.
+            await jobs.start()
             try:
-                model_provider.load(settings.model_path(), device)
-                logger.info("Model [%s] loaded successfully.", settings.model_type)
-            except Exception as exc:
-                logger.exception("Failed to load model [%s]: %s", settings.model_type, exc)
-            app.state.provider = model_provider
-            yield
+                yield
+            finally:
+                # Jobs stop before the models they run on are unloaded.
+                await jobs.stop()
+            if loading is not None:
+                await loading
             app.state.provider = None
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+            pool.unload_all()
 
     app = FastAPI(
         title="UniTS-Hub",
@@ -90,6 +202,12 @@ def create_app(
         lifespan=lifespan,
     )
     app.state.settings = settings
+    app.state.batcher = batcher
+    app.state.executor = executor
+    app.state.result_cache = result_cache
+    app.state.pool = pool
+    app.state.metrics = metrics
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
 
     async def get_api_key(
         credentials: HTTPAuthorizationCredentials = Security(security),
@@ -101,18 +219,19 @@ def create_app(
 
     def get_provider() -> ModelProvider:
         model_provider = getattr(app.state, "provider", None)
-        if model_provider is None:
-            raise HTTPException(status_code=503, detail="Model provider is not initialized.")
-        if not model_provider.loaded:
+        if model_provider is None or not model_provider.loaded:
+            state = pool.status(pool.default_id)["state"]
             raise HTTPException(
                 status_code=503,
-                detail=f"Model [{settings.model_type}] is not loaded.",
+                detail=f"Model [{pool.default_id}] is not loaded (state: {state}).",
+                headers={"Retry-After": "5"} if state == "loading" else None,
             )
         return model_provider
 
     async def parse_json_body(request: Request, model: type[BodyModel]) -> BodyModel:
         try:
-            payload = await request.json()
+            with metrics.request_stage("parse"):
+                payload = await request.json()
         except json.JSONDecodeError as exc:
             raise HTTPException(status_code=400, detail="Request body must be valid JSON.") from exc
 
@@ -120,17 +239,247 @@ def create_app(
             raise HTTPException(status_code=422, detail="Request body must be a JSON object.")
 
         try:
-            return model.model_validate(payload)
+            with metrics.request_stage("validate"):
+                return model.model_validate(payload)
         except ValidationError as exc:
             raise RequestValidationError(exc.errors(), body=payload) from exc
 
-    def require_model(current_provider: ModelProvider, model_id: str) -> None:
-        active_model = current_provider.descriptor().id
-        if active_model != model_id:
+    async def parse_arrow_body(request: Request) -> InvokeRequest:
+        parameters = parse_query_parameters(request.query_params)
+        task = parameters.pop("task", None)
+        model = parameters.pop("model", None)
+        if not isinstance(task, str) or not task:
+            raise HTTPException(status_code=400, detail="Arrow requests require a `task` query parameter.")
+        body = await request.body()
+        try:
+            with metrics.request_stage("parse"):
+                series = read_series_table(body)
+        except ArrowFormatError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return InvokeRequest(task=task, model=str(model) if model else None, input={**parameters, "series": series})
+
+    async def parse_invoke_body(request: Request) -> InvokeRequest:
+        if is_arrow_media_type(request.headers.get("content-type")):
+            return await parse_arrow_body(request)
+        return await parse_json_body(request, InvokeRequest)
+
+    @asynccontextmanager
+    async def leased_provider(model_id: str):
+        # Holding a lease keeps the model from being unloaded mid-request.
+        try:
+            model_provider = await run_in_threadpool(pool.acquire, model_id)
+        except UnknownModelError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown model [{model_id}].") from exc
+        except ModelUnavailableError as exc:
+            logger.warning("Model [%s] is unavailable: %s", model_id, exc)
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+        try:
+            yield model_provider
+        finally:
+            pool.release(model_id)
+
+    @asynccontextmanager
+    async def family_provider(current_provider: ModelProvider, model_id: str):
+        active_model = current_provider.metadata().descriptor.id
+        if active_model == model_id:
+            yield current_provider
+            return
+        pool_id = pool.find_family(model_id)
+        if pool_id is None:
             raise HTTPException(
                 status_code=404,
-                detail=f"Route is only available when model [{model_id}] is active. Current model is [{active_model}].",
+                detail=f"Route is only available when model [{model_id}] is hosted. Current model is [{active_model}].",
             )
+        async with leased_provider(pool_id) as model_provider:
+            yield model_provider
+
+    async def dispatch_task(current_provider: ModelProvider, task: str, payload: dict) -> dict:
+        if batcher is not None:
+            return await batcher.submit(current_provider, task, payload)
+        return await invoke_in_executor(current_provider, task, payload)
+
+    async def run_task(
+        current_provider: ModelProvider,
+        task: str,
+        payload: dict,
+        cache_control: str | None = None,
+    ) -> dict:
+        metrics.observe_payload(task, payload)
+        directives = cache_directives(cache_control)
+        cache_key = None
+        if result_cache is not None and current_provider.cacheable_task(task) and "no-store" not in directives:
+            # Keyed on the whole descriptor so a precision, runtime, or compile change never serves stale results.
+            metadata = current_provider.metadata()
+            model_key = f"{current_provider.instance_id or metadata.descriptor.id}:{metadata.descriptor_digest}"
+            cache_key = payload_digest(model_key, task, payload)
+            if "no-cache" not in directives:
+                cached = result_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+        model = model_label(current_provider)
+        started = time.perf_counter()
+        try:
+            output = await dispatch_task(current_provider, task, payload)
+        except Exception as exc:
+            metrics.task_errors.inc(model, task, type(exc).__name__)
+            raise
+        finally:
+            metrics.task_seconds.labels(model, task).observe(time.perf_counter() - started)
+        if cache_key is not None:
+            result_cache.put(cache_key, output)
+        return output
+
+    def forecast_response(content: dict) -> ForecastJSONResponse:
+        with metrics.request_stage("serialize"):
+            return ForecastJSONResponse(content, float_digits=settings.response_float_digits)
+
+    def unified_forecasts(forecasts: list[dict]) -> list[dict]:
+        # The shape UnifiedResponse validation used to produce.
+        return [{"mean": forecast["mean"], "quantiles": forecast.get("quantiles") or {}} for forecast in forecasts]
+
+    async def invoke_request(
+        raw_request: Request,
+        request: InvokeRequest,
+        current_provider: ModelProvider,
+        model_name: str,
+    ) -> Response:
+        if not current_provider.supports_task(request.task):
+            raise HTTPException(status_code=400, detail=f"Task [{request.task}] is not supported.")
+        output = await run_task(
+            current_provider,
+            request.task,
+            request.input,
+            raw_request.headers.get("cache-control"),
+        )
+        if is_arrow_media_type(raw_request.headers.get("accept")):
+            series = request.input.get("series")
+            try:
+                content = write_forecast_table(
+                    output.get("forecasts") or [],
+                    series if isinstance(series, list) and all(isinstance(item, dict) for item in series) else None,
+                )
+            except ArrowFormatError as exc:
+                raise HTTPException(status_code=406, detail=str(exc)) from exc
+            return Response(
+                content,
+                media_type=ARROW_STREAM_MEDIA_TYPE,
+                headers={
+                    "X-UnitsHub-Model": model_name,
+                    "X-UnitsHub-Task": request.task,
+                },
+            )
+        return forecast_response(
+            {
+                "model": model_name,
+                "task": request.task,
+                "output": output,
+                "metadata": {"api": "rest-v2"},
+            }
+        )
+
+    async def run_job_chunks(
+        current_provider: ModelProvider,
+        record: JobRecord,
+        payload: dict,
+        progress: ProgressCallback,
+    ) -> dict:
+        # Large series lists run in chunks: progress is reported per chunk, and
+        # batch-lane chunks only take an idle inference worker, so live requests
+        # wait at most one chunk behind a bulk job.
+        series = payload.get("series")
+        chunk_size = max(1, settings.jobs_chunk_size)
+        if not isinstance(series, list) or len(series) <= chunk_size:
+            if record.lane == "batch":
+                await executor.wait_for_idle_worker()
+            output = await run_task(current_provider, record.task, payload)
+            await progress(record.total)
+            return output
+
+        forecasts = []
+        for start in range(0, len(series), chunk_size):
+            chunk = series[start : start + chunk_size]
+            if record.lane == "batch":
+                await executor.wait_for_idle_worker()
+            output = await run_task(current_provider, record.task, {**payload, "series": chunk})
+            chunk_forecasts = output.get("forecasts") or []
+            if len(chunk_forecasts) != len(chunk):
+                raise RuntimeError("Provider returned a forecast count that does not match the chunk.")
+            forecasts.extend(chunk_forecasts)
+            await progress(start + len(chunk))
+        return {**output, "forecasts": forecasts}
+
+    async def run_job(record: JobRecord, payload: dict, progress: ProgressCallback) -> bytes:
+        current_provider = getattr(app.state, "provider", None)
+        while current_provider is None or not current_provider.loaded:
+            status = pool.status(pool.default_id)
+            if status["state"] == "failed":
+                raise RuntimeError(f"Model [{pool.default_id}] failed to load: {status['error']}")
+            await asyncio.sleep(0.5)
+            current_provider = getattr(app.state, "provider", None)
+
+        try:
+            if record.model and record.model != current_provider.instance_id:
+                model_name = record.model
+                async with leased_provider(record.model) as model_provider:
+                    output = await run_job_chunks(model_provider, record, payload, progress)
+            else:
+                model_name = current_provider.metadata().descriptor.id
+                output = await run_job_chunks(current_provider, record, payload, progress)
+        except HTTPException as exc:
+            raise RuntimeError(exc.detail) from exc
+        content = {
+            "model": model_name,
+            "task": record.task,
+            "output": output,
+            "metadata": {"api": "rest-v2", "job_id": record.id},
+        }
+        # Stored exactly as /models/current/invoke would have returned it.
+        return ForecastJSONResponse(content, float_digits=settings.response_float_digits).body
+
+    jobs = JobQueue(
+        job_store or SQLiteJobStore(settings.jobs_db_path),
+        run_job,
+        concurrency=settings.jobs_concurrency,
+        max_queued=settings.jobs_max_queued,
+        result_ttl_seconds=settings.jobs_result_ttl_seconds,
+    )
+    app.state.jobs = jobs
+    sessions = SessionStore(settings.sessions_max, settings.session_ttl_seconds)
+    app.state.sessions = sessions
+
+    def find_session(session_id: str) -> ForecastSession:
+        try:
+            return sessions.get(session_id)
+        except UnknownSessionError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown session [{session_id}].") from exc
+
+    @asynccontextmanager
+    async def session_provider(session: ForecastSession):
+        current_provider = get_provider()
+        if session.model and session.model != current_provider.instance_id:
+            async with leased_provider(session.model) as model_provider:
+                yield model_provider, session.model
+        else:
+            yield current_provider, current_provider.metadata().descriptor.id
+
+    async def session_response(session: ForecastSession, forecast: bool, status_code: int = 200) -> Response:
+        # Callers hold session.lock: the model reads the ring buffer in place.
+        async with session_provider(session) as (model_provider, model_name):
+            output = session.cached_forecast() if forecast else None
+            if forecast and output is None and len(session.buffer):
+                output = await run_task(model_provider, session.task, session.payload())
+                session.remember(output)
+        response = forecast_response(
+            {
+                "model": model_name,
+                "task": session.task,
+                "output": output,
+                "metadata": {"api": "rest-v2", "session": session.view()},
+            }
+        )
+        response.status_code = status_code
+        return response
 
     def custom_openapi():
         if app.openapi_schema:
@@ -154,85 +503,371 @@ def create_app(
         return app.openapi_schema
 
     app.openapi = custom_openapi
-    mcp_server = create_mcp_server(get_provider)
+    mcp_server = create_mcp_server(get_provider, run_task)
     app.mount("/mcp", BearerAuthASGI(mcp_server.streamable_http_app(), settings.api_key))
 
+    def default_model_status() -> dict:
+        current_provider = getattr(app.state, "provider", None)
+        status = pool.status(pool.default_id)
+        if current_provider is None:
+            return {**status, "state": "not_ready"}
+        return status
+
     @app.get("/health")
     async def health() -> dict:
-        current_provider = getattr(app.state, "provider", None)
+        status = default_model_status()
         return {
-            "status": "ready" if current_provider and current_provider.loaded else "not_ready",
-            "model": settings.model_type,
-            "device": "cuda" if torch.cuda.is_available() else "cpu",
+            "status": status["state"],
+            "model": pool.default_id,
+            "load": status,
+            "loaded_models": pool.loaded_ids(),
+            "memory": {**(process_memory() or {}), "mapped_weight_bytes": pool.stats()["mapped_bytes"]},
+            "device": pool.device,
             "version": settings.app_version,
         }
 
-    @app.get("/models/current")
+    @app.get("/health/ready")
+    async def readiness() -> JSONResponse:
+        state = default_model_status()["state"]
+        return JSONResponse({"status": state}, status_code=200 if state == "ready" else 503)
+
+    @app.get("/stats/batching")
+    async def batching_stats(_: str = Depends(get_api_key)) -> dict:
+        if batcher is None:
+            return {"enabled": False}
+        return batcher.stats()
+
+    @app.get("/stats/inference")
+    async def inference_stats(_: str = Depends(get_api_key)) -> dict:
+        current_provider = getattr(app.state, "provider", None)
+        runtime = current_provider.runtime_stats() if current_provider is not None else None
+        return {**executor.stats(), "model_runtime": runtime}
+
+    @app.get("/stats/workers")
+    async def worker_stats(_: str = Depends(get_api_key)) -> dict:
+        current_provider = getattr(app.state, "provider", None)
+        if not isinstance(current_provider, ProcessProvider) or current_provider.workers is None:
+            return {"enabled": False}
+        return current_provider.workers.stats()
+
+    @app.get("/stats/cache")
+    async def cache_stats(_: str = Depends(get_api_key)) -> dict:
+        if result_cache is None:
+            return {"enabled": False}
+        return result_cache.stats()
+
+    @app.get("/stats/jobs")
+    async def job_stats(_: str = Depends(get_api_key)) -> dict:
+        return jobs.stats()
+
+    @app.get("/stats/sessions")
+    async def session_stats(_: str = Depends(get_api_key)) -> dict:
+        return sessions.stats()
+
+    @app.get("/metrics")
+    async def prometheus_metrics(_: str = Depends(get_api_key)) -> Response:
+        text = PrometheusText()
+        metrics.write(text)
+
+        queue = executor.stats()
+        text.gauge("inference_in_flight", "Inference calls running or queued.", [({}, queue["in_flight"])])
+        text.gauge("inference_queue_depth", "Inference calls waiting for a worker.", [({}, queue["queue_depth"])])
+        text.counter("inference_rejected_total", "Requests rejected by admission control.", [({}, queue["rejected"])])
+        text.histogram("inference_queue_wait_seconds", "Wait for an inference worker.", [({}, executor.queue_wait)])
+        text.histogram("inference_run_seconds", "Time on an inference worker.", [({}, executor.run_seconds)])
+        if batcher is not None:
+            text.histogram("batch_size", "Series per merged model call.", [({}, batcher.batch_size)])
+            text.histogram("batch_wait_seconds", "Wait before a batch is dispatched.", [({}, batcher.wait_seconds)])
+        job_queue = jobs.stats()
+        queued = [({"lane": lane}, job_queue["queued"][lane]) for lane in JOB_LANES]
+        text.gauge("jobs_queued", "Asynchronous jobs waiting to run, by lane.", queued)
+        text.gauge("jobs_running", "Asynchronous jobs running.", [({}, job_queue["running"])])
+        finished = [({"status": status}, job_queue[status]) for status in ("succeeded", "failed")]
+        text.counter("jobs_finished_total", "Asynchronous jobs finished, by outcome.", finished)
+        session_store = sessions.stats()
+        text.gauge("sessions", "Open forecast sessions.", [({}, session_store["sessions"])])
+        text.gauge("session_buffer_bytes", "Session context buffer memory.", [({}, session_store["buffer_bytes"])])
+        removed = [({"reason": "ttl"}, session_store["expired"]), ({"reason": "lru"}, session_store["evictions"])]
+        text.counter("sessions_removed_total", "Forecast sessions removed by idle expiry or LRU eviction.", removed)
+        if result_cache is not None:
+            cache = result_cache.stats()
+            outcomes = {"hit": cache["hits"], "disk_hit": cache["disk_hits"], "miss": cache["misses"]}
+            lookups = [({"result": result}, count) for result, count in outcomes.items()]
+            text.counter("cache_requests_total", "Result cache lookups by outcome.", lookups)
+            text.counter("cache_evictions_total", "Result cache evictions.", [({}, cache["evictions"])])
+            text.gauge("cache_bytes", "Result cache size.", [({}, cache["bytes"])])
+
+        models = pool.stats()["models"]
+        for name, documentation, key in (
+            ("model_loaded", "Whether a hosted model is loaded.", "loaded"),
+            ("model_in_use", "Requests holding a lease on a model.", "in_use"),
+            ("model_memory_bytes", "Weight memory of a loaded model.", "memory_bytes"),
+        ):
+            text.gauge(name, documentation, [({"model": model["id"]}, int(model[key])) for model in models])
+        return Response(text.render(), media_type=PrometheusText.media_type)
+
+    @app.get("/models/current", response_model=ModelDescriptor)
     async def current_model(
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> dict:
-        return current_provider.descriptor().model_dump(mode="json")
+    ) -> Response:
+        return Response(current_provider.metadata().descriptor_json, media_type="application/json")
 
     @app.get("/models/current/schema", response_model=ModelSchemaResponse)
     async def current_model_schema(
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> ModelSchemaResponse:
-        descriptor = current_provider.descriptor()
-        return ModelSchemaResponse(model=descriptor, schemas=current_provider.task_schemas())
+    ) -> Response:
+        return Response(current_provider.metadata().schema_json, media_type="application/json")
 
     @app.get("/models/current/tasks/{task_name}/schema")
     async def task_schema(
         task_name: str,
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> dict:
-        schemas = current_provider.task_schemas()
-        if task_name not in schemas:
+    ) -> Response:
+        schema_json = current_provider.metadata().task_schema_json.get(task_name)
+        if schema_json is None:
             raise HTTPException(status_code=404, detail=f"Unknown task [{task_name}].")
-        return schemas[task_name]
+        return Response(schema_json, media_type="application/json")
+
+    @app.get("/models")
+    async def list_models(_: str = Depends(get_api_key)) -> dict:
+        return pool.stats()
 
-    @app.post("/models/current/invoke", response_model=InvokeResponse)
+    @app.post("/models/current/invoke", response_model=InvokeResponse, response_class=ForecastJSONResponse)
     async def invoke_model(
         raw_request: Request,
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> InvokeResponse:
-        request = await parse_json_body(raw_request, InvokeRequest)
-        if not current_provider.supports_task(request.task):
+    ) -> Response:
+        request = await parse_invoke_body(raw_request)
+        if request.model and request.model != current_provider.instance_id:
+            async with leased_provider(request.model) as model_provider:
+                return await invoke_request(raw_request, request, model_provider, request.model)
+        return await invoke_request(raw_request, request, current_provider, current_provider.metadata().descriptor.id)
+
+    @app.post("/models/current/invoke/stream")
+    async def invoke_model_stream(
+        raw_request: Request,
+        _: str = Depends(get_api_key),
+        current_provider: ModelProvider = Depends(get_provider),
+    ) -> StreamingResponse:
+        parameters = parse_query_parameters(raw_request.query_params)
+        task = parameters.pop("task", None)
+        if not isinstance(task, str) or not task:
+            raise HTTPException(status_code=400, detail="Streaming requests require a `task` query parameter.")
+        if not current_provider.supports_task(task):
+            raise HTTPException(status_code=400, detail=f"Task [{task}] is not supported.")
+        chunk_size = parameters.pop("chunk_size", settings.stream_chunk_size)
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise HTTPException(status_code=400, detail="`chunk_size` must be a positive integer.")
+
+        cache_control = raw_request.headers.get("cache-control")
+
+        async def forecast_records():
+            # Chunks are parsed as the upload arrives, so the body is never held in full.
+            try:
+                async for chunk in iter_ndjson_chunks(raw_request.stream(), chunk_size):
+                    for index, _, error in chunk:
+                        if error is not None:
+                            yield ndjson_line(index, None, {"error": error})
+                    valid = [(index, item) for index, item, error in chunk if error is None]
+                    if not valid:
+                        continue
+                    try:
+                        output = await run_task(
+                            current_provider,
+                            task,
+                            {**parameters, "series": [item for _, item in valid]},
+                            cache_control,
+                        )
+                        forecasts = output.get("forecasts") or []
+                        if len(forecasts) != len(valid):
+                            raise RuntimeError("Provider returned a forecast count that does not match the chunk.")
+                    except Exception as exc:
+                        logger.exception("Streaming chunk failed: %s", exc)
+                        for index, item in valid:
+                            yield ndjson_line(index, item, {"error": str(exc)})
+                        continue
+                    for (index, item), forecast in zip(valid, forecasts):
+                        yield ndjson_line(index, item, forecast, settings.response_float_digits)
+            except ClientDisconnect:
+                logger.info("Streaming client disconnected before the upload finished.")
+
+        return RequestStreamingResponse(forecast_records(), media_type=NDJSON_MEDIA_TYPE)
+
+    @app.post("/jobs", response_model=JobStatus, status_code=202)
+    async def submit_job(
+        raw_request: Request,
+        _: str = Depends(get_api_key),
+        current_provider: ModelProvider = Depends(get_provider),
+    ) -> JSONResponse:
+        request = await parse_json_body(raw_request, JobRequest)
+        model_provider = current_provider
+        if request.model and request.model != current_provider.instance_id:
+            try:
+                model_provider = await run_in_threadpool(pool.provider, request.model)
+            except UnknownModelError as exc:
+                raise HTTPException(status_code=404, detail=f"Unknown model [{request.model}].") from exc
+        if not model_provider.supports_task(request.task):
             raise HTTPException(status_code=400, detail=f"Task [{request.task}] is not supported.")
-        output = current_provider.invoke(request.task, request.input)
-        return InvokeResponse(
-            model=current_provider.descriptor().id,
-            task=request.task,
-            output=output,
-            metadata={"api": "rest-v2"},
+        series = request.input.get("series")
+        record = await jobs.submit(
+            request.task,
+            request.model,
+            request.priority,
+            request.input,
+            len(series) if isinstance(series, list) and series else 1,
+        )
+        return JSONResponse(
+            record.view(),
+            status_code=202,
+            headers={"Location": str(raw_request.url_for("job_status", job_id=record.id))},
         )
 
-    @app.post("/timesfm/forecast", response_model=TimesFMForecastResponse)
+    async def find_job(job_id: str) -> JobRecord:
+        record = await jobs.get(job_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job [{job_id}].")
+        return record
+
+    @app.get("/jobs/{job_id}", response_model=JobStatus)
+    async def job_status(job_id: str, _: str = Depends(get_api_key)) -> dict:
+        return (await find_job(job_id)).view()
+
+    @app.get("/jobs/{job_id}/result", response_model=InvokeResponse)
+    async def job_result(job_id: str, _: str = Depends(get_api_key)) -> Response:
+        record = await find_job(job_id)
+        if record.status not in FINISHED_STATES:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Job [{job_id}] is {record.status}.",
+                headers={"Retry-After": "1"},
+            )
+        if record.status == "failed":
+            raise HTTPException(status_code=409, detail=f"Job [{job_id}] failed: {record.error}")
+        return Response(await jobs.result(job_id), media_type="application/json")
+
+    @app.post("/sessions", response_model=SessionResponse, status_code=201, response_class=ForecastJSONResponse)
+    async def create_session(
+        raw_request: Request,
+        _: str = Depends(get_api_key),
+        current_provider: ModelProvider = Depends(get_provider),
+    ) -> Response:
+        request = await parse_json_body(raw_request, SessionCreateRequest)
+        model_provider = current_provider
+        if request.model and request.model != current_provider.instance_id:
+            try:
+                model_provider = await run_in_threadpool(pool.provider, request.model)
+            except UnknownModelError as exc:
+                raise HTTPException(status_code=404, detail=f"Unknown model [{request.model}].") from exc
+        descriptor = model_provider.metadata().descriptor
+        task = request.task or model_provider.default_legacy_task()
+        if not task or not model_provider.supports_task(task) or "univariate" not in descriptor.input_modes:
+            raise HTTPException(status_code=400, detail=f"Task [{task}] does not support forecast sessions.")
+        if "series" in request.input:
+            raise HTTPException(status_code=400, detail="Sessions keep the series server-side; send `history` instead.")
+
+        # An explicit window can only shrink the default; the buffer never exceeds the model context.
+        max_context = descriptor.metadata.get("max_context") or settings.session_max_window
+        max_window = min(int(max_context), settings.session_max_window)
+        window = min(request.window or max_window, max_window)
+        session = ForecastSession(task, request.model, request.input, window)
+        session.append(request.history)
+        sessions.add(session)
+        async with session.lock:
+            return await session_response(session, forecast=True, status_code=201)
+
+    @app.get("/sessions/{session_id}")
+    async def session_status(session_id: str, _: str = Depends(get_api_key)) -> dict:
+        return find_session(session_id).view()
+
+    @app.post("/sessions/{session_id}/append", response_model=SessionResponse, response_class=ForecastJSONResponse)
+    async def append_session(
+        session_id: str,
+        raw_request: Request,
+        _: str = Depends(get_api_key),
+    ) -> Response:
+        request = await parse_json_body(raw_request, SessionAppendRequest)
+        session = find_session(session_id)
+        async with session.lock:
+            session.append(request.values)
+            return await session_response(session, forecast=request.forecast)
+
+    @app.get("/sessions/{session_id}/forecast", response_model=SessionResponse, response_class=ForecastJSONResponse)
+    async def session_forecast(session_id: str, _: str = Depends(get_api_key)) -> Response:
+        session = find_session(session_id)
+        async with session.lock:
+            return await session_response(session, forecast=True)
+
+    @app.delete("/sessions/{session_id}", status_code=204)
+    async def delete_session(session_id: str, _: str = Depends(get_api_key)) -> Response:
+        try:
+            sessions.delete(session_id)
+        except UnknownSessionError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown session [{session_id}].") from exc
+        return Response(status_code=204)
+
+    @app.get("/models/{model_id}", response_model=ModelDescriptor)
+    async def hosted_model(model_id: str, _: str = Depends(get_api_key)) -> Response:
+        try:
+            model_provider = pool.provider(model_id)
+        except UnknownModelError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown model [{model_id}].") from exc
+        return Response(model_provider.metadata().descriptor_json, media_type="application/json")
+
+    @app.get("/models/{model_id}/schema", response_model=ModelSchemaResponse)
+    async def hosted_model_schema(model_id: str, _: str = Depends(get_api_key)) -> Response:
+        try:
+            model_provider = pool.provider(model_id)
+        except UnknownModelError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown model [{model_id}].") from exc
+        return Response(model_provider.metadata().schema_json, media_type="application/json")
+
+    @app.post("/models/{model_id}/invoke", response_model=InvokeResponse, response_class=ForecastJSONResponse)
+    async def invoke_hosted_model(
+        model_id: str,
+        raw_request: Request,
+        _: str = Depends(get_api_key),
+    ) -> Response:
+        request = await parse_invoke_body(raw_request)
+        async with leased_provider(model_id) as model_provider:
+            return await invoke_request(raw_request, request, model_provider, model_id)
+
+    @app.post("/timesfm/forecast", response_model=TimesFMForecastResponse, response_class=ForecastJSONResponse)
     async def timesfm_forecast(
         raw_request: Request,
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> TimesFMForecastResponse:
+    ) -> Response:
         request = await parse_json_body(raw_request, TimesFMForecastRequest)
-        require_model(current_provider, "timesfm")
-        output = current_provider.invoke("forecast_point", request.model_dump(mode="json"))
+        async with family_provider(current_provider, "timesfm") as model_provider:
+            output = await run_task(
+                model_provider,
+                "forecast_point",
+                request.model_dump(mode="json"),
+                raw_request.headers.get("cache-control"),
+            )
         forecast = output["forecasts"][0]
-        return TimesFMForecastResponse(mean=forecast["mean"])
+        return forecast_response({"mean": forecast["mean"]})
 
-    @app.post("/chronos/forecast", response_model=ChronosForecastResponse)
+    @app.post("/chronos/forecast", response_model=ChronosForecastResponse, response_class=ForecastJSONResponse)
     async def chronos_forecast(
         raw_request: Request,
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> ChronosForecastResponse:
+    ) -> Response:
         request = await parse_json_body(raw_request, ChronosForecastRequest)
-        require_model(current_provider, "chronos")
-        output = current_provider.invoke("forecast_quantile", request.model_dump(mode="json"))
+        async with family_provider(current_provider, "chronos") as model_provider:
+            output = await run_task(
+                model_provider,
+                "forecast_quantile",
+                request.model_dump(mode="json"),
+                raw_request.headers.get("cache-control"),
+            )
         forecast = output["forecasts"][0]
-        return ChronosForecastResponse(mean=forecast["mean"], quantiles=forecast.get("quantiles") or {})
+        return forecast_response({"mean": forecast["mean"], "quantiles": forecast.get("quantiles") or {}})
 
     @app.post("/kronos/forecast-ohlcv", response_model=KronosForecastResponse)
     async def kronos_forecast_ohlcv(
@@ -241,8 +876,13 @@ def create_app(
         current_provider: ModelProvider = Depends(get_provider),
     ) -> KronosForecastResponse:
         request = await parse_json_body(raw_request, KronosForecastRequest)
-        require_model(current_provider, "kronos")
-        output = current_provider.invoke("forecast_ohlcv", request.model_dump(mode="json"))
+        async with family_provider(current_provider, "kronos") as model_provider:
+            output = await run_task(
+                model_provider,
+                "forecast_ohlcv",
+                request.model_dump(mode="json"),
+                raw_request.headers.get("cache-control"),
+            )
         forecast = output["forecasts"][0]
         return KronosForecastResponse.model_validate(forecast)
 
@@ -253,71 +893,102 @@ def create_app(
         current_provider: ModelProvider = Depends(get_provider),
     ) -> KronosGeneratePathsResponse:
         request = await parse_json_body(raw_request, KronosGeneratePathsRequest)
-        require_model(current_provider, "kronos")
-        output = current_provider.invoke("generate_paths", request.model_dump(mode="json"))
+        async with family_provider(current_provider, "kronos") as model_provider:
+            output = await run_task(
+                model_provider,
+                "generate_paths",
+                request.model_dump(mode="json"),
+                raw_request.headers.get("cache-control"),
+            )
         forecast = output["forecasts"][0]
         return KronosGeneratePathsResponse.model_validate(forecast)
 
-    @app.post("/predict", response_model=UnifiedResponse)
+    @app.post("/predict", response_model=UnifiedResponse, response_class=ForecastJSONResponse)
     async def predict(
         raw_request: Request,
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> UnifiedResponse:
+    ) -> Response:
         request = await parse_json_body(raw_request, UnifiedRequest)
         try:
-            forecasts = current_provider.legacy_predict(
+            task, payload = current_provider.legacy_request(
                 history=[instance.history for instance in request.instances],
                 horizon=request.task.horizon,
                 parameters=request.parameters,
             )
         except NotImplementedError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
-        return UnifiedResponse(
-            model=current_provider.descriptor().id,
-            forecasts=forecasts,
-            metadata={
-                "deprecated": True,
-                "replacement": "/models/current/invoke",
-            },
+        forecasts = legacy_forecasts(
+            await run_task(current_provider, task, payload, raw_request.headers.get("cache-control"))
+        )
+        return forecast_response(
+            {
+                "model": current_provider.metadata().descriptor.id,
+                "forecasts": unified_forecasts(forecasts),
+                "metadata": {
+                    "deprecated": True,
+                    "replacement": "/models/current/invoke",
+                },
+            }
         )
 
-    @app.post("/predict/csv", response_model=UnifiedResponse)
+    @app.post("/predict/csv", response_model=UnifiedResponse, response_class=ForecastJSONResponse)
     async def predict_csv(
+        raw_request: Request,
         file: UploadFile = File(...),
         target_column: str = Form(...),
         horizon: int = Form(...),
         frequency: str = Form("auto"),
+        series_id: str | None = Form(None),
         _: str = Depends(get_api_key),
         current_provider: ModelProvider = Depends(get_provider),
-    ) -> UnifiedResponse:
-        contents = await file.read()
-        try:
-            df = pl.read_csv(io.BytesIO(contents))
-        except pl.exceptions.NoDataError as exc:
-            raise HTTPException(status_code=400, detail="The uploaded CSV file is empty.") from exc
-        if target_column not in df.columns:
-            raise HTTPException(status_code=400, detail=f"Target column [{target_column}] not found.")
+    ) -> Response:
+        if current_provider.default_legacy_task() is None:
+            raise HTTPException(status_code=400, detail="Legacy /predict is not supported by this model.")
 
-        history = df[target_column].drop_nulls().to_list()
+        path = await spool_upload(file)
         try:
-            forecasts = current_provider.legacy_predict(
-                history=[history],
+            series_ids, histories = await run_in_threadpool(
+                read_table_series, path, target_column, series_id or None
+            )
+        except TableFormatError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        finally:
+            os.unlink(path)
+
+        forecasts = []
+        chunk_size = settings.stream_chunk_size
+        for start in range(0, len(histories), chunk_size):
+            task, payload = current_provider.legacy_request(
+                history=histories[start : start + chunk_size],
                 horizon=horizon,
                 parameters={"frequency": frequency},
             )
-        except NotImplementedError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+            output = await run_task(current_provider, task, payload, raw_request.headers.get("cache-control"))
+            forecasts.extend(legacy_forecasts(output))
+
+        metadata = {
+            "deprecated": True,
+            "replacement": "/models/current/invoke",
+            "source_column": target_column,
+        }
+        if series_ids is not None:
+            metadata["series_id_column"] = series_id
+            metadata["series_ids"] = series_ids
+        return forecast_response(
+            {
+                "model": current_provider.metadata().descriptor.id,
+                "forecasts": unified_forecasts(forecasts),
+                "metadata": metadata,
+            }
+        )
 
-        _ = TimeSeriesInstance(history=history, metadata={"column": target_column})
-        return UnifiedResponse(
-            model=current_provider.descriptor().id,
-            forecasts=forecasts,
-            metadata={
-                "deprecated": True,
-                "replacement": "/models/current/invoke",
-                "source_column": target_column,
-            },
+    @app.exception_handler(QueueFullError)
+    async def queue_full_handler(_: Request, exc: QueueFullError):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": "1"},
         )
 
     @app.exception_handler(Exception)
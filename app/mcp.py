@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from fastapi.responses import JSONResponse
@@ -31,7 +31,10 @@ class BearerAuthASGI:
         await self.app(scope, receive, send)
 
 
-def create_mcp_server(get_provider: Callable[[], ModelProvider]) -> FastMCP:
+def create_mcp_server(
+    get_provider: Callable[[], ModelProvider],
+    run_task: Callable[[ModelProvider, str, dict[str, Any]], Awaitable[dict[str, Any]]],
+) -> FastMCP:
     server = FastMCP(
         name="UniTS-Hub MCP",
         instructions="Discover the active UniTS-Hub model and invoke its supported forecasting tools.",
@@ -45,29 +48,28 @@ def create_mcp_server(get_provider: Callable[[], ModelProvider]) -> FastMCP:
 
     @server.tool()
     def get_current_model() -> dict[str, Any]:
-        return get_provider().descriptor().model_dump(mode="json")
+        return get_provider().metadata().descriptor_dict
 
     @server.tool()
     def get_model_schema() -> dict[str, Any]:
-        provider = get_provider()
+        metadata = get_provider().metadata()
         return {
-            "model": provider.descriptor().model_dump(mode="json"),
-            "schemas": provider.task_schemas(),
+            "model": metadata.descriptor_dict,
+            "schemas": metadata.schemas,
         }
 
     @server.tool()
     def get_task_schema(task: str) -> dict[str, Any]:
-        provider = get_provider()
-        schemas = provider.task_schemas()
+        schemas = get_provider().metadata().schemas
         if task not in schemas:
             raise ValueError(f"Unknown task [{task}].")
         return schemas[task]
 
     @server.tool()
-    def invoke_task(task: str, input: dict[str, Any]) -> dict[str, Any]:
+    async def invoke_task(task: str, input: dict[str, Any]) -> dict[str, Any]:
         provider = get_provider()
         if not provider.supports_task(task):
             raise ValueError(f"Task [{task}] is not supported.")
-        return provider.invoke(task, input)
+        return await run_task(provider, task, input)
 
     return server
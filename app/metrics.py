@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+class Histogram:
+    def __init__(self, name: str, buckets: Sequence[float]) -> None:
+        self.name = name
+        self.buckets = sorted(float(bound) for bound in buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+            count = self._count
+        cumulative = 0
+        buckets: Dict[str, int] = {}
+        for bound, bucket_count in zip(self.buckets + [float("inf")], counts):
+            cumulative += bucket_count
+            buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "buckets": buckets,
+        }
+
+
+LATENCY_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_SECONDS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+LENGTH_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+HORIZON_BUCKETS = (1, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+# Keys that hold a series' history in the payload shapes providers accept.
+SERIES_KEYS = ("target", "candles", "history", "series")
+
+_stage_seconds: ContextVar[Dict[str, float] | None] = ContextVar("unitshub_stage_seconds", default=None)
+
+
+class LabeledHistogram:
+    def __init__(self, name: str, buckets: Sequence[float], labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Histogram:
+        key = tuple(str(value) for value in values)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = Histogram(self.name, self.buckets)
+            return child
+
+    def items(self) -> List[Tuple[Dict[str, str], Histogram]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [(dict(zip(self.labelnames, key)), child) for key, child in children]
+
+
+class Counter:
+    def __init__(self, name: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values: Any, amount: float = 1.0) -> None:
+        key = tuple(str(value) for value in values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def items(self) -> List[Tuple[Dict[str, str], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in values]
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    # Providers wrap input building, the forward pass, and output formatting in
+    # stages; outside record_stages() this costs one context variable lookup.
+    totals = _stage_seconds.get()
+    if totals is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        totals[name] = totals.get(name, 0.0) + time.perf_counter() - started
+
+
+@contextmanager
+def record_stages(histogram: LabeledHistogram, *labels: Any) -> Iterator[Dict[str, float]]:
+    # Each stage is observed once per call, summed over every time it was entered.
+    totals: Dict[str, float] = {}
+    token = _stage_seconds.set(totals)
+    try:
+        yield totals
+    finally:
+        _stage_seconds.reset(token)
+        for name, seconds in totals.items():
+            histogram.labels(*labels, name).observe(seconds)
+
+
+class ServiceMetrics:
+    def __init__(self) -> None:
+        self.http_requests = Counter("http_requests_total", ("method", "route", "status"))
+        self.http_seconds = LabeledHistogram(
+            "http_request_duration_seconds", LATENCY_SECONDS_BUCKETS, ("method", "route")
+        )
+        self.request_stage_seconds = LabeledHistogram("request_stage_seconds", STAGE_SECONDS_BUCKETS, ("stage",))
+        self.task_seconds = LabeledHistogram("task_duration_seconds", LATENCY_SECONDS_BUCKETS, ("model", "task"))
+        self.task_errors = Counter("task_errors_total", ("model", "task", "error"))
+        self.provider_stage_seconds = LabeledHistogram(
+            "provider_stage_seconds", STAGE_SECONDS_BUCKETS, ("model", "task", "stage")
+        )
+        self.request_series = LabeledHistogram("request_series", COUNT_BUCKETS, ("task",))
+        self.series_length = LabeledHistogram("series_length", LENGTH_BUCKETS, ("task",))
+        self.horizon = LabeledHistogram("horizon", HORIZON_BUCKETS, ("task",))
+
+    def observe_http(self, method: str, route: str, status: int, seconds: float) -> None:
+        self.http_requests.inc(method, route, status)
+        self.http_seconds.labels(method, route).observe(seconds)
+
+    @contextmanager
+    def request_stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.request_stage_seconds.labels(name).observe(time.perf_counter() - started)
+
+    def observe_payload(self, task: str, payload: Dict[str, Any]) -> None:
+        series = payload.get("series")
+        if isinstance(series, list) and series and isinstance(series[0], dict):
+            items = series
+        else:
+            items = [payload]
+        self.request_series.labels(task).observe(len(items))
+        lengths = self.series_length.labels(task)
+        for item in items:
+            values = next((item[key] for key in SERIES_KEYS if isinstance(item.get(key), (list, np.ndarray))), None)
+            if values is not None:
+                lengths.observe(len(values))
+        horizon = payload.get("horizon")
+        if isinstance(horizon, int):
+            self.horizon.labels(task).observe(horizon)
+
+    def write(self, text: PrometheusText) -> None:
+        text.counter("http_requests_total", "HTTP requests by route and status.", self.http_requests.items())
+        text.histogram("http_request_duration_seconds", "HTTP request latency by route.", self.http_seconds.items())
+        text.histogram(
+            "request_stage_seconds",
+            "Time spent parsing, validating, and serializing request and response bodies.",
+            self.request_stage_seconds.items(),
+        )
+        text.histogram(
+            "task_duration_seconds", "Model task latency, including queueing and batching.", self.task_seconds.items()
+        )
+        text.counter("task_errors_total", "Failed model tasks by exception type.", self.task_errors.items())
+        text.histogram(
+            "provider_stage_seconds",
+            "Time per provider invoke stage (input, forward, format).",
+            self.provider_stage_seconds.items(),
+        )
+        text.histogram("request_series", "Series per model task request.", self.request_series.items())
+        text.histogram("series_length", "History length of each requested series.", self.series_length.items())
+        text.histogram("horizon", "Requested forecast horizon.", self.horizon.items())
+
+
+class MetricsMiddleware:
+    # Pure ASGI so streaming responses are timed until their last chunk.
+    def __init__(self, app: Any, metrics: ServiceMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Route templates keep the label set bounded; unmatched paths share one
+            # label. Mounted apps extend root_path, so their routes keep the mount prefix.
+            route = getattr(scope.get("route"), "path", None)
+            label = scope.get("root_path", "")[len(root_path) :] + route if route else "unmatched"
+            self.metrics.observe_http(scope["method"], label, status, time.perf_counter() - started)
+
+
+class PrometheusText:
+    # Text exposition format 0.0.4.
+    media_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, prefix: str = "unitshub_") -> None:
+        self.prefix = prefix
+        self._lines: List[str] = []
+
+    def counter(self, name: str, documentation: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> None:
+        self._family(name, documentation, "counter", [(name, labels, value) for labels, value in samples])
+
+    def gauge(self, name: str, documentation: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> None:
+        self._family(name, documentation, "gauge", [(name, labels, value) for labels, value in samples])
+
+    def histogram(self, name: str, documentation: str, samples: Iterable[Tuple[Dict[str, str], Histogram]]) -> None:
+        rows: List[Tuple[str, Dict[str, str], float]] = []
+        for labels, histogram in samples:
+            snapshot = histogram.snapshot()
+            for bound, count in snapshot["buckets"].items():
+                rows.append((f"{name}_bucket", {**labels, "le": bound}, count))
+            rows.append((f"{name}_sum", labels, snapshot["sum"]))
+            rows.append((f"{name}_count", labels, snapshot["count"]))
+        self._family(name, documentation, "histogram", rows)
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+    def _family(self, name: str, documentation: str, kind: str, rows: List[Tuple[str, Dict[str, str], float]]) -> None:
+        self._lines.append(f"# HELP {self.prefix}{name} {documentation}")
+        self._lines.append(f"# TYPE {self.prefix}{name} {kind}")
+        for sample, labels, value in rows:
+            self._lines.append(f"{self.prefix}{sample}{_format_labels(labels)} {_format_value(value)}")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return "+Inf" if value == float("inf") else repr(float(value))
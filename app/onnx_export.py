@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+import torch
+
+
+ONNX_DIR = "onnx"
+ONNX_MODEL = "model.onnx"
+ONNX_MANIFEST = "unitshub-onnx.json"
+
+
+class _TimesFmPointForecast(torch.nn.Module):
+    # One decode step of TimesFmModelForPrediction on inputs that are already
+    # left-padded to a patch multiple; TimesFM always decodes a single step.
+    def __init__(self, model: Any) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, past_values: torch.Tensor, past_values_padding: torch.Tensor, freq: torch.Tensor) -> torch.Tensor:
+        output = self.model.decoder(past_values=past_values, past_values_padding=past_values_padding, freq=freq)
+        predictions = self.model._postprocess_output(output.last_hidden_state, (output.loc, output.scale))
+        return predictions[:, -1, :, 0]
+
+
+class _ChronosQuantileForecast(torch.nn.Module):
+    # The number of output patches is read from the length of `output_patches`
+    # so a single graph serves every horizon up to the model's maximum.
+    def __init__(self, model: Any) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, context: torch.Tensor, group_ids: torch.Tensor, output_patches: torch.Tensor) -> torch.Tensor:
+        output = self.model(context=context, group_ids=group_ids, num_output_patches=output_patches.shape[0])
+        return output.quantile_preds
+
+
+def export_model(
+    model_type: str,
+    model_path: str,
+    output_dir: str | None = None,
+    opset: int = 18,
+    quantize: bool = False,
+) -> str:
+    model_type = model_type.lower()
+    output_dir = output_dir or os.path.join(model_path, ONNX_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    onnx_path = os.path.join(output_dir, ONNX_MODEL)
+
+    if model_type == "timesfm":
+        manifest = _export_timesfm(model_path, onnx_path, opset)
+    elif model_type in {"chronos", "chronos2", "chronos-2"}:
+        manifest = _export_chronos(model_path, onnx_path, opset)
+    else:
+        raise ValueError(f"ONNX export is not supported for MODEL_TYPE [{model_type}].")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized_path = os.path.join(output_dir, "model.int8.onnx")
+        quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+        os.replace(quantized_path, onnx_path)
+    manifest.update({"model_type": model_type, "opset": opset, "quantized": quantize, "file": ONNX_MODEL})
+
+    with open(os.path.join(output_dir, ONNX_MANIFEST), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    return output_dir
+
+
+def read_manifest(model_path: str) -> tuple[str, Dict[str, Any]]:
+    # Accept either the export directory itself or a checkpoint containing `onnx/`.
+    for directory in (os.path.join(model_path, ONNX_DIR), model_path):
+        manifest_path = os.path.join(directory, ONNX_MANIFEST)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as handle:
+                return directory, json.load(handle)
+    raise FileNotFoundError(
+        f"No ONNX export found under [{model_path}]; run scripts/export_onnx.py first."
+    )
+
+
+def _export_timesfm(model_path: str, onnx_path: str, opset: int) -> Dict[str, Any]:
+    from torch.export import Dim
+    from transformers import TimesFmModelForPrediction
+
+    model = TimesFmModelForPrediction.from_pretrained(model_path, torch_dtype=torch.float32).eval()
+    config = model.config
+    # Lengths are whole patches; the graph is traced for at least two of them.
+    batch = Dim("batch")
+    length = config.patch_length * Dim("patches", min=2, max=max(2, config.context_length // config.patch_length))
+    sample = (
+        torch.randn(2, 2 * config.patch_length),
+        torch.zeros(2, 2 * config.patch_length),
+        torch.zeros(2, 1, dtype=torch.int32),
+    )
+    with torch.no_grad():
+        torch.onnx.export(
+            _TimesFmPointForecast(model).eval(),
+            sample,
+            onnx_path,
+            input_names=["past_values", "past_values_padding", "freq"],
+            output_names=["mean_predictions"],
+            dynamic_shapes=({0: batch, 1: length}, {0: batch, 1: length}, {0: batch}),
+            opset_version=opset,
+            dynamo=True,
+        )
+    return {
+        "context_length": int(config.context_length),
+        "patch_length": int(config.patch_length),
+        "horizon_length": int(config.horizon_length),
+    }
+
+
+@contextmanager
+def _numeric_group_mask() -> Iterator[None]:
+    # Chronos-2 builds its group/time mask with an einsum over a bool matrix. Eager
+    # torch promotes it, but ONNX Einsum rejects bool inputs, so the export traces
+    # the same mask computed in the floating dtype.
+    from chronos.chronos2.model import Chronos2Encoder
+
+    original = Chronos2Encoder.__dict__["_construct_and_invert_group_time_mask"]
+
+    def construct(group_ids: torch.Tensor, attention_mask: torch.Tensor, floating_type: torch.dtype) -> torch.Tensor:
+        group_mask = (group_ids[:, None] == group_ids[None, :]).to(floating_type)
+        group_time_mask = group_mask[:, :, None] * attention_mask.to(floating_type)[None, :, :]
+        # (q, b, t) -> (t, 1, q, b), the layout of the attention scores.
+        group_time_mask = group_time_mask.permute(2, 0, 1).unsqueeze(1)
+        return (1.0 - group_time_mask) * torch.finfo(floating_type).min
+
+    Chronos2Encoder._construct_and_invert_group_time_mask = staticmethod(construct)
+    try:
+        yield
+    finally:
+        Chronos2Encoder._construct_and_invert_group_time_mask = original
+
+
+def _export_chronos(model_path: str, onnx_path: str, opset: int) -> Dict[str, Any]:
+    from chronos import BaseChronosPipeline
+    from torch.export import Dim
+
+    pipeline = BaseChronosPipeline.from_pretrained(model_path, device_map="cpu", torch_dtype=torch.float32)
+    model = pipeline.inner_model.eval()
+    config = model.chronos_config
+    patch_size = int(config.input_patch_size)
+    batch = Dim("batch")
+    length = patch_size * Dim("context_patches", min=2, max=max(2, config.context_length // patch_size))
+    sample = (
+        torch.randn(2, 2 * patch_size),
+        torch.arange(2),
+        torch.zeros(2),
+    )
+    with torch.no_grad(), _numeric_group_mask():
+        torch.onnx.export(
+            _ChronosQuantileForecast(model).eval(),
+            sample,
+            onnx_path,
+            input_names=["context", "group_ids", "output_patches"],
+            output_names=["quantile_preds"],
+            dynamic_shapes=(
+                {0: batch, 1: length},
+                {0: batch},
+                {0: Dim("output_patches", min=1, max=max(2, config.max_output_patches))},
+            ),
+            opset_version=opset,
+            dynamo=True,
+        )
+    return {
+        "context_length": int(config.context_length),
+        "input_patch_size": patch_size,
+        "output_patch_size": int(config.output_patch_size),
+        "max_output_patches": int(config.max_output_patches),
+        "quantiles": [float(q) for q in config.quantiles],
+    }
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.config import Settings
+from app.providers.base import ModelProvider
+
+
+logger = logging.getLogger("unitshub.pool")
+
+
+class UnknownModelError(KeyError):
+    pass
+
+
+class ModelUnavailableError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class ModelSpec:
+    model_id: str
+    model_type: str
+    path: str | None
+
+
+@dataclass(slots=True)
+class _PoolEntry:
+    spec: ModelSpec
+    provider: ModelProvider | None = None
+    in_use: int = 0
+    last_used: float = 0.0
+    memory_bytes: int = 0
+    mapped_bytes: int = 0
+    pinned: bool = False
+    state: str = "unloaded"
+    progress: float = 0.0
+    error: str | None = None
+    load_started: float = 0.0
+    load_seconds: float | None = None
+    load_lock: threading.Lock = field(default_factory=threading.Lock)
+    create_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def model_family(model_type: str) -> str:
+    model_type = model_type.lower()
+    if model_type in {"chronos", "chronos2", "chronos-2"}:
+        return "chronos"
+    return model_type
+
+
+def parse_model_specs(settings: Settings) -> List[ModelSpec]:
+    # MODELS="timesfm,chronos,chronos-small=chronos" hosts several checkpoints;
+    # each id is loaded from MODELS_DIR/<id>. The first entry is the default.
+    if not settings.models:
+        return [ModelSpec(settings.model_type, settings.model_type, settings.model_path())]
+
+    specs: List[ModelSpec] = []
+    for item in settings.models.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model_id, _, model_type = item.partition("=")
+        model_id = model_id.strip()
+        model_type = (model_type.strip() or model_id).lower()
+        if any(spec.model_id == model_id for spec in specs):
+            raise ValueError(f"Duplicate model id [{model_id}] in MODELS.")
+        specs.append(ModelSpec(model_id, model_type, os.path.join(settings.models_dir, model_id)))
+    if not specs:
+        raise ValueError("MODELS must list at least one model.")
+    return specs
+
+
+def default_device() -> str:
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def parse_warmup_shapes(value: str) -> List[Tuple[int, int]]:
+    # "1x128,8x512" -> [(batch size, context length), ...]
+    shapes: List[Tuple[int, int]] = []
+    for item in value.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        batch_size, _, length = item.partition("x")
+        try:
+            shape = (int(batch_size), int(length))
+        except ValueError as exc:
+            raise ValueError(f"Invalid shape [{item}]; expected BATCHxLENGTH.") from exc
+        if min(shape) <= 0:
+            raise ValueError(f"Invalid shape [{item}]; sizes must be positive.")
+        shapes.append(shape)
+    return shapes
+
+
+class ModelPool:
+    def __init__(
+        self,
+        specs: List[ModelSpec],
+        factory: Callable[[ModelSpec], ModelProvider],
+        device: str | None,
+        memory_budget_bytes: int = 0,
+        warmup_shapes: List[Tuple[int, int]] | None = None,
+        warmup_horizon: int = 16,
+        mmap_weights: bool = False,
+    ) -> None:
+        if not specs:
+            raise ValueError("At least one model must be configured.")
+        self.factory = factory
+        # None picks CUDA when available, resolved on the first load so that
+        # importing torch stays off the startup path.
+        self.device = device
+        self.memory_budget_bytes = max(0, int(memory_budget_bytes))
+        self.warmup_shapes = list(warmup_shapes or [])
+        self.warmup_horizon = warmup_horizon
+        self.mmap_weights = mmap_weights
+        self.default_id = specs[0].model_id
+        self.evictions = 0
+        self._entries: Dict[str, _PoolEntry] = {spec.model_id: _PoolEntry(spec=spec) for spec in specs}
+        self._entries[self.default_id].pinned = True
+        self._lock = threading.Lock()
+
+    def __contains__(self, model_id: str) -> bool:
+        return model_id in self._entries
+
+    def register(self, model_id: str, provider: ModelProvider) -> None:
+        # Injected providers cannot be reloaded from disk, so they are never evicted.
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is None:
+                entry = self._entries[model_id] = _PoolEntry(spec=ModelSpec(model_id, model_id, None))
+            provider.instance_id = model_id
+            entry.provider = provider
+            entry.pinned = True
+            entry.memory_bytes = provider.memory_bytes() if provider.loaded else 0
+            entry.state = "ready" if provider.loaded else "unloaded"
+            entry.progress = 1.0 if provider.loaded else 0.0
+
+    def provider(self, model_id: str) -> ModelProvider:
+        with self._lock:
+            entry = self._get_entry(model_id)
+            if entry.provider is not None:
+                return entry.provider
+        # Building a provider imports its runtime, which can take seconds, so it
+        # happens outside `_lock`: /health and the stats routes read status under it.
+        with entry.create_lock:
+            with self._lock:
+                if entry.provider is not None:
+                    return entry.provider
+            provider = self.factory(entry.spec)
+            provider.instance_id = model_id
+            with self._lock:
+                if entry.provider is None:
+                    entry.provider = provider
+                return entry.provider
+
+    def find_family(self, family: str) -> str | None:
+        with self._lock:
+            loaded = [
+                model_id
+                for model_id, entry in self._entries.items()
+                if model_family(entry.spec.model_type) == family and entry.provider is not None and entry.provider.loaded
+            ]
+            if loaded:
+                return loaded[0]
+            for model_id, entry in self._entries.items():
+                if model_family(entry.spec.model_type) == family:
+                    return model_id
+        return None
+
+    def acquire(self, model_id: str) -> ModelProvider:
+        # Blocking: may load the model, so callers run it off the event loop.
+        with self._lock:
+            entry = self._get_entry(model_id)
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+        try:
+            return self._ensure_loaded(entry)
+        except BaseException:
+            self.release(model_id)
+            raise
+
+    def release(self, model_id: str) -> None:
+        with self._lock:
+            entry = self._entries[model_id]
+            entry.in_use = max(0, entry.in_use - 1)
+            entry.last_used = time.monotonic()
+
+    def load(self, model_id: str) -> ModelProvider:
+        provider = self.acquire(model_id)
+        self.release(model_id)
+        return provider
+
+    def unload(self, model_id: str) -> bool:
+        with self._lock:
+            entry = self._get_entry(model_id)
+            if entry.in_use or entry.provider is None or not entry.provider.loaded:
+                return False
+            self._unload_entry(entry)
+        self._free_memory()
+        return True
+
+    def unload_all(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.provider is not None and entry.provider.loaded and entry.spec.path is not None:
+                    self._unload_entry(entry)
+        self._free_memory()
+
+    def status(self, model_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return self._status(self._get_entry(model_id))
+
+    def loaded_ids(self) -> List[str]:
+        with self._lock:
+            return [
+                model_id
+                for model_id, entry in self._entries.items()
+                if entry.provider is not None and entry.provider.loaded
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            models = [
+                {
+                    "id": model_id,
+                    "type": entry.spec.model_type,
+                    "default": model_id == self.default_id,
+                    "loaded": bool(entry.provider is not None and entry.provider.loaded),
+                    "in_use": entry.in_use,
+                    "memory_bytes": entry.memory_bytes,
+                    "mapped_bytes": entry.mapped_bytes,
+                    "runtime": entry.provider.runtime_stats() if entry.provider is not None else None,
+                    "idle_seconds": round(now - entry.last_used, 3) if entry.last_used else None,
+                    **self._status(entry),
+                }
+                for model_id, entry in self._entries.items()
+            ]
+            return {
+                "default": self.default_id,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "resident_bytes": self._resident_bytes(),
+                "mapped_bytes": self._mapped_bytes(),
+                "evictions": self.evictions,
+                "models": models,
+            }
+
+    def _status(self, entry: _PoolEntry) -> Dict[str, Any]:
+        elapsed = entry.load_seconds
+        if elapsed is None and entry.load_started:
+            elapsed = time.monotonic() - entry.load_started
+        return {
+            "state": entry.state,
+            "progress": round(entry.progress, 3),
+            "load_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "error": entry.error,
+        }
+
+    def _set_state(self, entry: _PoolEntry, state: str, progress: float, error: str | None = None) -> None:
+        with self._lock:
+            entry.state = state
+            entry.progress = progress
+            entry.error = error
+            if state in {"ready", "failed"}:
+                entry.load_seconds = time.monotonic() - entry.load_started
+
+    def _get_entry(self, model_id: str) -> _PoolEntry:
+        entry = self._entries.get(model_id)
+        if entry is None:
+            raise UnknownModelError(model_id)
+        return entry
+
+    def _ensure_loaded(self, entry: _PoolEntry) -> ModelProvider:
+        provider = entry.provider
+        if provider is not None and provider.loaded:
+            return provider
+        if entry.spec.path is None:
+            raise ModelUnavailableError(f"Model [{entry.spec.model_id}] is not loaded.")
+
+        with entry.load_lock:
+            provider = self.provider(entry.spec.model_id)
+            if provider.loaded:
+                return provider
+            with self._lock:
+                entry.load_started = time.monotonic()
+                entry.load_seconds = None
+            self._set_state(entry, "loading", 0.0)
+            # Sizes from a previous load let us make room before loading again.
+            self._evict_for(entry, entry.memory_bytes)
+            if self.device is None:
+                self.device = default_device()
+            logger.info("Loading model [%s] from [%s] on [%s].", entry.spec.model_id, entry.spec.path, self.device)
+            try:
+                provider.load(entry.spec.path, self.device)
+            except Exception as exc:
+                self._set_state(entry, "failed", 0.0, str(exc))
+                raise ModelUnavailableError(f"Model [{entry.spec.model_id}] failed to load: {exc}") from exc
+            mapped_bytes = self._map_weights(entry, provider)
+            with self._lock:
+                entry.memory_bytes = provider.memory_bytes()
+                entry.mapped_bytes = mapped_bytes
+            self._evict_for(entry, 0)
+            self._warm_up(entry, provider)
+            self._set_state(entry, "ready", 1.0)
+        return provider
+
+    def _map_weights(self, entry: _PoolEntry, provider: ModelProvider) -> int:
+        if not self.mmap_weights or self.device != "cpu":
+            return 0
+        try:
+            mapped_bytes = provider.map_weights(entry.spec.path)
+        except Exception as exc:
+            logger.warning("Could not memory-map weights of model [%s]: %s", entry.spec.model_id, exc)
+            return 0
+        if mapped_bytes:
+            gc.collect()
+        logger.info("Memory-mapped %d weight bytes of model [%s].", mapped_bytes, entry.spec.model_id)
+        return mapped_bytes
+
+    def _warm_up(self, entry: _PoolEntry, provider: ModelProvider) -> None:
+        requests = provider.warmup_requests(self.warmup_shapes, self.warmup_horizon)
+        # Loading counts as one step, followed by one step per warm-up batch.
+        steps = 1 + len(requests)
+        for index, (task, payload) in enumerate(requests, start=1):
+            self._set_state(entry, "warming", index / steps)
+            started = time.perf_counter()
+            try:
+                provider.invoke(task, payload)
+            except Exception as exc:
+                # A failed warm-up only costs first-request latency, so keep serving.
+                logger.warning("Warm-up of model [%s] failed: %s", entry.spec.model_id, exc)
+                return
+            logger.info(
+                "Warm-up batch %d/%d of model [%s] took %.3fs.",
+                index,
+                len(requests),
+                entry.spec.model_id,
+                time.perf_counter() - started,
+            )
+
+    def _evict_for(self, keep: _PoolEntry, incoming_bytes: int) -> None:
+        if not self.memory_budget_bytes:
+            return
+        evicted = False
+        with self._lock:
+            while self._resident_bytes() + incoming_bytes > self.memory_budget_bytes:
+                candidates = [
+                    entry
+                    for entry in self._entries.values()
+                    if entry is not keep
+                    and not entry.pinned
+                    and not entry.in_use
+                    and entry.provider is not None
+                    and entry.provider.loaded
+                ]
+                if not candidates:
+                    logger.warning("Model memory budget exceeded and no idle model can be unloaded.")
+                    break
+                victim = min(candidates, key=lambda entry: entry.last_used)
+                logger.info("Unloading idle model [%s] to stay within the memory budget.", victim.spec.model_id)
+                self._unload_entry(victim)
+                self.evictions += 1
+                evicted = True
+        if evicted:
+            self._free_memory()
+
+    def _resident_bytes(self) -> int:
+        return sum(
+            entry.memory_bytes
+            for entry in self._entries.values()
+            if entry.provider is not None and entry.provider.loaded
+        )
+
+    def _mapped_bytes(self) -> int:
+        return sum(
+            entry.mapped_bytes
+            for entry in self._entries.values()
+            if entry.provider is not None and entry.provider.loaded
+        )
+
+    def _unload_entry(self, entry: _PoolEntry) -> None:
+        entry.provider.unload()
+        entry.provider = None
+        entry.state = "unloaded"
+        entry.progress = 0.0
+
+    def _free_memory(self) -> None:
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
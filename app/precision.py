@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import warnings
+from typing import Any, ContextManager, Dict, Tuple
+
+import torch
+
+
+logger = logging.getLogger("unitshub.precision")
+
+PRECISIONS = ("fp32", "bf16", "int8")
+
+
+def parse_precisions(value: str | None) -> Tuple[str, Dict[str, str]]:
+    # "int8" applies to every model; "fp32,timesfm=int8,chronos=bf16" sets a
+    # default plus per-model overrides keyed by model id or type.
+    default = "fp32"
+    overrides: Dict[str, str] = {}
+    for item in (value or "").split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        key, _, precision = item.rpartition("=")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision [{precision}]; expected one of {', '.join(PRECISIONS)}.")
+        if key:
+            overrides[key.strip()] = precision
+        else:
+            default = precision
+    return default, overrides
+
+
+def resolve_precision(value: str | None, *keys: str) -> str:
+    default, overrides = parse_precisions(value)
+    for key in keys:
+        if key and key.lower() in overrides:
+            return overrides[key.lower()]
+    return default
+
+
+def effective_precision(precision: str, device: str) -> str:
+    # Reduced precision modes only exist for CPU; accelerators keep their own dtype.
+    if torch.device(device).type != "cpu" or precision == "fp32":
+        return "fp32"
+    if precision == "bf16" and not bf16_supported():
+        logger.warning("This CPU has no native bf16 support; falling back to fp32.")
+        return "fp32"
+    if precision == "int8" and not hasattr(torch, "ao"):
+        logger.warning("Dynamic quantization is unavailable in this torch build; falling back to fp32.")
+        return "fp32"
+    return precision
+
+
+def bf16_supported() -> bool:
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def quantize_linear_layers(module: Any) -> Any:
+    # Linear weights become int8 with activations quantized on the fly; the
+    # module is converted in place so pipelines holding a reference see it.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def precision_context(precision: str) -> ContextManager[Any]:
+    if precision == "bf16":
+        return torch.autocast("cpu", dtype=torch.bfloat16)
+    return contextlib.nullcontext()
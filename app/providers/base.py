@@ -1,15 +1,40 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
+import json
+import math
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Tuple
 
 from app.schemas import ModelDescriptor
+from app.weights import map_module_weights
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderMetadata:
+    descriptor: ModelDescriptor
+    descriptor_dict: Dict[str, Any]
+    schemas: Dict[str, Dict[str, Any]]
+    descriptor_json: bytes
+    # Changes whenever anything the descriptor reports does (version, runtime, precision, ...).
+    descriptor_digest: str
+    schema_json: bytes
+    task_schema_json: Dict[str, bytes]
+
+
+def _json_bytes(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
 
 
 class ModelProvider(ABC):
     def __init__(self) -> None:
         self.loaded = False
         self.device: str | None = None
+        self.instance_id: str | None = None
+        self._metadata: ProviderMetadata | None = None
+        self._metadata_state: Hashable = None
 
     @abstractmethod
     def load(self, model_path: str, device: str) -> None:
@@ -30,29 +55,122 @@ class ModelProvider(ABC):
     def default_legacy_task(self) -> str | None:
         return "forecast_point"
 
+    def metadata_state(self) -> Hashable:
+        # Descriptors only change when the provider is (re)loaded.
+        return (self.loaded, self.device)
+
+    def metadata(self) -> ProviderMetadata:
+        state = self.metadata_state()
+        cached = self._metadata
+        if cached is not None and self._metadata_state == state:
+            return cached
+
+        descriptor = self.descriptor()
+        descriptor_dict = descriptor.model_dump(mode="json")
+        schemas = self.task_schemas()
+        descriptor_json = _json_bytes(descriptor_dict)
+        cached = ProviderMetadata(
+            descriptor=descriptor,
+            descriptor_dict=descriptor_dict,
+            schemas=schemas,
+            descriptor_json=descriptor_json,
+            descriptor_digest=hashlib.blake2b(descriptor_json, digest_size=16).hexdigest(),
+            schema_json=_json_bytes({"model": descriptor_dict, "schemas": schemas}),
+            task_schema_json={name: _json_bytes(schema) for name, schema in schemas.items()},
+        )
+        self._metadata = cached
+        self._metadata_state = state
+        return cached
+
+    def invalidate_metadata(self) -> None:
+        self._metadata = None
+
+    def torch_modules(self) -> List[Any]:
+        return []
+
+    def memory_bytes(self) -> int:
+        seen = set()
+        total = 0
+        for module in self.torch_modules():
+            for tensor in itertools.chain(module.parameters(), module.buffers()):
+                if tensor.data_ptr() in seen:
+                    continue
+                seen.add(tensor.data_ptr())
+                total += tensor.numel() * tensor.element_size()
+        return total
+
+    def map_weights(self, model_path: str) -> int:
+        return sum(map_module_weights(module, model_path) for module in self.torch_modules())
+
+    def runtime_stats(self) -> Dict[str, Any] | None:
+        # Optimized execution paths (compiled graphs, exported runtimes) report here.
+        return None
+
+    def unload(self) -> None:
+        # Subclasses drop their model references so the weights can be freed.
+        self.loaded = False
+        self.invalidate_metadata()
+
+    def cacheable_task(self, task: str) -> bool:
+        # Sampling tasks must not be served from the result cache.
+        return True
+
     def supports_task(self, task: str) -> bool:
-        return task in self.task_schemas()
+        return task in self.metadata().schemas
 
-    def legacy_predict(
+    def batch_request(
+        self,
+        task: str,
+        payload: Dict[str, Any],
+    ) -> Tuple[Hashable, Dict[str, Any]] | None:
+        # Requests sharing the returned key may be merged into one `invoke` call,
+        # so the payload must be normalized to the generic `series` form.
+        return None
+
+    def legacy_request(
         self,
         history: List[List[float]],
         horizon: int,
         parameters: Dict[str, Any],
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[str, Dict[str, Any]]:
         task = self.default_legacy_task()
         if not task:
             raise NotImplementedError("Legacy /predict is not supported by this model.")
+        return task, {
+            "series": [{"target": values} for values in history],
+            "horizon": horizon,
+            **parameters,
+        }
+
+    def warmup_requests(
+        self,
+        shapes: List[Tuple[int, int]],
+        horizon: int,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        # Dummy batches shaped like real traffic, run once after loading.
+        if not self.default_legacy_task():
+            return []
+        return [
+            self.legacy_request([_warmup_series(length)] * batch_size, horizon, {})
+            for batch_size, length in shapes
+        ]
+
+    def legacy_predict(
+        self,
+        history: List[List[float]],
+        horizon: int,
+        parameters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        task, payload = self.legacy_request(history, horizon, parameters)
+        return legacy_forecasts(self.invoke(task, payload))
+
+
+def _warmup_series(length: int) -> List[float]:
+    return [math.sin(index / 8.0) + 0.01 * index for index in range(length)]
 
-        output = self.invoke(
-            task,
-            {
-                "series": [{"target": values} for values in history],
-                "horizon": horizon,
-                **parameters,
-            },
-        )
 
-        forecasts = output.get("forecasts")
-        if not isinstance(forecasts, list):
-            raise ValueError("Provider must return a forecasts list for legacy requests.")
-        return forecasts
+def legacy_forecasts(output: Dict[str, Any]) -> List[Dict[str, Any]]:
+    forecasts = output.get("forecasts")
+    if not isinstance(forecasts, list):
+        raise ValueError("Provider must return a forecasts list for legacy requests.")
+    return forecasts
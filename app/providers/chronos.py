@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Hashable, List, Tuple
 
 import numpy as np
 import torch
+from pydantic import ValidationError
 
+from app.metrics import stage
+from app.precision import effective_precision, precision_context, quantize_linear_layers
 from app.providers.base import ModelProvider
-from app.providers.shared import forecast_result
+from app.providers.shared import flatten_targets, forecast_result, series_batch_key
 from app.schemas import (
     ChronosForecastRequest,
     ChronosForecastResponse,
@@ -14,14 +17,18 @@ from app.schemas import (
     TaskDefinition,
     TimesFMForecastRequest,
     TimesFMForecastResponse,
+    model_schema,
     schema_bundle,
 )
 
 
 class ChronosProvider(ModelProvider):
-    def __init__(self) -> None:
+    def __init__(self, precision: str = "fp32") -> None:
         super().__init__()
         self.pipeline = None
+        self.requested_precision = precision
+        self.precision = "fp32"
+        self.runtime = "transformers"
         self.quantiles: List[float] = []
 
     def load(self, model_path: str, device: str) -> None:
@@ -35,16 +42,27 @@ class ChronosProvider(ModelProvider):
             torch_dtype=dtype,
         )
         self.quantiles = list(getattr(self.pipeline, "quantiles", []))
+        self.precision = effective_precision(self.requested_precision, device)
+        if self.precision == "int8":
+            quantize_linear_layers(self.pipeline.inner_model)
         self.loaded = True
 
+    def torch_modules(self) -> List[Any]:
+        inner_model = getattr(self.pipeline, "inner_model", None)
+        return [inner_model] if inner_model is not None else []
+
+    def unload(self) -> None:
+        super().unload()
+        self.pipeline = None
+
     def descriptor(self) -> ModelDescriptor:
         tasks = [
             TaskDefinition(
                 name="forecast_quantile",
                 title="Quantile Forecast",
                 description="Quantile forecast for a univariate time series.",
-                input_schema=ChronosForecastRequest.model_json_schema(),
-                output_schema=ChronosForecastResponse.model_json_schema(),
+                input_schema=model_schema(ChronosForecastRequest),
+                output_schema=model_schema(ChronosForecastResponse),
             ),
         ]
         return ModelDescriptor(
@@ -59,6 +77,8 @@ class ChronosProvider(ModelProvider):
                 "default_quantiles": self.quantiles or [0.1, 0.5, 0.9],
                 "supports_covariates": False,
                 "supports_multivariate": False,
+                "runtime": self.runtime,
+                "precision": self.precision,
             },
         )
 
@@ -71,51 +91,87 @@ class ChronosProvider(ModelProvider):
     def default_legacy_task(self) -> str | None:
         return "forecast_point"
 
+    def batch_request(
+        self,
+        task: str,
+        payload: Dict[str, Any],
+    ) -> Tuple[Hashable, Dict[str, Any]] | None:
+        if task not in {"forecast_quantile", "forecast_point"}:
+            return None
+        if "series" in payload and payload["series"] and isinstance(payload["series"][0], dict):
+            return series_batch_key(task, payload), payload
+
+        try:
+            if task == "forecast_quantile":
+                request = ChronosForecastRequest.model_validate(payload)
+                series_payload = {
+                    "series": [{"target": request.series}],
+                    "horizon": request.horizon,
+                    "quantiles": request.quantiles,
+                }
+            else:
+                request = TimesFMForecastRequest.model_validate(payload)
+                series_payload = {
+                    "series": [{"target": request.history}],
+                    "horizon": request.horizon,
+                }
+        except ValidationError:
+            return None
+        return series_batch_key(task, series_payload), series_payload
+
     def invoke(self, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        if self.pipeline is None:
+        if not self.loaded:
             raise RuntimeError("Chronos model not loaded.")
-        if task not in self.task_schemas():
+        if not self.supports_task(task):
             raise ValueError(f"Chronos does not support task [{task}].")
 
-        if "series" in payload and payload["series"] and isinstance(payload["series"][0], dict):
-            horizon = int(payload["horizon"])
-            contexts = self._build_context(payload.get("series") or [])
-            quantiles = payload.get("quantiles") or self.quantiles or [0.1, 0.5, 0.9]
-        else:
-            if task == "forecast_quantile":
+        with stage("input"):
+            if "series" in payload and payload["series"] and isinstance(payload["series"][0], dict):
+                horizon = int(payload["horizon"])
+                contexts = self._build_context(payload.get("series") or [])
+                quantiles = payload.get("quantiles") or self.quantiles or [0.1, 0.5, 0.9]
+            elif task == "forecast_quantile":
                 request = ChronosForecastRequest.model_validate(payload)
                 horizon = request.horizon
-                contexts = [torch.tensor(request.series, dtype=torch.float32)]
+                contexts = self._to_tensors([request.series])
                 quantiles = request.quantiles or self.quantiles or [0.1, 0.5, 0.9]
             else:
                 request = TimesFMForecastRequest.model_validate(payload)
                 horizon = request.horizon
-                contexts = [torch.tensor(request.history, dtype=torch.float32)]
+                contexts = self._to_tensors([request.history])
                 quantiles = self.quantiles or [0.1, 0.5, 0.9]
 
-        try:
-            forecasts = self.pipeline.predict(
-                contexts,
-                prediction_length=horizon,
-            )
-            formatted = self._format_quantile_forecasts(forecasts, quantiles)
-        except TypeError:
-            num_samples = int(payload.get("num_samples") or 20)
-            forecasts = self.pipeline.predict(
-                contexts,
-                prediction_length=horizon,
-                num_samples=num_samples,
-            )
-            formatted = self._format_sample_forecasts(forecasts)
+        with precision_context(self.precision):
+            try:
+                with stage("forward"):
+                    forecasts = self._predict_quantiles(contexts, horizon)
+                with stage("format"):
+                    formatted = self._format_quantile_forecasts(forecasts, quantiles)
+            except TypeError:
+                num_samples = int(payload.get("num_samples") or 20)
+                with stage("forward"):
+                    forecasts = self.pipeline.predict(
+                        contexts,
+                        prediction_length=horizon,
+                        num_samples=num_samples,
+                    )
+                with stage("format"):
+                    formatted = self._format_sample_forecasts(forecasts)
 
         return {"forecasts": formatted}
 
+    def _predict_quantiles(self, contexts: List[torch.Tensor], horizon: int) -> Any:
+        return self.pipeline.predict(contexts, prediction_length=horizon)
+
     def _build_context(self, series: List[Dict[str, Any]]) -> List[torch.Tensor]:
-        contexts: List[torch.Tensor] = []
-        for item in series:
-            target = item["target"]
-            contexts.append(torch.tensor(target, dtype=torch.float32))
-        return contexts
+        return self._to_tensors([item["target"] for item in series])
+
+    def _to_tensors(self, targets: List[Any]) -> List[torch.Tensor]:
+        # The pipeline left-pads a list of 1-D tensors itself; views into one
+        # buffer keep that behaviour without a tensor allocation per series.
+        flat, spans = flatten_targets(targets)
+        buffer = torch.from_numpy(flat)
+        return [buffer[start:end] for start, end in spans]
 
     def _format_quantile_forecasts(
         self,
@@ -124,36 +180,33 @@ class ChronosProvider(ModelProvider):
     ) -> List[Dict[str, Any]]:
         available = self.quantiles or requested_quantiles
         q_index = {float(q): idx for idx, q in enumerate(available)}
-        results: List[Dict[str, Any]] = []
-
-        for forecast in forecasts:
-            values = forecast.detach().cpu().numpy() if hasattr(forecast, "detach") else np.asarray(forecast)
-            if values.ndim == 3:
-                values = values[0]
-            median_idx = q_index.get(0.5, len(values) // 2)
-            quantile_map: Dict[str, List[float]] = {}
-            for q in requested_quantiles:
-                idx = q_index.get(float(q))
-                if idx is not None and idx < len(values):
-                    quantile_map[str(q)] = values[idx].tolist()
-            results.append(forecast_result(values[median_idx].tolist(), quantile_map))
-        return results
+        if not len(forecasts):
+            return []
+
+        # (batch, quantiles, horizon); each output column is converted once for the whole batch.
+        values = np.stack([_to_numpy(forecast) for forecast in forecasts])
+        if values.ndim == 4:
+            values = values[:, 0]
+        median_idx = q_index.get(0.5, values.shape[1] // 2)
+        columns: Dict[str, List[List[float]]] = {}
+        for q in requested_quantiles:
+            idx = q_index.get(float(q))
+            if idx is not None and idx < values.shape[1]:
+                columns[str(q)] = values[:, idx].tolist()
+        means = values[:, median_idx].tolist()
+        return [
+            forecast_result(mean, {key: column[row] for key, column in columns.items()})
+            for row, mean in enumerate(means)
+        ]
 
     def _format_sample_forecasts(self, forecasts: Any) -> List[Dict[str, Any]]:
-        raw = forecasts.detach().cpu().numpy() if hasattr(forecasts, "detach") else np.asarray(forecasts)
-        results: List[Dict[str, Any]] = []
-        for sample in raw:
-            median = np.quantile(sample, 0.5, axis=0)
-            p10 = np.quantile(sample, 0.1, axis=0)
-            p90 = np.quantile(sample, 0.9, axis=0)
-            results.append(
-                forecast_result(
-                    median.tolist(),
-                    {
-                        "0.1": p10.tolist(),
-                        "0.5": median.tolist(),
-                        "0.9": p90.tolist(),
-                    },
-                )
-            )
-        return results
+        raw = _to_numpy(forecasts)
+        p10, median, p90 = (level.tolist() for level in np.quantile(raw, [0.1, 0.5, 0.9], axis=1))
+        return [
+            forecast_result(median[row], {"0.1": p10[row], "0.5": median[row], "0.9": p90[row]})
+            for row in range(len(median))
+        ]
+
+
+def _to_numpy(values: Any) -> np.ndarray:
+    return values.detach().float().cpu().numpy() if hasattr(values, "detach") else np.asarray(values)
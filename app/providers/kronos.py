@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import math
 import os
 import sys
-from typing import Any, Dict, List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Hashable, List, Tuple
 
+from pydantic import ValidationError
+
+from app.metrics import stage
 from app.providers.base import ModelProvider
+from app.providers.shared import series_batch_key
 from app.schemas import (
     KronosForecastRequest,
     KronosForecastResponse,
@@ -12,6 +18,7 @@ from app.schemas import (
     KronosGeneratePathsResponse,
     ModelDescriptor,
     TaskDefinition,
+    model_schema,
     schema_bundle,
 )
 
@@ -21,10 +28,12 @@ class KronosProvider(ModelProvider):
         self,
         tokenizer_path: str | None = None,
         runtime_path: str | None = None,
+        max_batch: int = 64,
     ) -> None:
         super().__init__()
         self.tokenizer_path = tokenizer_path
         self.runtime_path = runtime_path or "/opt/kronos-runtime"
+        self.max_batch = max(1, int(max_batch))
         self.predictor = None
 
     def load(self, model_path: str, device: str) -> None:
@@ -48,21 +57,30 @@ class KronosProvider(ModelProvider):
         self.predictor = KronosPredictor(model, tokenizer, device=device, max_context=512)
         self.loaded = True
 
+    def torch_modules(self) -> List[Any]:
+        if self.predictor is None:
+            return []
+        return [self.predictor.model, self.predictor.tokenizer]
+
+    def unload(self) -> None:
+        super().unload()
+        self.predictor = None
+
     def descriptor(self) -> ModelDescriptor:
         tasks = [
             TaskDefinition(
                 name="forecast_ohlcv",
                 title="OHLCV Forecast",
                 description="Generate future OHLC/OHLCV candles for one asset series.",
-                input_schema=KronosForecastRequest.model_json_schema(),
-                output_schema=KronosForecastResponse.model_json_schema(),
+                input_schema=model_schema(KronosForecastRequest),
+                output_schema=model_schema(KronosForecastResponse),
             ),
             TaskDefinition(
                 name="generate_paths",
                 title="Generate Paths",
                 description="Generate multiple sampled future OHLC/OHLCV paths for one asset series.",
-                input_schema=KronosGeneratePathsRequest.model_json_schema(),
-                output_schema=KronosGeneratePathsResponse.model_json_schema(),
+                input_schema=model_schema(KronosGeneratePathsRequest),
+                output_schema=model_schema(KronosGeneratePathsResponse),
             )
         ]
         return ModelDescriptor(
@@ -77,6 +95,7 @@ class KronosProvider(ModelProvider):
                 "supports_sampling": True,
                 "recommended_max_context": 512,
                 "runtime_path": self.runtime_path,
+                "max_batch": self.max_batch,
             },
         )
 
@@ -89,41 +108,138 @@ class KronosProvider(ModelProvider):
     def default_legacy_task(self) -> str | None:
         return None
 
+    def cacheable_task(self, task: str) -> bool:
+        return False
+
+    def warmup_requests(
+        self,
+        shapes: List[Tuple[int, int]],
+        horizon: int,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        requests = []
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for batch_size, length in shapes:
+            candles = []
+            for index in range(length):
+                price = 100.0 + math.sin(index / 8.0)
+                candles.append(
+                    {
+                        "timestamp": (start + timedelta(hours=index)).isoformat(),
+                        "open": price,
+                        "high": price + 1.0,
+                        "low": price - 1.0,
+                        "close": price + 0.5,
+                        "volume": 1000.0,
+                    }
+                )
+            series = [{"symbol": f"WARMUP{idx}", "candles": candles} for idx in range(batch_size)]
+            requests.append(("forecast_ohlcv", {"series": series, "horizon": horizon}))
+        return requests
+
+    def batch_request(
+        self,
+        task: str,
+        payload: Dict[str, Any],
+    ) -> Tuple[Hashable, Dict[str, Any]] | None:
+        if task != "forecast_ohlcv":
+            return None
+        if "series" in payload:
+            return series_batch_key(task, payload), payload
+        try:
+            request = KronosForecastRequest.model_validate(payload)
+        except ValidationError:
+            return None
+        series_payload = {
+            "series": [
+                {
+                    "symbol": request.symbol,
+                    "candles": [c.model_dump(mode="json", exclude_none=True) for c in request.candles],
+                }
+            ],
+            "horizon": request.horizon,
+            "temperature": request.temperature,
+            "top_p": request.top_p,
+        }
+        return series_batch_key(task, series_payload), series_payload
+
     def invoke(self, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         if self.predictor is None:
             raise RuntimeError("Kronos model not loaded.")
-        if task not in self.task_schemas():
+        if not self.supports_task(task):
             raise ValueError(f"Kronos does not support task [{task}].")
 
-        import pandas as pd
-
         if "series" in payload:
-            item = (payload.get("series") or [])[0]
-            if not item:
+            items = list(payload.get("series") or [])
+            if not items:
                 raise ValueError("Kronos request requires at least one series.")
-            symbol = item.get("symbol")
-            candles = item["candles"]
+            # Forecasts are returned by position, so an empty entry is an error rather than skipped.
+            for index, item in enumerate(items):
+                if not isinstance(item, dict) or not item.get("candles"):
+                    raise ValueError(f"Kronos series [{index}] has no candles.")
             horizon = int(payload["horizon"])
             temperature = float(payload.get("temperature") or 1.0)
             top_p = float(payload.get("top_p") or 0.9)
             num_samples = int(payload.get("num_samples") or 1)
+            max_batch = payload.get("max_batch")
         else:
             if task == "generate_paths":
                 request = KronosGeneratePathsRequest.model_validate(payload)
-                symbol = request.symbol
-                candles = [c.model_dump(mode="json", exclude_none=True) for c in request.candles]
-                horizon = request.horizon
-                temperature = request.temperature
-                top_p = request.top_p
                 num_samples = request.num_samples
+                max_batch = request.max_batch
             else:
                 request = KronosForecastRequest.model_validate(payload)
-                symbol = request.symbol
-                candles = [c.model_dump(mode="json", exclude_none=True) for c in request.candles]
-                horizon = request.horizon
-                temperature = request.temperature
-                top_p = request.top_p
                 num_samples = 1
+                max_batch = None
+            items = [
+                {
+                    "symbol": request.symbol,
+                    "candles": [c.model_dump(mode="json", exclude_none=True) for c in request.candles],
+                }
+            ]
+            horizon = request.horizon
+            temperature = request.temperature
+            top_p = request.top_p
+
+        max_batch = min(int(max_batch or self.max_batch), self.max_batch)
+        with stage("input"):
+            inputs = [self._prepare_series(item["candles"], horizon) for item in items]
+
+        if task == "generate_paths":
+            return {
+                "forecasts": [
+                    {
+                        "symbol": item.get("symbol"),
+                        "paths": self._sample_paths(
+                            frame,
+                            x_timestamp,
+                            y_timestamp,
+                            horizon=horizon,
+                            temperature=temperature,
+                            top_p=top_p,
+                            num_samples=num_samples,
+                            max_batch=max_batch,
+                        ),
+                    }
+                    for item, (frame, x_timestamp, y_timestamp) in zip(items, inputs)
+                ]
+            }
+
+        candles = self._forecast_series(
+            inputs,
+            horizon=horizon,
+            temperature=temperature,
+            top_p=top_p,
+            max_batch=max_batch,
+        )
+        return {
+            "forecasts": [
+                {"symbol": item.get("symbol"), "candles": forecast}
+                for item, forecast in zip(items, candles)
+            ]
+        }
+
+    def _prepare_series(self, candles: List[Dict[str, Any]], horizon: int) -> Tuple[Any, Any, Any]:
+        import pandas as pd
 
         timestamps = [row.get("timestamp") for row in candles]
         x_df = pd.DataFrame(candles)
@@ -131,39 +247,102 @@ class KronosProvider(ModelProvider):
         y_timestamp = self._future_timestamps(x_timestamp, horizon)
         frame = x_df[[c for c in ["open", "high", "low", "close", "volume", "amount"] if c in x_df.columns]]
         frame = frame.dropna(axis=1, how="all")
+        return frame, x_timestamp, y_timestamp
 
-        if task == "generate_paths":
-            paths = []
-            for _ in range(num_samples):
-                pred_df = self.predictor.predict(
-                    df=frame,
-                    x_timestamp=x_timestamp,
-                    y_timestamp=y_timestamp,
+    def _forecast_series(
+        self,
+        inputs: List[Tuple[Any, Any, Any]],
+        horizon: int,
+        temperature: float,
+        top_p: float,
+        max_batch: int,
+    ) -> List[List[Dict[str, Any]]]:
+        # predict_batch stacks contexts, so only series with the same length,
+        # columns and candle interval can share a decode.
+        groups: Dict[Tuple[Any, ...], List[int]] = {}
+        for idx, (frame, x_timestamp, y_timestamp) in enumerate(inputs):
+            key = (len(frame), tuple(frame.columns), y_timestamp.iloc[0] - x_timestamp.iloc[-1])
+            groups.setdefault(key, []).append(idx)
+
+        predict_batch = getattr(self.predictor, "predict_batch", None)
+        results: List[List[Dict[str, Any]]] = [[] for _ in inputs]
+        for indices in groups.values():
+            for start in range(0, len(indices), max_batch):
+                chunk = indices[start : start + max_batch]
+                with stage("forward"):
+                    if predict_batch is None or len(chunk) == 1:
+                        pred_dfs = [
+                            self.predictor.predict(
+                                df=inputs[idx][0],
+                                x_timestamp=inputs[idx][1],
+                                y_timestamp=inputs[idx][2],
+                                pred_len=horizon,
+                                T=temperature,
+                                top_p=top_p,
+                                sample_count=1,
+                            )
+                            for idx in chunk
+                        ]
+                    else:
+                        pred_dfs = predict_batch(
+                            df_list=[inputs[idx][0] for idx in chunk],
+                            x_timestamp_list=[inputs[idx][1] for idx in chunk],
+                            y_timestamp_list=[inputs[idx][2] for idx in chunk],
+                            pred_len=horizon,
+                            T=temperature,
+                            top_p=top_p,
+                            sample_count=1,
+                        )
+                for idx, pred_df in zip(chunk, pred_dfs):
+                    results[idx] = self._dataframe_to_candles(pred_df)
+        return results
+
+    def _sample_paths(
+        self,
+        frame: Any,
+        x_timestamp: Any,
+        y_timestamp: Any,
+        horizon: int,
+        temperature: float,
+        top_p: float,
+        num_samples: int,
+        max_batch: int,
+    ) -> List[List[Dict[str, Any]]]:
+        predict_batch = getattr(self.predictor, "predict_batch", None)
+        if predict_batch is None:
+            # Older runtimes average `sample_count` draws, so each path needs its own decode.
+            with stage("forward"):
+                pred_dfs = [
+                    self.predictor.predict(
+                        df=frame,
+                        x_timestamp=x_timestamp,
+                        y_timestamp=y_timestamp,
+                        pred_len=horizon,
+                        T=temperature,
+                        top_p=top_p,
+                        sample_count=1,
+                    )
+                    for _ in range(num_samples)
+                ]
+            return [self._dataframe_to_candles(pred_df) for pred_df in pred_dfs]
+
+        # Replicate the context along the batch dimension so every path is an
+        # independent sample from one autoregressive decode.
+        paths: List[List[Dict[str, Any]]] = []
+        for start in range(0, num_samples, max_batch):
+            size = min(max_batch, num_samples - start)
+            with stage("forward"):
+                pred_dfs = predict_batch(
+                    df_list=[frame] * size,
+                    x_timestamp_list=[x_timestamp] * size,
+                    y_timestamp_list=[y_timestamp] * size,
                     pred_len=horizon,
                     T=temperature,
                     top_p=top_p,
                     sample_count=1,
                 )
-                paths.append(self._dataframe_to_candles(pred_df))
-            return {
-                "forecasts": [
-                    {
-                        "symbol": symbol,
-                        "paths": paths,
-                    }
-                ]
-            }
-
-        pred_df = self.predictor.predict(
-            df=frame,
-            x_timestamp=x_timestamp,
-            y_timestamp=y_timestamp,
-            pred_len=horizon,
-            T=temperature,
-            top_p=top_p,
-            sample_count=1,
-        )
-        return {"forecasts": [{"symbol": symbol, "candles": self._dataframe_to_candles(pred_df)}]}
+            paths.extend(self._dataframe_to_candles(pred_df) for pred_df in pred_dfs)
+        return paths
 
     def _future_timestamps(self, history: Any, horizon: int) -> Any:
         freq = history.diff().dropna().mode()
@@ -174,20 +353,21 @@ class KronosProvider(ModelProvider):
         return pd.Series(future)
 
     def _dataframe_to_candles(self, frame: Any) -> List[Dict[str, Any]]:
-        reset = frame.reset_index()
-        timestamp_key = "index" if "index" in reset.columns else reset.columns[0]
-        candles: List[Dict[str, Any]] = []
-        for row in reset.to_dict(orient="records"):
-            candle = {
-                "timestamp": str(row.get(timestamp_key)),
-                "open": row.get("open"),
-                "high": row.get("high"),
-                "low": row.get("low"),
-                "close": row.get("close"),
-            }
-            if "volume" in row:
-                candle["volume"] = row.get("volume")
-            if "amount" in row:
-                candle["amount"] = row.get("amount")
-            candles.append(candle)
-        return candles
+        with stage("format"):
+            reset = frame.reset_index()
+            timestamp_key = "index" if "index" in reset.columns else reset.columns[0]
+            candles: List[Dict[str, Any]] = []
+            for row in reset.to_dict(orient="records"):
+                candle = {
+                    "timestamp": str(row.get(timestamp_key)),
+                    "open": row.get("open"),
+                    "high": row.get("high"),
+                    "low": row.get("low"),
+                    "close": row.get("close"),
+                }
+                if "volume" in row:
+                    candle["volume"] = row.get("volume")
+                if "amount" in row:
+                    candle["amount"] = row.get("amount")
+                candles.append(candle)
+            return candles
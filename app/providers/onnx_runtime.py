@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, List
+
+import numpy as np
+import torch
+
+from app.metrics import stage
+from app.onnx_export import read_manifest
+from app.providers.chronos import ChronosProvider
+from app.providers.shared import flatten_targets
+from app.providers.timesfm import TimesFMProvider
+
+
+GRAPH_OPTIMIZATIONS = {
+    "disabled": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+
+def create_session(
+    path: str,
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+    graph_optimization: str = "all",
+) -> Any:
+    import onnxruntime as ort
+
+    level = GRAPH_OPTIMIZATIONS.get(graph_optimization.lower())
+    if level is None:
+        raise ValueError(
+            f"Unsupported ONNX graph optimization [{graph_optimization}]; "
+            f"expected one of {', '.join(GRAPH_OPTIMIZATIONS)}."
+        )
+    options = ort.SessionOptions()
+    options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level)
+    # Worker processes size torch's pool to their core range; follow it by default.
+    options.intra_op_num_threads = intra_op_threads or torch.get_num_threads()
+    if inter_op_threads:
+        options.inter_op_num_threads = inter_op_threads
+        if inter_op_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+class _OnnxSessionMixin:
+    def _init_session(self, intra_op_threads: int, inter_op_threads: int, graph_optimization: str) -> None:
+        self.session = None
+        self.model_bytes = 0
+        self.runtime = "onnxruntime"
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.graph_optimization = graph_optimization
+
+    def _load_session(self, model_path: str, device: str) -> dict:
+        if torch.device(device).type != "cpu":
+            raise ValueError("The onnxruntime backend only runs on CPU.")
+        directory, manifest = read_manifest(model_path)
+        path = os.path.join(directory, manifest["file"])
+        self.session = create_session(path, self.intra_op_threads, self.inter_op_threads, self.graph_optimization)
+        self.model_bytes = os.path.getsize(path)
+        self.precision = "int8" if manifest.get("quantized") else "fp32"
+        self.device = device
+        return manifest
+
+    def memory_bytes(self) -> int:
+        return self.model_bytes
+
+
+class OnnxTimesFMProvider(_OnnxSessionMixin, TimesFMProvider):
+    def __init__(self, intra_op_threads: int = 0, inter_op_threads: int = 0, graph_optimization: str = "all") -> None:
+        super().__init__()
+        self._init_session(intra_op_threads, inter_op_threads, graph_optimization)
+
+    def load(self, model_path: str, device: str) -> None:
+        manifest = self._load_session(model_path, device)
+        self.context_len = int(manifest["context_length"])
+        self.patch_len = int(manifest["patch_length"])
+        self.loaded = True
+
+    def unload(self) -> None:
+        super().unload()
+        self.session = None
+
+    def _bucket_length(self, length: int) -> int:
+        # The exported graph takes at least two patches.
+        return max(super()._bucket_length(length), 2 * self.patch_len)
+
+    def _forecast(self, histories: List[List[float]], horizon: int, freq_idx: int) -> List[List[float]]:
+        if self.session is None:
+            raise RuntimeError("TimesFM model not loaded.")
+        with stage("input"):
+            flat, spans = flatten_targets(histories, self.context_len)
+            contexts = [flat[start:end] for start, end in spans]
+
+        means: List[List[float]] = [[] for _ in contexts]
+        for bucket_len, indices in self._length_buckets(contexts).items():
+            with stage("input"):
+                # Left-pad with masked zeros, as TimesFmModelForPrediction does.
+                values = np.zeros((len(indices), bucket_len), dtype=np.float32)
+                padding = np.ones((len(indices), bucket_len), dtype=np.float32)
+                for row, idx in enumerate(indices):
+                    length = contexts[idx].shape[0]
+                    if length:
+                        values[row, -length:] = contexts[idx]
+                        padding[row, -length:] = 0.0
+            with stage("forward"):
+                (mean_predictions,) = self.session.run(
+                    None,
+                    {
+                        "past_values": values,
+                        "past_values_padding": padding,
+                        "freq": np.full((len(indices), 1), freq_idx, dtype=np.int32),
+                    },
+                )
+            with stage("format"):
+                for idx, row in zip(indices, mean_predictions[:, :horizon].tolist()):
+                    means[idx] = row
+        return means
+
+
+class OnnxChronosProvider(_OnnxSessionMixin, ChronosProvider):
+    def __init__(self, intra_op_threads: int = 0, inter_op_threads: int = 0, graph_optimization: str = "all") -> None:
+        super().__init__()
+        self._init_session(intra_op_threads, inter_op_threads, graph_optimization)
+        self.context_len = 0
+        self.input_patch_size = 1
+        self.output_patch_size = 1
+        self.max_output_patches = 1
+
+    def load(self, model_path: str, device: str) -> None:
+        manifest = self._load_session(model_path, device)
+        self.context_len = int(manifest["context_length"])
+        self.input_patch_size = int(manifest["input_patch_size"])
+        self.output_patch_size = int(manifest["output_patch_size"])
+        self.max_output_patches = int(manifest["max_output_patches"])
+        self.quantiles = list(manifest["quantiles"])
+        self.loaded = True
+
+    def unload(self) -> None:
+        super().unload()
+        self.session = None
+
+    def _predict_quantiles(self, contexts: List[torch.Tensor], horizon: int) -> Any:
+        if self.session is None:
+            raise RuntimeError("Chronos model not loaded.")
+        max_horizon = self.max_output_patches * self.output_patch_size
+        if horizon > max_horizon:
+            # Longer horizons need the pipeline's autoregressive unrolling.
+            raise ValueError(f"The onnxruntime backend supports horizons up to {max_horizon}.")
+
+        with stage("input"):
+            batch = self._context_batch(contexts)
+        with stage("forward"):
+            (quantile_preds,) = self.session.run(
+                None,
+                {
+                    "context": batch,
+                    "group_ids": np.arange(len(batch), dtype=np.int64),
+                    "output_patches": np.zeros(math.ceil(horizon / self.output_patch_size), dtype=np.float32),
+                },
+            )
+        return list(quantile_preds[:, :, :horizon])
+
+    def _context_batch(self, contexts: List[torch.Tensor]) -> np.ndarray:
+        windows = [context.numpy()[-self.context_len :] for context in contexts]
+        # Missing values are NaN, which Chronos-2 masks out like the pipeline's left
+        # padding; the exported graph takes whole patches, at least two of them.
+        longest = max(window.shape[0] for window in windows)
+        length = max(2, math.ceil(longest / self.input_patch_size)) * self.input_patch_size
+        batch = np.full((len(windows), length), np.nan, dtype=np.float32)
+        for row, window in enumerate(windows):
+            if window.shape[0]:
+                batch[row, -window.shape[0] :] = window
+        return batch
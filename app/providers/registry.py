@@ -1,21 +1,50 @@
 from __future__ import annotations
 
 from app.config import Settings
+from app.pool import parse_warmup_shapes
 from app.providers.base import ModelProvider
-from app.providers.chronos import ChronosProvider
-from app.providers.kronos import KronosProvider
-from app.providers.timesfm import TimesFMProvider
 
 
-def create_provider(settings: Settings) -> ModelProvider:
-    model_type = settings.model_type.lower()
+CHRONOS_TYPES = {"chronos", "chronos2", "chronos-2"}
+
+
+def create_provider(
+    settings: Settings,
+    model_type: str | None = None,
+    model_id: str | None = None,
+) -> ModelProvider:
+    # Provider modules are imported on demand so a process only pays for the
+    # runtime (torch, transformers, chronos, onnxruntime) of the model it serves.
+    model_type = (model_type or settings.model_type).lower()
+    if settings.model_runtime == "onnx" and (model_type == "timesfm" or model_type in CHRONOS_TYPES):
+        from app.providers.onnx_runtime import OnnxChronosProvider, OnnxTimesFMProvider
+
+        provider_class = OnnxTimesFMProvider if model_type == "timesfm" else OnnxChronosProvider
+        return provider_class(
+            intra_op_threads=settings.onnx_intra_op_threads,
+            inter_op_threads=settings.onnx_inter_op_threads,
+            graph_optimization=settings.onnx_graph_optimization,
+        )
     if model_type == "timesfm":
-        return TimesFMProvider()
-    if model_type in {"chronos", "chronos2", "chronos-2"}:
-        return ChronosProvider()
+        from app.precision import resolve_precision
+        from app.providers.timesfm import TimesFMProvider
+
+        return TimesFMProvider(
+            precision=resolve_precision(settings.cpu_precision, model_id or model_type, model_type),
+            compile_buckets=parse_warmup_shapes(settings.compile_buckets) if settings.torch_compile else None,
+            compile_backend=settings.compile_backend,
+        )
+    if model_type in CHRONOS_TYPES:
+        from app.precision import resolve_precision
+        from app.providers.chronos import ChronosProvider
+
+        return ChronosProvider(precision=resolve_precision(settings.cpu_precision, model_id or model_type, model_type))
     if model_type == "kronos":
+        from app.providers.kronos import KronosProvider
+
         return KronosProvider(
             tokenizer_path=settings.kronos_tokenizer_path,
             runtime_path=settings.kronos_runtime_path,
+            max_batch=settings.kronos_max_batch,
         )
-    raise ValueError(f"Unsupported MODEL_TYPE: {settings.model_type}")
+    raise ValueError(f"Unsupported MODEL_TYPE: {model_type}")
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import json
+from itertools import chain
+from typing import Any, Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
 
 
 def forecast_result(
@@ -11,3 +15,31 @@ def forecast_result(
         "mean": mean,
         "quantiles": quantiles or {},
     }
+
+
+def series_batch_key(task: str, payload: Dict[str, Any], *extra: Hashable) -> Tuple[Hashable, ...]:
+    params = {key: value for key, value in payload.items() if key != "series"}
+    return (task, json.dumps(params, sort_keys=True, default=str), *extra)
+
+
+def flatten_targets(
+    targets: Sequence[Any],
+    tail: int | None = None,
+    dtype: Any = np.float32,
+) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    # Copies every series (optionally only its last `tail` points) into one
+    # contiguous buffer, so a batch costs a single allocation and a single
+    # torch.from_numpy instead of one tensor per series.
+    rows = [row[-tail:] if tail else row for row in targets]
+    spans: List[Tuple[int, int]] = []
+    total = 0
+    for row in rows:
+        spans.append((total, total + len(row)))
+        total += len(row)
+    if all(isinstance(row, list) for row in rows):
+        flat = np.fromiter(chain.from_iterable(rows), dtype=dtype, count=total)
+    else:
+        flat = np.empty(total, dtype=dtype)
+        for row, (start, end) in zip(rows, spans):
+            flat[start:end] = row
+    return flat, spans
@@ -1,20 +1,28 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import logging
+from typing import Any, Dict, Hashable, List, Tuple
 
 import torch
+from pydantic import ValidationError
 
+from app.compiled import BucketedCompiledForward
+from app.metrics import stage
+from app.precision import effective_precision, precision_context, quantize_linear_layers
 from app.providers.base import ModelProvider
-from app.providers.shared import forecast_result
+from app.providers.shared import flatten_targets, forecast_result, series_batch_key
 from app.schemas import (
     ModelDescriptor,
     TaskDefinition,
     TimesFMForecastRequest,
     TimesFMForecastResponse,
+    model_schema,
     schema_bundle,
 )
 
 
+logger = logging.getLogger("unitshub.timesfm")
+
 FREQ_MAP = {
     "auto": 0,
     "high": 0,
@@ -39,10 +47,22 @@ FREQ_MAP = {
 
 
 class TimesFMProvider(ModelProvider):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        precision: str = "fp32",
+        compile_buckets: List[Tuple[int, int]] | None = None,
+        compile_backend: str = "inductor",
+    ) -> None:
         super().__init__()
         self.model = None
+        self.requested_precision = precision
+        self.compile_buckets = compile_buckets or []
+        self.compile_backend = compile_backend
+        self.compiled: BucketedCompiledForward | None = None
+        self.precision = "fp32"
         self.runtime = "transformers"
+        self.context_len = 512
+        self.patch_len = 32
 
     def load(self, model_path: str, device: str) -> None:
         self.device = device
@@ -56,16 +76,59 @@ class TimesFMProvider(ModelProvider):
             attn_implementation="sdpa",
         ).to(torch_device)
         self.model.eval()
+        self.precision = effective_precision(self.requested_precision, device)
+        if self.precision == "int8":
+            quantize_linear_layers(self.model)
+        self.context_len = int(getattr(self.model.config, "context_length", self.context_len))
+        self.patch_len = int(getattr(self.model.config, "patch_length", self.patch_len))
+        if self.compile_buckets:
+            self._install_compiled_decoder()
         self.loaded = True
 
+    def _install_compiled_decoder(self) -> None:
+        # Replace the decoder's forward on the instance so parameter names (and
+        # the mmap weight mapping that relies on them) stay unchanged. Graphs are
+        # compiled lazily by the warm-up batches below.
+        decoder = self.model.decoder
+        buckets = [(batch, self._bucket_length(length)) for batch, length in self.compile_buckets]
+        try:
+            self.compiled = BucketedCompiledForward(decoder.forward, buckets, backend=self.compile_backend)
+        except Exception as exc:
+            logger.warning("torch.compile is unavailable; TimesFM stays eager: %s", exc)
+            self.compiled = None
+            return
+        decoder.forward = self.compiled
+        self.runtime = "transformers+compile"
+
+    def torch_modules(self) -> List[Any]:
+        return [self.model] if self.model is not None else []
+
+    def unload(self) -> None:
+        super().unload()
+        self.model = None
+        self.compiled = None
+
+    def runtime_stats(self) -> Dict[str, Any] | None:
+        return self.compiled.stats() if self.compiled is not None else None
+
+    def warmup_requests(
+        self,
+        shapes: List[Tuple[int, int]],
+        horizon: int,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        requests = super().warmup_requests(shapes, horizon)
+        if self.compiled is not None:
+            requests += super().warmup_requests(self.compiled.buckets, horizon)
+        return requests
+
     def descriptor(self) -> ModelDescriptor:
         tasks = [
             TaskDefinition(
                 name="forecast_point",
                 title="Point Forecast",
                 description="Point forecast for a univariate time series.",
-                input_schema=TimesFMForecastRequest.model_json_schema(),
-                output_schema=TimesFMForecastResponse.model_json_schema(),
+                input_schema=model_schema(TimesFMForecastRequest),
+                output_schema=model_schema(TimesFMForecastResponse),
             )
         ]
         return ModelDescriptor(
@@ -81,6 +144,8 @@ class TimesFMProvider(ModelProvider):
                 "supports_covariates": False,
                 "supports_multivariate": False,
                 "runtime": self.runtime,
+                "max_context": self.context_len,
+                "precision": self.precision,
             },
         )
 
@@ -89,37 +154,80 @@ class TimesFMProvider(ModelProvider):
             "forecast_point": schema_bundle(TimesFMForecastRequest, TimesFMForecastResponse),
         }
 
-    def invoke(self, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def batch_request(
+        self,
+        task: str,
+        payload: Dict[str, Any],
+    ) -> Tuple[Hashable, Dict[str, Any]] | None:
         if task != "forecast_point":
-            raise ValueError(f"TimesFM does not support task [{task}].")
-        if self.model is None:
-            raise RuntimeError("TimesFM model not loaded.")
-
+            return None
         if "series" in payload:
-            histories = [item["target"] for item in (payload.get("series") or [])]
-            horizon = int(payload["horizon"])
-            freq_raw = str(payload.get("frequency") or payload.get("freq") or "0").lower()
+            series_payload = payload
         else:
-            request = TimesFMForecastRequest.model_validate(payload)
-            histories = [request.history]
-            horizon = request.horizon
-            freq_raw = request.frequency.lower()
+            try:
+                request = TimesFMForecastRequest.model_validate(payload)
+            except ValidationError:
+                return None
+            series_payload = {
+                "series": [{"target": request.history}],
+                "horizon": request.horizon,
+                "frequency": request.frequency,
+            }
+        return series_batch_key(task, series_payload), series_payload
 
-        freq_idx = FREQ_MAP.get(freq_raw, 0)
-
-        inputs = torch.tensor(histories, dtype=self.model.dtype, device=self.model.device)
-        freq = torch.tensor([freq_idx] * len(histories), dtype=torch.long, device=self.model.device)
-
-        with torch.no_grad():
-            outputs = self.model(
-                past_values=inputs,
-                freq=freq,
-                return_dict=True,
-            )
-            mean_predictions = outputs.mean_predictions[:, :horizon]
+    def invoke(self, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if task != "forecast_point":
+            raise ValueError(f"TimesFM does not support task [{task}].")
 
-        forecasts = [
-            forecast_result(row.tolist())
-            for row in mean_predictions.cpu().to(torch.float32).numpy()
-        ]
-        return {"forecasts": forecasts}
+        with stage("input"):
+            if "series" in payload:
+                histories = [item["target"] for item in (payload.get("series") or [])]
+                horizon = int(payload["horizon"])
+                freq_raw = str(payload.get("frequency") or payload.get("freq") or "0").lower()
+            else:
+                request = TimesFMForecastRequest.model_validate(payload)
+                histories = [request.history]
+                horizon = request.horizon
+                freq_raw = request.frequency.lower()
+
+        means = self._forecast(histories, horizon, FREQ_MAP.get(freq_raw, 0))
+        with stage("format"):
+            return {"forecasts": [forecast_result(mean) for mean in means]}
+
+    def _forecast(self, histories: List[List[float]], horizon: int, freq_idx: int) -> List[List[float]]:
+        if self.model is None:
+            raise RuntimeError("TimesFM model not loaded.")
+        with stage("input"):
+            flat, spans = flatten_targets(histories, self.context_len)
+            # One host-to-device copy for the batch; each context is a view into it.
+            buffer = torch.from_numpy(flat).to(device=self.model.device, dtype=self.model.dtype)
+            contexts = [buffer[start:end] for start, end in spans]
+
+        # Each bucket runs one forward pass padded only up to its own length.
+        means: List[List[float]] = [[] for _ in contexts]
+        with torch.no_grad(), precision_context(self.precision):
+            for bucket_len, indices in self._length_buckets(contexts).items():
+                with stage("forward"):
+                    outputs = self.model(
+                        past_values=[contexts[idx] for idx in indices],
+                        freq=[freq_idx] * len(indices),
+                        forecast_context_len=bucket_len,
+                        return_dict=True,
+                    )
+                    mean_predictions = outputs.mean_predictions[:, :horizon].cpu().to(torch.float32).numpy()
+                with stage("format"):
+                    for idx, row in zip(indices, mean_predictions.tolist()):
+                        means[idx] = row
+        return means
+
+    def _bucket_length(self, length: int) -> int:
+        bucket = self.patch_len
+        while bucket < length and bucket < self.context_len:
+            bucket *= 2
+        return min(bucket, self.context_len)
+
+    def _length_buckets(self, contexts: List[Any]) -> Dict[int, List[int]]:
+        buckets: Dict[int, List[int]] = {}
+        for idx, context in enumerate(contexts):
+            buckets.setdefault(self._bucket_length(int(context.shape[0])), []).append(idx)
+        return buckets
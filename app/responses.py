@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # orjson handles C-contiguous arrays natively; everything else lands here.
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if hasattr(value, "detach"):
+        return value.detach().cpu().tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def round_floats(value: Any, digits: int) -> Any:
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, np.ndarray):
+        return np.round(value, digits) if value.dtype.kind == "f" else value
+    if isinstance(value, dict):
+        return {key: round_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(type(item) is float for item in value):
+            # Forecast rows are rounded as one array and serialized without a Python list.
+            return np.round(np.asarray(value, dtype=np.float64), digits)
+        return [round_floats(item, digits) for item in value]
+    return value
+
+
+# Forecast routes return this response directly, so FastAPI skips response-model
+# validation and jsonable_encoder's walk over every float.
+class ForecastJSONResponse(JSONResponse):
+    def __init__(self, content: Any, float_digits: int = 0, **kwargs: Any) -> None:
+        self.float_digits = float_digits
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.float_digits > 0:
+            content = round_floats(content, self.float_digits)
+        return dumps(content)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -34,9 +35,62 @@ class ModelSchemaResponse(BaseModel):
 
 class InvokeRequest(BaseModel):
     task: str = Field(..., description="Task name to invoke.")
+    model: Optional[str] = Field(None, description="Hosted model id. Defaults to the current model.")
     input: Dict[str, Any] = Field(..., description="Task input payload.")
 
 
+class JobRequest(InvokeRequest):
+    priority: Literal["interactive", "batch"] = Field(
+        "batch",
+        description="Queue lane. Interactive jobs run before batch jobs, and batch jobs yield to live requests.",
+    )
+
+
+class JobProgress(BaseModel):
+    completed: int
+    total: int
+
+
+class JobStatus(BaseModel):
+    id: str
+    task: str
+    model: Optional[str] = None
+    lane: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: JobProgress
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class SessionCreateRequest(BaseModel):
+    task: Optional[str] = Field(None, description="Forecast task. Defaults to the model's point forecast task.")
+    model: Optional[str] = Field(None, description="Hosted model id. Defaults to the current model.")
+    input: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Task parameters such as `horizon` and `quantiles`. The series itself is kept by the session.",
+    )
+    history: List[float] = Field(default_factory=list, description="Initial observations, oldest first.")
+    window: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Most recent observations kept as context. Defaults to the model's maximum context.",
+    )
+
+
+class SessionAppendRequest(BaseModel):
+    values: List[float] = Field(..., min_length=1, description="New observations, oldest first.")
+    forecast: bool = Field(True, description="Return an updated forecast. Set to false to only record the values.")
+
+
+class SessionResponse(BaseModel):
+    model: str
+    task: str
+    output: Optional[Dict[str, Any]] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
 class InvokeResponse(BaseModel):
     model: str
     task: str
@@ -124,6 +178,11 @@ class KronosGeneratePathsRequest(BaseModel):
     num_samples: int = Field(..., gt=0, le=64, description="Number of sampled paths.")
     temperature: float = Field(default=1.0, gt=0.0)
     top_p: float = Field(default=0.9, gt=0.0, le=1.0)
+    max_batch: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of paths decoded together; lowers peak memory.",
+    )
 
 
 class KronosGeneratePathsResponse(BaseModel):
@@ -131,8 +190,13 @@ class KronosGeneratePathsResponse(BaseModel):
     paths: List[List[Candle]]
 
 
+@lru_cache(maxsize=None)
+def model_schema(model: type[BaseModel]) -> JsonSchema:
+    return model.model_json_schema()
+
+
 def schema_bundle(input_model: type[BaseModel], output_model: type[BaseModel]) -> Dict[str, Any]:
     return {
-        "input": input_model.model_json_schema(),
-        "output": output_model.model_json_schema(),
+        "input": model_schema(input_model),
+        "output": model_schema(output_model),
     }
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+
+class UnknownSessionError(KeyError):
+    pass
+
+
+class RingBuffer:
+    # Every value is written twice, `capacity` apart, so the latest window is
+    # always one contiguous slice and reading it never copies.
+    def __init__(self, capacity: int, dtype: Any = np.float32) -> None:
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(2 * self.capacity, dtype=dtype)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def extend(self, values: Sequence[float]) -> None:
+        values = np.asarray(values, dtype=self._data.dtype).reshape(-1)[-self.capacity :]
+        count = len(values)
+        head = min(count, self.capacity - self._next)
+        self._write(self._next, values[:head])
+        self._write(0, values[head:])
+        self._next = (self._next + count) % self.capacity
+        self._size = min(self.capacity, self._size + count)
+
+    def view(self) -> np.ndarray:
+        start = self._next + self.capacity - self._size
+        return self._data[start : start + self._size]
+
+    def _write(self, start: int, values: np.ndarray) -> None:
+        end = start + len(values)
+        self._data[start:end] = values
+        self._data[start + self.capacity : end + self.capacity] = values
+
+
+class ForecastSession:
+    def __init__(
+        self,
+        task: str,
+        model: str | None,
+        parameters: Dict[str, Any],
+        window: int,
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.task = task
+        self.model = model
+        self.parameters = parameters
+        self.buffer = RingBuffer(window)
+        self.observations = 0
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        # Appends and forecasts are serialized per session: the model reads the
+        # buffer in place, so it must not move underneath an in-flight call.
+        self.lock = asyncio.Lock()
+        self._forecast: Dict[str, Any] | None = None
+        self._forecast_at = -1
+
+    def append(self, values: Sequence[float]) -> None:
+        self.buffer.extend(values)
+        self.observations += len(values)
+
+    def payload(self) -> Dict[str, Any]:
+        return {**self.parameters, "series": [{"target": self.buffer.view()}]}
+
+    def cached_forecast(self) -> Dict[str, Any] | None:
+        return self._forecast if self._forecast_at == self.observations else None
+
+    def remember(self, output: Dict[str, Any]) -> None:
+        self._forecast, self._forecast_at = output, self.observations
+
+    def view(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "task": self.task,
+            "model": self.model,
+            "parameters": self.parameters,
+            "window": self.buffer.capacity,
+            "length": len(self.buffer),
+            "observations": self.observations,
+            "created_at": self.created_at,
+        }
+
+
+class SessionStore:
+    def __init__(self, max_sessions: int, ttl_seconds: float) -> None:
+        # Non-positive values disable the count limit and idle expiry.
+        self.max_sessions = int(max_sessions)
+        self.ttl_seconds = float(ttl_seconds)
+        self.created = 0
+        self.expired = 0
+        self.evictions = 0
+        self._sessions: OrderedDict[str, ForecastSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, session: ForecastSession) -> None:
+        with self._lock:
+            self._expire()
+            self._sessions[session.id] = session
+            self.created += 1
+            while self.max_sessions > 0 and len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, session_id: str) -> ForecastSession:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise UnknownSessionError(session_id)
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            if self._sessions.pop(session_id, None) is None:
+                raise UnknownSessionError(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "buffer_bytes": sum(session.buffer.nbytes for session in self._sessions.values()),
+                "created": self.created,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+
+    def _expire(self) -> None:
+        # Sessions are kept in last-use order, so expired ones are at the front.
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from starlette.responses import StreamingResponse
+
+from app.arrow import ID_COLUMNS
+from app.responses import dumps, round_floats
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# (record index, series record or None, parse error or None)
+NdjsonRecord = Tuple[int, Dict[str, Any] | None, str | None]
+
+
+class RequestStreamingResponse(StreamingResponse):
+    # The body is read while the response streams, so nothing else may pull from
+    # the request's receive channel; a disconnect surfaces while reading the body.
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    pending = bytearray()
+    async for data in body:
+        start = len(pending)
+        pending += data
+        end = pending.find(b"\n", start)
+        start = 0
+        while end >= 0:
+            yield bytes(pending[start:end])
+            start = end + 1
+            end = pending.find(b"\n", start)
+        del pending[:start]
+    if pending:
+        yield bytes(pending)
+
+
+async def iter_ndjson_chunks(body: AsyncIterator[bytes], chunk_size: int) -> AsyncIterator[List[NdjsonRecord]]:
+    chunk: List[NdjsonRecord] = []
+    index = 0
+    async for line in iter_ndjson_lines(body):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            chunk.append((index, None, "Line is not valid JSON."))
+        else:
+            if isinstance(record, dict):
+                chunk.append((index, record, None))
+            else:
+                chunk.append((index, None, "Each line must be a JSON object."))
+        index += 1
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ndjson_line(
+    index: int,
+    item: Dict[str, Any] | None,
+    content: Dict[str, Any],
+    float_digits: int = 0,
+) -> bytes:
+    record: Dict[str, Any] = {"index": index}
+    for column in ID_COLUMNS:
+        if item is not None and column in item:
+            record[column] = item[column]
+    record.update(round_floats(content, float_digits) if float_digits > 0 else content)
+    return dumps(record) + b"\n"
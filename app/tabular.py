@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+PARQUET_MAGIC = b"PAR1"
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+class TableFormatError(ValueError):
+    pass
+
+
+async def spool_upload(upload: Any, suffix: str = "") -> str:
+    # Copy the upload to disk in fixed-size chunks instead of one `read()`.
+    handle = tempfile.NamedTemporaryFile(prefix="unitshub-", suffix=suffix, delete=False)
+    try:
+        with handle:
+            while True:
+                chunk = await upload.read(SPOOL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                handle.write(chunk)
+    except BaseException:
+        os.unlink(handle.name)
+        raise
+    return handle.name
+
+
+def is_parquet_file(path: str) -> bool:
+    with open(path, "rb") as handle:
+        return handle.read(len(PARQUET_MAGIC)) == PARQUET_MAGIC
+
+
+def scan_table(path: str) -> pl.LazyFrame:
+    import polars as pl
+
+    if os.path.isdir(path) or path.endswith(".parquet") or "*" in path:
+        return pl.scan_parquet(path)
+    if os.path.getsize(path) == 0:
+        raise TableFormatError("The uploaded file is empty.")
+    if is_parquet_file(path):
+        return pl.scan_parquet(path)
+    return pl.scan_csv(path)
+
+
+def list_column_views(column: pl.Series) -> List[np.ndarray]:
+    import polars as pl
+
+    if isinstance(column.dtype, pl.Array):
+        column = column.arr.to_list()
+    if not isinstance(column.dtype, pl.List):
+        raise TableFormatError(f"Column [{column.name}] must be a list of numbers.")
+
+    lengths = column.list.len().fill_null(0).to_numpy().astype(np.int64)
+    if (lengths == 0).any():
+        raise TableFormatError(f"Every [{column.name}] row must contain at least one value.")
+    values = column.explode().cast(pl.Float64)
+    if values.null_count():
+        raise TableFormatError(f"Column [{column.name}] values must not be null.")
+
+    # Each series is a view into one contiguous buffer rather than a Python list.
+    flat = values.to_numpy()
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    return [flat[offsets[idx] : offsets[idx + 1]] for idx in range(len(lengths))]
+
+
+def collect_series(
+    frame: pl.LazyFrame,
+    target_column: str,
+    series_id_column: str | None = None,
+) -> Tuple[List[Any] | None, List[np.ndarray]]:
+    import polars as pl
+
+    try:
+        columns = frame.collect_schema().names()
+    except pl.exceptions.NoDataError as exc:
+        raise TableFormatError("The uploaded file is empty.") from exc
+    if target_column not in columns:
+        raise TableFormatError(f"Target column [{target_column}] not found.")
+    if series_id_column and series_id_column not in columns:
+        raise TableFormatError(f"Series id column [{series_id_column}] not found.")
+
+    target = pl.col(target_column).cast(pl.Float64)
+    if series_id_column:
+        grouped = (
+            frame.select(pl.col(series_id_column), target)
+            .drop_nulls()
+            .group_by(series_id_column, maintain_order=True)
+            .agg(target)
+            .collect(engine="streaming")
+        )
+        return grouped[series_id_column].to_list(), list_column_views(grouped[target_column])
+
+    values = frame.select(target).drop_nulls().collect(engine="streaming")[target_column]
+    if values.is_empty():
+        raise TableFormatError(f"Target column [{target_column}] has no values.")
+    return None, [values.to_numpy()]
+
+
+def read_table_series(
+    path: str,
+    target_column: str,
+    series_id_column: str | None = None,
+) -> Tuple[List[Any] | None, List[np.ndarray]]:
+    import polars as pl
+
+    try:
+        return collect_series(scan_table(path), target_column, series_id_column)
+    except pl.exceptions.PolarsError as exc:
+        raise TableFormatError(f"Could not read the uploaded file: {exc}") from exc
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    import torch
+
+
+# torch attribute names, resolved on use so importing this module stays cheap.
+SAFETENSORS_DTYPES = {
+    "F64": "float64",
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "I64": "int64",
+    "I32": "int32",
+    "I16": "int16",
+    "I8": "int8",
+    "U8": "uint8",
+    "BOOL": "bool",
+}
+
+SMAPS_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_clean_bytes",
+    "Shared_Dirty": "shared_dirty_bytes",
+    "Private_Clean": "private_clean_bytes",
+    "Private_Dirty": "private_dirty_bytes",
+    "Anonymous": "anonymous_bytes",
+}
+
+
+def mmap_safetensors(path: str) -> Dict[str, torch.Tensor]:
+    # Tensors are views into one read-only file mapping, so every process that
+    # maps the same checkpoint shares its pages through the OS page cache.
+    import torch
+
+    size = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        (header_len,) = struct.unpack("<Q", handle.read(8))
+        header = json.loads(handle.read(header_len))
+    storage = torch.UntypedStorage.from_file(path, shared=False, nbytes=size)
+    data_start = 8 + header_len
+
+    tensors: Dict[str, torch.Tensor] = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype_name = SAFETENSORS_DTYPES.get(info["dtype"])
+        if dtype_name is None:
+            continue
+        dtype = getattr(torch, dtype_name)
+        begin, end = info["data_offsets"]
+        itemsize = torch.empty((), dtype=dtype).element_size()
+        offset = data_start + begin
+        if offset % itemsize:
+            continue
+        shape = list(info["shape"])
+        tensor = torch.empty(0, dtype=dtype)
+        tensor.set_(storage, offset // itemsize, shape, _contiguous_strides(shape))
+        if (end - begin) != tensor.numel() * itemsize:
+            continue
+        tensors[name] = tensor
+    return tensors
+
+
+def map_module_weights(module: Any, model_path: str) -> int:
+    # Swap loaded CPU parameters for mmap-backed views of the checkpoint where
+    # names, shapes and dtypes match exactly; anything else keeps its copy.
+    if not os.path.isdir(model_path) or not hasattr(module, "named_parameters"):
+        return 0
+    import torch
+
+    mapped: Dict[str, torch.Tensor] = {}
+    for path in sorted(glob.glob(os.path.join(model_path, "*.safetensors"))):
+        mapped.update(mmap_safetensors(path))
+    if not mapped:
+        return 0
+
+    total = 0
+    with torch.no_grad():
+        for name, tensor in list(module.named_parameters()) + list(module.named_buffers()):
+            source = _lookup(mapped, name)
+            if (
+                source is None
+                or tensor.device.type != "cpu"
+                or tensor.dtype != source.dtype
+                or tensor.shape != source.shape
+            ):
+                continue
+            tensor.data = source
+            total += source.numel() * source.element_size()
+    return total
+
+
+def process_memory() -> Dict[str, int] | None:
+    try:
+        with open("/proc/self/smaps_rollup", "r", encoding="utf-8") as handle:
+            lines = handle.readlines()
+    except OSError:
+        return None
+    memory: Dict[str, int] = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        field = SMAPS_FIELDS.get(key)
+        if field is not None:
+            memory[field] = int(value.split()[0]) * 1024
+    memory["shared_bytes"] = memory.get("shared_clean_bytes", 0) + memory.get("shared_dirty_bytes", 0)
+    memory["private_bytes"] = memory.get("private_clean_bytes", 0) + memory.get("private_dirty_bytes", 0)
+    return memory
+
+
+def _lookup(mapped: Dict[str, torch.Tensor], name: str) -> torch.Tensor | None:
+    if name in mapped:
+        return mapped[name]
+    # Checkpoints saved from a base model omit the head prefix, e.g. `model.`.
+    _, _, stripped = name.partition(".")
+    return mapped.get(stripped)
+
+
+def _contiguous_strides(shape: list) -> list:
+    strides = []
+    stride = 1
+    for size in reversed(shape):
+        strides.append(stride)
+        stride *= max(size, 1)
+    return list(reversed(strides))
@@ -0,0 +1,507 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from app.providers.base import ModelProvider
+from app.schemas import ModelDescriptor
+
+
+logger = logging.getLogger("unitshub.workers")
+
+# Series smaller than this are cheaper to pickle than to stage in shared memory.
+SHARED_MEMORY_MIN_VALUES = 4096
+START_TIMEOUT_SECONDS = 600.0
+LIVENESS_INTERVAL_SECONDS = 0.5
+
+
+class WorkerCrashedError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class SharedSlice:
+    offset: int
+    length: int
+
+
+@dataclass(slots=True)
+class _Worker:
+    index: int
+    cores: List[int]
+    process: Any = None
+    # The read end of this worker's own response pipe.
+    responses: Any = None
+    ready: threading.Event = field(default_factory=threading.Event)
+    error: str | None = None
+    pending: Dict[int, Tuple[Future, SharedMemory | None]] = field(default_factory=dict)
+    served: int = 0
+    restarts: int = 0
+
+
+def core_sets(processes: int, cpus: List[int] | None = None) -> List[List[int]]:
+    # Contiguous core ranges keep each worker's OpenMP threads on neighbouring cores.
+    if cpus is None:
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    processes = max(1, processes)
+    if len(cpus) < processes:
+        return [list(cpus) for _ in range(processes)]
+    size, extra = divmod(len(cpus), processes)
+    sets = []
+    start = 0
+    for index in range(processes):
+        end = start + size + (1 if index < extra else 0)
+        sets.append(cpus[start:end])
+        start = end
+    return sets
+
+
+def pack_series(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], SharedMemory | None]:
+    series = payload.get("series")
+    if not isinstance(series, list):
+        return payload, None
+    targets: List[Tuple[int, np.ndarray]] = []
+    for index, item in enumerate(series):
+        if not isinstance(item, dict) or item.get("target") is None:
+            continue
+        try:
+            values = np.asarray(item["target"], dtype=np.float64)
+        except (TypeError, ValueError):
+            continue
+        if values.ndim == 1:
+            targets.append((index, values))
+    total = sum(values.size for _, values in targets)
+    if total < SHARED_MEMORY_MIN_VALUES:
+        return payload, None
+
+    shm = SharedMemory(create=True, size=total * 8)
+    flat = np.ndarray((total,), dtype=np.float64, buffer=shm.buf)
+    packed = list(series)
+    offset = 0
+    for index, values in targets:
+        flat[offset : offset + values.size] = values
+        packed[index] = {**series[index], "target": SharedSlice(offset, values.size)}
+        offset += values.size
+    del flat
+    return {**payload, "series": packed}, shm
+
+
+def unpack_series(payload: Dict[str, Any], shm_name: str | None) -> Dict[str, Any]:
+    if shm_name is None:
+        return payload
+    shm = SharedMemory(name=shm_name)
+    try:
+        flat = np.ndarray((shm.size // 8,), dtype=np.float64, buffer=shm.buf)
+        series = []
+        for item in payload["series"]:
+            target = item.get("target") if isinstance(item, dict) else None
+            if isinstance(target, SharedSlice):
+                item = {**item, "target": flat[target.offset : target.offset + target.length].copy()}
+            series.append(item)
+        del flat
+    finally:
+        shm.close()
+    return {**payload, "series": series}
+
+
+def pin_process(cores: List[int], threads: int) -> None:
+    import torch
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    if threads > 0:
+        torch.set_num_threads(threads)
+
+
+def _worker_main(
+    factory: Callable[[], ModelProvider],
+    model_path: str,
+    device: str,
+    cores: List[int],
+    threads: int,
+    mmap_weights: bool,
+    warmup: Tuple[List[Tuple[int, int]], int],
+    requests: Any,
+    responses: Any,
+) -> None:
+    pin_process(cores, threads)
+
+    try:
+        provider = factory()
+        provider.load(model_path, device)
+        if mmap_weights and device == "cpu":
+            provider.map_weights(model_path)
+        for task, payload in provider.warmup_requests(*warmup):
+            provider.invoke(task, payload)
+        descriptor = provider.descriptor().model_dump(mode="json")
+    except Exception as exc:
+        responses.send((None, False, f"{type(exc).__name__}: {exc}"))
+        return
+    responses.send((None, True, descriptor))
+
+    while True:
+        message = requests.get()
+        if message is None:
+            return
+        request_id, task, payload, shm_name = message
+        try:
+            output = provider.invoke(task, unpack_series(payload, shm_name))
+        except Exception as exc:
+            responses.send((request_id, False, _picklable_error(exc)))
+        else:
+            responses.send((request_id, True, output))
+
+
+def _picklable_error(exc: Exception) -> Exception:
+    try:
+        pickle.loads(pickle.dumps(exc))
+        return exc
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+
+
+class ProcessWorkerPool:
+    def __init__(
+        self,
+        factory: Callable[[], ModelProvider],
+        model_path: str,
+        device: str,
+        processes: int,
+        threads_per_process: int = 0,
+        mmap_weights: bool = True,
+        warmup: Tuple[List[Tuple[int, int]], int] = ([], 16),
+        start_method: str = "spawn",
+    ) -> None:
+        self.factory = factory
+        self.model_path = model_path
+        self.device = device
+        self.mmap_weights = mmap_weights
+        self.warmup = warmup
+        self.descriptor: Dict[str, Any] | None = None
+        self._context = mp.get_context(start_method)
+        self._requests: Dict[int, Any] = {}
+        sets = core_sets(processes)
+        self.threads_per_process = threads_per_process or max(1, len(sets[0]))
+        self._workers = [_Worker(index=index, cores=cores) for index, cores in enumerate(sets)]
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._collector: threading.Thread | None = None
+
+    def start(self, timeout: float = START_TIMEOUT_SECONDS) -> None:
+        for worker in self._workers:
+            self._spawn(worker)
+        self._collector = threading.Thread(target=self._collect, name="unitshub-worker-collector", daemon=True)
+        self._collector.start()
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.ready.wait(max(0.0, deadline - time.monotonic()))
+        errors = [worker.error for worker in self._workers if worker.error]
+        if errors or not all(worker.ready.is_set() for worker in self._workers):
+            self.stop()
+            raise RuntimeError(f"Inference workers failed to start: {errors[0] if errors else 'timed out'}")
+
+    def submit(self, task: str, payload: Dict[str, Any]) -> Future:
+        future: Future = Future()
+        packed, shm = pack_series(payload)
+        with self._lock:
+            # A worker that died stays ready until the next liveness check, so ask the process directly.
+            ready = [
+                worker
+                for worker in self._workers
+                if worker.ready.is_set() and worker.error is None and worker.process.is_alive()
+            ]
+            if self._stopping or not ready:
+                if shm is not None:
+                    _release_shm(shm)
+                raise WorkerCrashedError("No inference worker process is available.")
+            # Route to the least busy worker so one slow batch does not stall the rest.
+            worker = min(ready, key=lambda item: len(item.pending))
+            request_id = next(self._ids)
+            worker.pending[request_id] = (future, shm)
+            # The put only hands the message to the queue's feeder thread, and doing it under the
+            # lock keeps a concurrent restart from swapping the queue in between.
+            self._requests[worker.index].put((request_id, task, packed, shm.name if shm is not None else None))
+        return future
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopping = True
+            workers = list(self._workers)
+        for worker in workers:
+            if worker.process is not None and worker.process.is_alive():
+                self._requests[worker.index].put(None)
+        for worker in workers:
+            if worker.process is not None:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            self._fail_pending(worker, WorkerCrashedError("Inference workers are shutting down."))
+        if self._collector is not None:
+            self._collector.join(timeout=2)
+            if self._collector.is_alive():
+                return
+        for worker in workers:
+            if worker.responses is not None:
+                worker.responses.close()
+                worker.responses = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "processes": len(self._workers),
+                "threads_per_process": self.threads_per_process,
+                "workers": [
+                    {
+                        "index": worker.index,
+                        "pid": worker.process.pid if worker.process is not None else None,
+                        "cores": worker.cores,
+                        "ready": worker.ready.is_set(),
+                        "in_flight": len(worker.pending),
+                        "served": worker.served,
+                        "restarts": worker.restarts,
+                    }
+                    for worker in self._workers
+                ],
+            }
+
+    def _spawn(self, worker: _Worker) -> None:
+        # Each worker gets fresh channels: a process that dies mid-write can only
+        # break its own pipe, never the channel the other workers answer on.
+        requests = self._context.Queue()
+        reader, writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                self.factory,
+                self.model_path,
+                self.device,
+                worker.cores,
+                self.threads_per_process,
+                self.mmap_weights,
+                self.warmup,
+                requests,
+                writer,
+            ),
+            name=f"unitshub-worker-{worker.index}",
+            daemon=True,
+        )
+        with self._lock:
+            self._requests[worker.index] = requests
+            previous, worker.responses = worker.responses, reader
+            worker.ready.clear()
+            worker.error = None
+            worker.process = process
+        process.start()
+        # Once only the child holds the write end, its exit shows up as EOF on the reader.
+        writer.close()
+        if previous is not None:
+            previous.close()
+
+    def _collect(self) -> None:
+        try:
+            self._collect_responses()
+        except Exception as exc:
+            logger.exception("Inference worker collector failed: %s", exc)
+        finally:
+            # Nothing answers pending or new calls once the collector is gone, so fail them now.
+            with self._lock:
+                self._stopping = True
+            for worker in self._workers:
+                self._fail_pending(worker, WorkerCrashedError("Inference workers stopped answering."))
+
+    def _collect_responses(self) -> None:
+        next_check = time.monotonic() + LIVENESS_INTERVAL_SECONDS
+        while True:
+            # Liveness runs on a clock rather than only when the pipes go quiet:
+            # under steady traffic a dead worker would otherwise hold its requests forever.
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + LIVENESS_INTERVAL_SECONDS
+            with self._lock:
+                channels = {worker.responses: worker for worker in self._workers if worker.responses is not None}
+            if channels:
+                readable = wait(list(channels), timeout=LIVENESS_INTERVAL_SECONDS)
+            else:
+                readable = []
+                time.sleep(LIVENESS_INTERVAL_SECONDS)
+            if not readable and self._stopping:
+                return
+            for connection in readable:
+                worker = channels[connection]
+                try:
+                    request_id, ok, result = connection.recv()
+                except (EOFError, OSError):
+                    # The worker exited; the liveness check fails what it held and restarts it.
+                    with self._lock:
+                        if worker.responses is connection:
+                            worker.responses = None
+                    connection.close()
+                    continue
+                self._deliver(worker, request_id, ok, result)
+
+    def _deliver(self, worker: _Worker, request_id: int | None, ok: bool, result: Any) -> None:
+        if request_id is None:
+            if ok:
+                self.descriptor = result
+            else:
+                worker.error = result
+            worker.ready.set()
+            return
+        with self._lock:
+            future, shm = worker.pending.pop(request_id, (None, None))
+            worker.served += 1
+        if shm is not None:
+            _release_shm(shm)
+        if future is None:
+            return
+        try:
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result if isinstance(result, BaseException) else RuntimeError(str(result)))
+        except InvalidStateError:
+            # A caller that timed out has already cancelled its future.
+            pass
+
+    def _check_workers(self) -> None:
+        if self._stopping:
+            return
+        for worker in self._workers:
+            process = worker.process
+            if process is None or process.is_alive() or worker.error:
+                continue
+            if not worker.ready.is_set():
+                worker.error = f"Inference worker {worker.index} exited with code {process.exitcode} during startup."
+                worker.ready.set()
+                continue
+            logger.error(
+                "Inference worker %d (pid %s) exited with code %s; restarting.",
+                worker.index,
+                process.pid,
+                process.exitcode,
+            )
+            with self._lock:
+                # Stop routing to the dead worker before failing what it held.
+                worker.ready.clear()
+                worker.restarts += 1
+            self._fail_pending(worker, WorkerCrashedError(f"Inference worker {worker.index} exited unexpectedly."))
+            self._spawn(worker)
+
+    def _fail_pending(self, worker: _Worker, error: Exception) -> None:
+        with self._lock:
+            pending, worker.pending = worker.pending, {}
+        for future, shm in pending.values():
+            if shm is not None:
+                _release_shm(shm)
+            try:
+                future.set_exception(error)
+            except InvalidStateError:
+                pass
+
+
+def _release_shm(shm: SharedMemory) -> None:
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class ProcessProvider(ModelProvider):
+    # Serves a provider from worker processes; the local instance only answers
+    # metadata questions and is never loaded in the front-end process.
+    def __init__(
+        self,
+        factory: Callable[[], ModelProvider],
+        processes: int,
+        threads_per_process: int = 0,
+        mmap_weights: bool = True,
+        warmup: Tuple[List[Tuple[int, int]], int] = ([], 16),
+        invoke_timeout: float = 300.0,
+    ) -> None:
+        super().__init__()
+        self.factory = factory
+        self.local = factory()
+        self.processes = processes
+        self.threads_per_process = threads_per_process
+        self.mmap_weights = mmap_weights
+        self.warmup = warmup
+        # Bounds how long an executor thread can wait on a worker that never answers.
+        self.invoke_timeout = invoke_timeout
+        self.workers: ProcessWorkerPool | None = None
+
+    def load(self, model_path: str, device: str) -> None:
+        workers = ProcessWorkerPool(
+            self.factory,
+            model_path,
+            device,
+            self.processes,
+            threads_per_process=self.threads_per_process,
+            mmap_weights=self.mmap_weights,
+            warmup=self.warmup,
+        )
+        workers.start()
+        self.workers = workers
+        self.device = device
+        self.loaded = True
+
+    def unload(self) -> None:
+        super().unload()
+        workers, self.workers = self.workers, None
+        if workers is not None:
+            workers.stop()
+
+    def descriptor(self) -> ModelDescriptor:
+        if self.workers is not None and self.workers.descriptor is not None:
+            return ModelDescriptor.model_validate(self.workers.descriptor)
+        return self.local.descriptor()
+
+    def task_schemas(self) -> Dict[str, Dict[str, Any]]:
+        return self.local.task_schemas()
+
+    def invoke(self, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.workers is None:
+            raise RuntimeError("Inference workers are not running.")
+        future = self.workers.submit(task, payload)
+        try:
+            return future.result(timeout=self.invoke_timeout if self.invoke_timeout > 0 else None)
+        except TimeoutError as exc:
+            future.cancel()
+            raise TimeoutError(f"Inference worker did not answer within {self.invoke_timeout:g}s.") from exc
+
+    def default_legacy_task(self) -> str | None:
+        return self.local.default_legacy_task()
+
+    def cacheable_task(self, task: str) -> bool:
+        return self.local.cacheable_task(task)
+
+    def batch_request(self, task: str, payload: Dict[str, Any]) -> Tuple[Hashable, Dict[str, Any]] | None:
+        return self.local.batch_request(task, payload)
+
+    def legacy_request(
+        self,
+        history: List[List[float]],
+        horizon: int,
+        parameters: Dict[str, Any],
+    ) -> Tuple[str, Dict[str, Any]]:
+        return self.local.legacy_request(history, horizon, parameters)
+
+    def warmup_requests(self, shapes: List[Tuple[int, int]], horizon: int) -> List[Tuple[str, Dict[str, Any]]]:
+        # Each worker warms itself up before reporting ready.
+        return []
+
+    def map_weights(self, model_path: str) -> int:
+        return 0
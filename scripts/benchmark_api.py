@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.config import Settings  # noqa: E402
+from app.providers.base import ModelProvider  # noqa: E402
+from app.providers.shared import forecast_result, series_batch_key  # noqa: E402
+from app.schemas import ModelDescriptor, TaskDefinition  # noqa: E402
+from app.weights import process_memory  # noqa: E402
+
+TASKS = ("forecast_point", "forecast_quantile", "forecast_ohlcv", "generate_paths")
+# Regressions beyond this fraction are flagged by --compare.
+DEFAULT_TOLERANCE = 0.1
+
+
+class StubProvider(ModelProvider):
+    # A model-free provider that supports every task with cheap NumPy math, so
+    # the HTTP, batching, and serialization paths can be measured offline.
+    def __init__(self, tasks: List[str]) -> None:
+        super().__init__()
+        self.tasks = tasks
+
+    def load(self, model_path: str, device: str) -> None:
+        self.device = device
+        self.loaded = True
+
+    def descriptor(self) -> ModelDescriptor:
+        return ModelDescriptor(
+            id="stub",
+            name="Benchmark stub",
+            version="0",
+            description="Model-free provider used by the benchmark harness.",
+            input_modes=["univariate", "ohlcv"],
+            output_modes=["point_forecast", "quantile_forecast", "ohlcv_forecast"],
+            tasks=[
+                TaskDefinition(
+                    name=task,
+                    title=task,
+                    description="Stub task",
+                    input_schema={"type": "object"},
+                    output_schema={"type": "object"},
+                )
+                for task in self.tasks
+            ],
+            metadata={"runtime": "stub"},
+        )
+
+    def task_schemas(self) -> Dict[str, Dict[str, Any]]:
+        return {task: {"input": {"type": "object"}, "output": {"type": "object"}} for task in self.tasks}
+
+    def cacheable_task(self, task: str) -> bool:
+        return task != "generate_paths"
+
+    def batch_request(self, task: str, payload: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]] | None:
+        if "series" not in payload or task == "generate_paths":
+            return None
+        return series_batch_key(task, payload), payload
+
+    def invoke(self, task: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        horizon = int(payload["horizon"])
+        series = payload["series"]
+        if task in {"forecast_ohlcv", "generate_paths"}:
+            samples = int(payload.get("num_samples") or 1)
+            forecasts = []
+            for item in series:
+                closes = np.array([candle["close"] for candle in item["candles"]], dtype=np.float64)
+                paths = [_stub_candles(closes, horizon, seed) for seed in range(samples)]
+                key = "paths" if task == "generate_paths" else "candles"
+                forecasts.append({"symbol": item.get("symbol"), key: paths if key == "paths" else paths[0]})
+            return {"forecasts": forecasts}
+
+        histories = np.array([item["target"] for item in series], dtype=np.float32)
+        drift = (histories[:, -1] - histories[:, 0]) / max(1, histories.shape[1] - 1)
+        steps = np.arange(1, horizon + 1, dtype=np.float32)
+        mean = histories[:, -1:] + drift[:, None] * steps
+        if task == "forecast_point":
+            return {"forecasts": [forecast_result(row) for row in mean.tolist()]}
+        spread = histories.std(axis=1, keepdims=True) * np.sqrt(steps)
+        quantiles = payload.get("quantiles") or [0.1, 0.5, 0.9]
+        columns = {str(q): (mean + (float(q) - 0.5) * 2.56 * spread).tolist() for q in quantiles}
+        return {
+            "forecasts": [
+                forecast_result(row, {key: column[idx] for key, column in columns.items()})
+                for idx, row in enumerate(mean.tolist())
+            ]
+        }
+
+
+def _stub_candles(closes: np.ndarray, horizon: int, seed: int) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    path = closes[-1] * np.exp(np.cumsum(rng.normal(0.0, 0.01, horizon)))
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "timestamp": (start + timedelta(hours=idx)).isoformat(),
+            "open": float(value),
+            "high": float(value * 1.01),
+            "low": float(value * 0.99),
+            "close": float(value),
+            "volume": 1000.0,
+        }
+        for idx, value in enumerate(path)
+    ]
+
+
+def make_payload(task: str, batch_size: int, length: int, horizon: int, num_samples: int) -> Dict[str, Any]:
+    steps = np.arange(length, dtype=np.float64)
+    if task in {"forecast_ohlcv", "generate_paths"}:
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        series = []
+        for index in range(batch_size):
+            closes = 100.0 + 5.0 * np.sin(steps / 12.0 + index) + 0.01 * steps
+            candles = [
+                {
+                    "timestamp": (start + timedelta(hours=idx)).isoformat(),
+                    "open": float(close - 0.2),
+                    "high": float(close + 0.5),
+                    "low": float(close - 0.5),
+                    "close": float(close),
+                    "volume": 1000.0 + idx,
+                }
+                for idx, close in enumerate(closes)
+            ]
+            series.append({"symbol": f"S{index}", "candles": candles})
+        payload: Dict[str, Any] = {"series": series, "horizon": horizon}
+        if task == "generate_paths":
+            payload["num_samples"] = num_samples
+        return payload
+
+    series = [
+        {"item_id": f"s{index}", "target": (np.sin(steps / 8.0 + index) + 0.01 * steps).round(6).tolist()}
+        for index in range(batch_size)
+    ]
+    payload = {"series": series, "horizon": horizon}
+    if task == "forecast_quantile":
+        payload["quantiles"] = [0.1, 0.5, 0.9]
+    return payload
+
+
+def percentile(latencies: List[float], q: float) -> float | None:
+    return float(np.percentile(latencies, q) * 1000) if latencies else None
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    task: str,
+    concurrency: int,
+    batch_size: int,
+    length: int,
+    horizon: int,
+    requests: int,
+    num_samples: int,
+) -> Dict[str, Any]:
+    body = {"task": task, "input": make_payload(task, batch_size, length, horizon, num_samples)}
+    # One untimed request so first-call costs (compilation, allocator growth) stay out of the numbers.
+    await client.post("/models/current/invoke", json=body, headers=headers)
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.post("/models/current/invoke", json=body, headers=headers)
+                status = str(response.status_code) if response.status_code != 200 else None
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            if status is None:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors[status] = errors.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "task": task,
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "length": length,
+        "horizon": horizon,
+        "requests": requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "series_per_second": len(latencies) * batch_size / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) * 1000 if latencies else None,
+        },
+    }
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        response = await client.get("/health/ready")
+        if response.status_code == 200:
+            return
+        if time.monotonic() > deadline:
+            raise SystemExit(f"Model did not become ready within {timeout:.0f}s: {response.text}")
+        await asyncio.sleep(0.5)
+
+
+def memory_report(health: Dict[str, Any] | None) -> Dict[str, Any]:
+    if health is not None:
+        # Against a URL only the server's own report is meaningful.
+        return health.get("memory") or {}
+    memory = dict(process_memory() or {})
+    scale = 1 if sys.platform == "darwin" else 1024
+    memory["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return memory
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def scenario_key(scenario: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(scenario[key] for key in ("task", "concurrency", "batch_size", "length", "horizon"))
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    # Returns one line per scenario whose throughput or tail latency regressed.
+    previous = {scenario_key(scenario): scenario for scenario in baseline.get("scenarios", [])}
+    regressions = []
+    for scenario in report["scenarios"]:
+        before = previous.get(scenario_key(scenario))
+        if before is None:
+            continue
+        changes = {
+            "series_per_second": before["series_per_second"] / scenario["series_per_second"] - 1
+            if scenario["series_per_second"]
+            else math.inf,
+            "p95_ms": scenario["latency_ms"]["p95"] / before["latency_ms"]["p95"] - 1
+            if before["latency_ms"]["p95"] and scenario["latency_ms"]["p95"] is not None
+            else 0.0,
+        }
+        worse = {name: change for name, change in changes.items() if change > tolerance}
+        if worse:
+            label = "/".join(str(value) for value in scenario_key(scenario))
+            details = ", ".join(f"{name} {change:+.0%}" for name, change in worse.items())
+            regressions.append(f"{label}: {details}")
+    return regressions
+
+
+def select_provider(args: argparse.Namespace, settings: Settings) -> str:
+    has_weights = os.path.isdir(settings.model_path())
+    if args.provider == "real" or (args.provider == "auto" and has_weights):
+        if not has_weights:
+            raise SystemExit(f"No weights at {settings.model_path()}.")
+        return "real"
+    return "stub"
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    headers = {"Authorization": f"Bearer {args.api_key}"}
+    async with AsyncExitStack() as stack:
+        health = None
+        if args.url:
+            client = await stack.enter_async_context(httpx.AsyncClient(base_url=args.url, timeout=args.timeout))
+            mode = "url"
+        else:
+            from app.main import create_app
+
+            # The in-process run never needs jobs to outlive it.
+            settings = replace(Settings.from_env(), api_key=args.api_key, jobs_db_path=":memory:")
+            if args.model_type:
+                settings = replace(settings, model_type=args.model_type)
+            mode = select_provider(args, settings)
+            provider = StubProvider(list(TASKS)) if mode == "stub" else None
+            if provider is not None:
+                provider.load("", "cpu")
+            app = create_app(settings, provider=provider)
+            # ASGITransport does not run the lifespan, which loads the model.
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=args.timeout)
+            )
+        await wait_until_ready(client, args.timeout)
+        model = (await client.get("/models/current", headers=headers)).json()
+        supported = [task["name"] for task in model.get("tasks", [])]
+        tasks = [task for task in (args.tasks or TASKS) if task in supported]
+        if not tasks:
+            raise SystemExit(f"Model [{model.get('id')}] supports none of the requested tasks: {supported}.")
+
+        scenarios = []
+        grid = itertools.product(tasks, args.concurrency, args.batch_sizes, args.lengths, args.horizons)
+        for task, concurrency, batch_size, length, horizon in grid:
+            scenario = await run_scenario(
+                client, headers, task, concurrency, batch_size, length, horizon, args.requests, args.num_samples
+            )
+            print(
+                f"{task:18s} c={concurrency:<3d} b={batch_size:<4d} len={length:<5d} h={horizon:<4d} "
+                f"{scenario['series_per_second']:10.1f} series/s  p50={scenario['latency_ms']['p50'] or 0:8.1f} ms  "
+                f"p99={scenario['latency_ms']['p99'] or 0:8.1f} ms  errors={sum(scenario['errors'].values())}",
+                file=sys.stderr,
+            )
+            if not args.url:
+                scenario["rss_bytes"] = (process_memory() or {}).get("rss_bytes")
+            scenarios.append(scenario)
+
+        if args.url:
+            response = await client.get("/health")
+            health = response.json() if response.status_code == 200 else {}
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": mode,
+            "url": args.url,
+            "model": model.get("id"),
+            "model_metadata": model.get("metadata"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "memory": memory_report(health),
+        "scenarios": scenarios,
+    }
+
+
+def int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Load-test the forecasting API in-process (ASGI) or against a URL and report throughput, "
+            "latency percentiles, and memory as JSON."
+        ),
+    )
+    parser.add_argument("--url", default=None, help="Benchmark a running server instead of an in-process app.")
+    parser.add_argument("--api-key", default=os.getenv("API_KEY", "unitshub-secret"))
+    parser.add_argument(
+        "--provider",
+        choices=["auto", "stub", "real"],
+        default="auto",
+        help="In-process model: real weights when MODELS_DIR/MODEL_TYPE exists (auto), or the offline stub.",
+    )
+    parser.add_argument("--model-type", default=None, help="Overrides MODEL_TYPE for the in-process app.")
+    parser.add_argument("--tasks", type=lambda value: value.split(","), default=None)
+    parser.add_argument("--concurrency", type=int_list, default=[1, 8])
+    parser.add_argument("--batch-sizes", type=int_list, default=[1, 32])
+    parser.add_argument("--lengths", type=int_list, default=[128, 512])
+    parser.add_argument("--horizons", type=int_list, default=[24])
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per scenario.")
+    parser.add_argument("--num-samples", type=int, default=8, help="Paths per generate_paths request.")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here as well as to stdout.")
+    parser.add_argument("--compare", default=None, help="Baseline report; exit 1 when a scenario regresses.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    # Per-request client logs would drown the scenario summaries.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(benchmark(args))
+    encoded = json.dumps(report, indent=2)
+    print(encoded)
+    if args.output:
+        Path(args.output).write_text(encoded + "\n", encoding="utf-8")
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"Regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
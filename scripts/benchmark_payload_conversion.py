@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.providers.shared import flatten_targets  # noqa: E402
+
+
+def per_series_input(targets: list[list[float]]) -> list[torch.Tensor]:
+    return [torch.tensor(target, dtype=torch.float32) for target in targets]
+
+
+def contiguous_input(targets: list[list[float]]) -> list[torch.Tensor]:
+    flat, spans = flatten_targets(targets)
+    buffer = torch.from_numpy(flat)
+    return [buffer[start:end] for start, end in spans]
+
+
+def per_row_output(forecasts: list[torch.Tensor]) -> list[dict[str, Any]]:
+    results = []
+    for forecast in forecasts:
+        values = forecast.detach().float().cpu().numpy()
+        results.append({"mean": values[1].tolist(), "quantiles": {"0.1": values[0].tolist(), "0.9": values[2].tolist()}})
+    return results
+
+
+def per_matrix_output(forecasts: list[torch.Tensor]) -> list[dict[str, Any]]:
+    values = torch.stack(forecasts).float().numpy()
+    low, mean, high = (values[:, idx].tolist() for idx in range(3))
+    return [{"mean": mean[row], "quantiles": {"0.1": low[row], "0.9": high[row]}} for row in range(len(mean))]
+
+
+def measure(fn: Any, repeats: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure per-point overhead of converting request payloads to tensors and results back to lists.",
+    )
+    parser.add_argument("--series", type=int, default=256, help="Series per batch.")
+    parser.add_argument("--length", type=int, default=512, help="History points per series.")
+    parser.add_argument("--horizon", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    targets = [[rng.random() for _ in range(args.length)] for _ in range(args.series)]
+    # Pipelines return one (quantiles, horizon) tensor per series.
+    forecasts = list(torch.rand(args.series, 3, args.horizon, generator=torch.Generator().manual_seed(args.seed)))
+    input_points = args.series * args.length
+    output_points = args.series * 3 * args.horizon
+
+    report: dict[str, Any] = {"series": args.series, "length": args.length, "horizon": args.horizon}
+    for name, points, before, after in (
+        ("input", input_points, lambda: per_series_input(targets), lambda: contiguous_input(targets)),
+        ("output", output_points, lambda: per_row_output(forecasts), lambda: per_matrix_output(forecasts)),
+    ):
+        before_seconds = measure(before, args.repeats)
+        after_seconds = measure(after, args.repeats)
+        report[name] = {
+            "before_ns_per_point": before_seconds / points * 1e9,
+            "after_ns_per_point": after_seconds / points * 1e9,
+            "speedup": before_seconds / after_seconds,
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
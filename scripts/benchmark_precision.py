@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.precision import PRECISIONS  # noqa: E402
+from app.providers.base import ModelProvider  # noqa: E402
+from app.providers.chronos import ChronosProvider  # noqa: E402
+from app.providers.timesfm import TimesFMProvider  # noqa: E402
+
+
+def build_provider(model: str, model_path: str | None, precision: str, seed: int) -> ModelProvider:
+    if model == "chronos":
+        if not model_path:
+            raise SystemExit("--model-path is required for chronos.")
+        provider = ChronosProvider(precision=precision)
+        provider.load(model_path, "cpu")
+        return provider
+
+    provider = TimesFMProvider(precision=precision)
+    if model_path:
+        provider.load(model_path, "cpu")
+        return provider
+
+    # Offline fallback: the same small random TimesFM for every mode, saved
+    # once so each precision starts from identical weights.
+    from transformers import TimesFmConfig, TimesFmModelForPrediction
+
+    checkpoint = Path(f"/tmp/unitshub-timesfm-random-{seed}")
+    if not checkpoint.exists():
+        torch.manual_seed(seed)
+        config = TimesFmConfig(
+            num_hidden_layers=4,
+            hidden_size=256,
+            intermediate_size=256,
+            head_dim=32,
+            num_attention_heads=8,
+        )
+        TimesFmModelForPrediction(config).save_pretrained(checkpoint)
+    provider.load(str(checkpoint), "cpu")
+    return provider
+
+
+def load_reference(path: str | None, column: str, count: int, length: int, seed: int) -> list[list[float]]:
+    if path:
+        import polars as pl
+
+        values = pl.read_csv(path)[column].drop_nulls().cast(pl.Float64).to_list()
+        windows = max(1, len(values) - length + 1)
+        step = max(1, windows // count)
+        return [values[start : start + length] for start in range(0, windows, step)][:count]
+
+    rng = random.Random(seed)
+    series = []
+    for _ in range(count):
+        phase = rng.random() * 6.28
+        trend = rng.uniform(-0.01, 0.01)
+        series.append(
+            [math.sin(phase + idx / 8.0) + trend * idx + rng.gauss(0.0, 0.05) for idx in range(length)]
+        )
+    return series
+
+
+def forecast(
+    provider: ModelProvider,
+    histories: list[list[float]],
+    horizon: int,
+    repeats: int,
+) -> tuple[np.ndarray, float]:
+    task = provider.default_legacy_task() or "forecast_point"
+    payload = {"series": [{"target": values} for values in histories], "horizon": horizon, "frequency": "auto"}
+    output = provider.invoke(task, payload)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        provider.invoke(task, payload)
+    elapsed = (time.perf_counter() - started) / repeats
+    return np.asarray([item["mean"] for item in output["forecasts"]], dtype=np.float64), elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare fp32, bf16 and int8 CPU precision modes for accuracy and throughput.",
+    )
+    parser.add_argument("--model", choices=["timesfm", "chronos"], default="timesfm")
+    parser.add_argument("--model-path", default=None, help="Local checkpoint. TimesFM uses a small random model when omitted.")
+    parser.add_argument("--dataset", default=None, help="CSV file used as the reference dataset. Synthetic series when omitted.")
+    parser.add_argument("--target-column", default="value")
+    parser.add_argument("--series", type=int, default=32)
+    parser.add_argument("--length", type=int, default=256)
+    parser.add_argument("--horizon", type=int, default=24)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--modes", default=",".join(PRECISIONS))
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.02,
+        help="Maximum mean absolute error vs fp32, relative to the mean absolute fp32 forecast.",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    histories = load_reference(args.dataset, args.target_column, args.series, args.length, args.seed)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    if "fp32" not in modes:
+        modes.insert(0, "fp32")
+
+    results: dict[str, dict[str, Any]] = {}
+    baseline: np.ndarray | None = None
+    for mode in modes:
+        provider = build_provider(args.model, args.model_path, mode, args.seed)
+        means, elapsed = forecast(provider, histories, args.horizon, args.repeats)
+        if baseline is None:
+            baseline = means
+        scale = float(np.mean(np.abs(baseline))) or 1.0
+        relative_mae = float(np.mean(np.abs(means - baseline))) / scale
+        results[mode] = {
+            "effective_precision": provider.precision,
+            "seconds": elapsed,
+            "series_per_second": len(histories) / elapsed,
+            "relative_mae_vs_fp32": relative_mae,
+            "max_abs_error_vs_fp32": float(np.max(np.abs(means - baseline))),
+            "within_tolerance": relative_mae <= args.tolerance,
+        }
+        provider.unload()
+
+    eligible = [mode for mode, result in results.items() if result["within_tolerance"]]
+    report = {
+        "model": args.model,
+        "series": len(histories),
+        "length": args.length,
+        "horizon": args.horizon,
+        "tolerance": args.tolerance,
+        "bf16_native": torch.ops.mkldnn._is_mkldnn_bf16_supported(),
+        "modes": results,
+        "recommended": max(eligible, key=lambda mode: results[mode]["series_per_second"]),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.providers.timesfm import TimesFMProvider  # noqa: E402
+
+
+def build_provider(model_path: str | None, device: str) -> TimesFMProvider:
+    provider = TimesFMProvider()
+    if model_path:
+        provider.load(model_path, device)
+        return provider
+
+    # Offline fallback: a small randomly initialised TimesFM keeps the shapes
+    # and padding behaviour of the real model without downloading weights.
+    from transformers import TimesFmConfig, TimesFmModelForPrediction
+
+    config = TimesFmConfig(
+        num_hidden_layers=4,
+        hidden_size=256,
+        intermediate_size=256,
+        head_dim=32,
+        num_attention_heads=8,
+    )
+    provider.model = TimesFmModelForPrediction(config).to(torch.device(device)).eval()
+    provider.context_len = config.context_length
+    provider.patch_len = config.patch_length
+    provider.device = device
+    provider.loaded = True
+    return provider
+
+
+def make_histories(count: int, min_len: int, max_len: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    histories = []
+    for _ in range(count):
+        length = rng.randint(min_len, max_len)
+        phase = rng.random() * 6.28
+        histories.append([math.sin(phase + idx / 8.0) for idx in range(length)])
+    return histories
+
+
+def run_naive(provider: TimesFMProvider, histories: list[list[float]], horizon: int) -> None:
+    model = provider.model
+    contexts = [
+        torch.tensor(values[-provider.context_len :], dtype=model.dtype, device=model.device)
+        for values in histories
+    ]
+    with torch.no_grad():
+        outputs = model(
+            past_values=contexts,
+            freq=[0] * len(contexts),
+            forecast_context_len=provider.context_len,
+            return_dict=True,
+        )
+        outputs.mean_predictions[:, :horizon].cpu()
+
+
+def run_bucketed(provider: TimesFMProvider, histories: list[list[float]], horizon: int) -> None:
+    provider.invoke(
+        "forecast_point",
+        {"series": [{"target": values} for values in histories], "horizon": horizon, "frequency": "auto"},
+    )
+
+
+def measure(fn: Any, repeats: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare bucketed vs naive full-context padding throughput for TimesFMProvider.",
+    )
+    parser.add_argument("--model-path", default=None, help="Local TimesFM checkpoint. Uses a small random model when omitted.")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--series", type=int, default=64, help="Series per batch.")
+    parser.add_argument("--min-len", type=int, default=16)
+    parser.add_argument("--max-len", type=int, default=512)
+    parser.add_argument("--horizon", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    provider = build_provider(args.model_path, args.device)
+    histories = make_histories(args.series, args.min_len, args.max_len, args.seed)
+    contexts = [torch.tensor(values[-provider.context_len :]) for values in histories]
+
+    naive = measure(lambda: run_naive(provider, histories, args.horizon), args.repeats)
+    bucketed = measure(lambda: run_bucketed(provider, histories, args.horizon), args.repeats)
+    report = {
+        "series": args.series,
+        "length_range": [args.min_len, args.max_len],
+        "buckets": {str(k): len(v) for k, v in sorted(provider._length_buckets(contexts).items())},
+        "naive_seconds": naive,
+        "bucketed_seconds": bucketed,
+        "naive_series_per_second": args.series / naive,
+        "bucketed_series_per_second": args.series / bucketed,
+        "speedup": naive / bucketed,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.bulk import BulkJob, run_bulk  # noqa: E402
+from app.config import Settings  # noqa: E402
+from app.pool import default_device  # noqa: E402
+from app.providers import create_provider  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Forecast every series in a Parquet/CSV dataset without the HTTP server. Output is one Parquet "
+            "part per input unit; rerunning with the same arguments resumes an interrupted run."
+        ),
+    )
+    parser.add_argument("input", help="A Parquet/CSV file, a directory of partitions, or a glob.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--target-column", required=True)
+    parser.add_argument("--series-id-column", required=True)
+    parser.add_argument("--timestamp-column", default=None, help="Orders each series' rows before forecasting.")
+    parser.add_argument("--horizon", type=int, required=True)
+    parser.add_argument("--model-type", default=None, help="Defaults to MODEL_TYPE.")
+    parser.add_argument("--model-path", default=None, help="Defaults to MODELS_DIR/<model-type>.")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--task", default=None, help="Defaults to the model's point forecast task.")
+    parser.add_argument(
+        "--parameters",
+        type=json.loads,
+        default={},
+        help='Extra task parameters as JSON, e.g. \'{"frequency": "h"}\' or \'{"quantiles": [0.1, 0.9]}\'.',
+    )
+    parser.add_argument("--batch-size", type=int, default=256, help="Series per model call.")
+    parser.add_argument(
+        "--hash-buckets",
+        type=int,
+        default=1,
+        help="Split each input file into this many units by series id; bounds memory and checkpoint size.",
+    )
+    parser.add_argument("--processes", type=int, default=1, help="Shard units across pinned worker processes.")
+    parser.add_argument("--threads-per-process", type=int, default=0)
+    parser.add_argument("--restart", action="store_true", help="Discard parts from a run with other arguments.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    settings = Settings.from_env()
+    if args.model_type:
+        settings = replace(settings, model_type=args.model_type.lower())
+    model_path = args.model_path or settings.model_path()
+    job = BulkJob(
+        input_path=args.input,
+        output_dir=args.output_dir,
+        target_column=args.target_column,
+        series_id_column=args.series_id_column,
+        horizon=args.horizon,
+        timestamp_column=args.timestamp_column,
+        task=args.task,
+        parameters=args.parameters,
+        batch_size=args.batch_size,
+        hash_buckets=args.hash_buckets,
+    )
+    summary = run_bulk(
+        job,
+        partial(create_provider, settings),
+        model_path,
+        device=args.device or default_device(),
+        model={"type": settings.model_type, "path": model_path, "runtime": settings.model_runtime},
+        processes=args.processes,
+        threads_per_process=args.threads_per_process,
+        mmap_weights=settings.mmap_weights,
+        restart=args.restart,
+    )
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
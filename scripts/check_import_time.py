@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+# Model runtimes are imported when a model loads, never while the server starts.
+HEAVY_MODULES = ("torch", "transformers", "chronos", "polars", "onnxruntime", "accelerate")
+
+
+def measure(module: str) -> list[tuple[str, int, int, int]]:
+    # Returns (module, self_us, cumulative_us, depth) for every import.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            imports.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return imports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of the server startup path.")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000")))
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest top-level imports to list.")
+    args = parser.parse_args()
+
+    imports = measure(args.module)
+    total_ms = next(cumulative for name, _, cumulative, _ in imports if name == args.module) / 1000
+    heavy = sorted({name for name, *_ in imports if name.split(".")[0] in HEAVY_MODULES})
+
+    print(f"{args.module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    packages = [(name, cumulative) for name, _, cumulative, depth in imports if depth == 1]
+    for name, cumulative in sorted(packages, key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    if heavy:
+        print(f"Heavy runtime modules on the startup path: {', '.join(heavy)}")
+    return 1 if heavy or total_ms > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
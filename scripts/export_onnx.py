@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.onnx_export import export_model  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Export a TimesFM or Chronos-2 checkpoint to ONNX for MODEL_RUNTIME=onnx.",
+    )
+    parser.add_argument("--model", choices=["timesfm", "chronos"], default=os.getenv("MODEL_TYPE", "timesfm"))
+    parser.add_argument("--model-path", default=None, help="Checkpoint directory. Defaults to MODELS_DIR/<model>.")
+    parser.add_argument("--output-dir", default=None, help="Export directory. Defaults to <model-path>/onnx.")
+    parser.add_argument("--opset", type=int, default=18)
+    parser.add_argument("--quantize", action="store_true", help="Apply onnxruntime dynamic int8 quantization.")
+    args = parser.parse_args()
+
+    model_path = args.model_path or os.path.join(os.getenv("MODELS_DIR", "/app/models"), args.model)
+    output_dir = export_model(args.model, model_path, args.output_dir, opset=args.opset, quantize=args.quantize)
+    print(f"Exported {args.model} to {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import io
 from contextlib import contextmanager
-from json import dumps
+from json import dumps, loads
 
+import polars as pl
 from fastapi.testclient import TestClient
 
 from app.config import Settings
@@ -17,11 +19,13 @@ class FakeProvider(ModelProvider):
         self.loaded = True
         self.model_id = model_id
         self._tasks = tasks
+        self.descriptor_calls = 0
 
     def load(self, model_path: str, device: str) -> None:
         self.loaded = True
 
     def descriptor(self) -> ModelDescriptor:
+        self.descriptor_calls += 1
         return ModelDescriptor(
             id=self.model_id,
             name=f"{self.model_id.title()} Model",
@@ -45,7 +49,8 @@ class FakeProvider(ModelProvider):
     def invoke(self, task: str, payload: dict):
         if self.model_id == "timesfm" and task == "forecast_point":
             horizon = int(payload["horizon"])
-            return {"forecasts": [{"mean": list(range(horizon)), "quantiles": {}}]}
+            count = len(payload["series"]) if "series" in payload else 1
+            return {"forecasts": [{"mean": list(range(horizon)), "quantiles": {}} for _ in range(count)]}
         if self.model_id == "chronos" and task == "forecast_quantile":
             horizon = int(payload["horizon"])
             mean = list(range(horizon))
@@ -114,7 +119,7 @@ def make_tasks(*names: str) -> list[TaskDefinition]:
 @contextmanager
 def create_test_client(model_id: str, tasks: list[str]):
     app = create_app(
-        settings=Settings(model_type=model_id, api_key="test-key"),
+        settings=Settings(model_type=model_id, api_key="test-key", jobs_db_path=":memory:"),
         provider=FakeProvider(model_id=model_id, tasks=make_tasks(*tasks)),
     )
     with TestClient(app) as client:
@@ -137,6 +142,20 @@ def test_current_model_descriptor():
         assert [task["name"] for task in body["tasks"]] == ["forecast_point"]
 
 
+def test_model_metadata_is_built_once():
+    provider = FakeProvider(model_id="timesfm", tasks=make_tasks("forecast_point"))
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:")
+    app = create_app(settings=settings, provider=provider)
+    with TestClient(app) as client:
+        for path in ["/models/current", "/models/current/schema", "/models/current/tasks/forecast_point/schema"]:
+            assert client.get(path, headers=AUTH).status_code == 200
+        schema = client.get("/models/current/schema", headers=AUTH).json()
+        assert schema["model"]["id"] == "timesfm"
+        assert schema["schemas"]["forecast_point"]["input"] == {"type": "object"}
+        assert client.get("/models/current/tasks/unknown/schema", headers=AUTH).status_code == 404
+    assert provider.descriptor_calls == 1
+
+
 def test_invoke_model_v2():
     with create_test_client("timesfm", ["forecast_point"]) as client:
         response = client.post(
@@ -177,6 +196,78 @@ def test_invoke_model_v2_accepts_json_without_content_type():
         assert response.json()["output"]["forecasts"][0]["mean"] == [0, 1]
 
 
+def test_invoke_stream_returns_ndjson_per_series():
+    with create_test_client("timesfm", ["forecast_point"]) as client:
+        lines = [
+            dumps({"item_id": "a", "target": [1.0, 2.0]}),
+            "not json",
+            dumps({"item_id": "b", "target": [3.0, 4.0]}),
+        ]
+        response = client.post(
+            "/models/current/invoke/stream",
+            params={"task": "forecast_point", "horizon": "2", "chunk_size": "1"},
+            headers=AUTH,
+            content="\n".join(lines),
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [loads(line) for line in response.text.splitlines()]
+        assert [record["index"] for record in records] == [0, 1, 2]
+        assert records[0]["item_id"] == "a"
+        assert records[0]["mean"] == [0, 1]
+        assert "error" in records[1]
+        assert records[2]["item_id"] == "b"
+
+
+def test_invoke_stream_forecasts_chunks_while_the_upload_is_still_arriving():
+    provider = FakeProvider(model_id="timesfm", tasks=make_tasks("forecast_point"))
+    calls: list[int] = []
+    invoke = provider.invoke
+    provider.invoke = lambda task, payload: calls.append(len(payload["series"])) or invoke(task, payload)
+    body = "".join(dumps({"item_id": str(index), "target": [1.0, 2.0]}) + "\n" for index in range(4)).encode()
+    # Pieces end mid-line, so records have to be reassembled across reads.
+    pieces = [body[start : start + 7] for start in range(0, len(body), 7)]
+    seen: list[int] = []
+    sent: list[dict] = []
+
+    async def receive():
+        seen.append(len(calls))
+        if len(seen) > len(pieces):
+            return {"type": "http.disconnect"}
+        return {"type": "http.request", "body": pieces[len(seen) - 1], "more_body": len(seen) < len(pieces)}
+
+    async def send(message):
+        sent.append(message)
+
+    # TestClient reads the whole body up front, so the app is driven directly, with
+    # the ASGI version uvicorn reports for HTTP connections.
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/models/current/invoke/stream",
+        "raw_path": b"/models/current/invoke/stream",
+        "root_path": "",
+        "query_string": b"task=forecast_point&horizon=2&chunk_size=2",
+        "headers": [(b"host", b"testserver"), (b"authorization", AUTH["Authorization"].encode())],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:")
+    app = create_app(settings=settings, provider=provider)
+    with TestClient(app) as client:
+        client.portal.call(app, scope, receive, send)
+
+    text = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    records = [loads(line) for line in text.splitlines()]
+    assert [record["item_id"] for record in records] == ["0", "1", "2", "3"]
+    assert calls == [2, 2]
+    # The first chunk is forecast before the rest of the body has been read.
+    assert seen[-1] == 1
+
+
 def test_timesfm_model_route():
     with create_test_client("timesfm", ["forecast_point"]) as client:
         response = client.post(
@@ -298,6 +389,66 @@ def test_legacy_predict_compatibility():
         assert body["forecasts"][0]["mean"] == [0, 1]
 
 
+def test_predict_csv_single_column():
+    with create_test_client("timesfm", ["forecast_point"]) as client:
+        response = client.post(
+            "/predict/csv",
+            headers=AUTH,
+            files={"file": ("data.csv", b"ts,value\n1,1.0\n2,\n3,3.0\n", "text/csv")},
+            data={"target_column": "value", "horizon": "2"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["forecasts"]) == 1
+        assert body["metadata"]["source_column"] == "value"
+
+
+def test_predict_csv_splits_long_format_by_series_id():
+    with create_test_client("timesfm", ["forecast_point"]) as client:
+        response = client.post(
+            "/predict/csv",
+            headers=AUTH,
+            files={"file": ("data.csv", b"sku,value\nb,1.0\na,2.0\nb,3.0\nc,4.0\n", "text/csv")},
+            data={"target_column": "value", "horizon": "2", "series_id": "sku"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["metadata"]["series_ids"] == ["b", "a", "c"]
+        assert len(body["forecasts"]) == 3
+
+
+def test_predict_csv_accepts_parquet():
+    buffer = io.BytesIO()
+    pl.DataFrame({"sku": ["a", "a", "b"], "value": [1.0, 2.0, 3.0]}).write_parquet(buffer)
+    with create_test_client("timesfm", ["forecast_point"]) as client:
+        response = client.post(
+            "/predict/csv",
+            headers=AUTH,
+            files={"file": ("data.parquet", buffer.getvalue(), "application/octet-stream")},
+            data={"target_column": "value", "horizon": "2", "series_id": "sku"},
+        )
+        assert response.status_code == 200
+        assert response.json()["metadata"]["series_ids"] == ["a", "b"]
+
+
+def test_predict_csv_rejects_missing_column_and_empty_file():
+    with create_test_client("timesfm", ["forecast_point"]) as client:
+        missing = client.post(
+            "/predict/csv",
+            headers=AUTH,
+            files={"file": ("data.csv", b"value\n1.0\n", "text/csv")},
+            data={"target_column": "other", "horizon": "2"},
+        )
+        empty = client.post(
+            "/predict/csv",
+            headers=AUTH,
+            files={"file": ("data.csv", b"", "text/csv")},
+            data={"target_column": "value", "horizon": "2"},
+        )
+        assert missing.status_code == 400
+        assert empty.status_code == 400
+
+
 def test_mcp_tools_call():
     with create_test_client("timesfm", ["forecast_point"]) as client:
         response = client.post(
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import polars as pl
+
+from app.arrow import ARROW_STREAM_MEDIA_TYPE, read_series_table, write_forecast_table
+from tests.test_api_v2 import AUTH, create_test_client
+
+
+def arrow_bytes(frame: pl.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    frame.write_ipc_stream(buffer)
+    return buffer.getvalue()
+
+
+def test_read_series_table_returns_array_views():
+    body = arrow_bytes(pl.DataFrame({"item_id": ["a", "b"], "target": [[1.0, 2.0, 3.0], [4.5, 5.5]]}))
+
+    series = read_series_table(body)
+
+    assert [item["item_id"] for item in series] == ["a", "b"]
+    assert isinstance(series[0]["target"], np.ndarray)
+    assert series[0]["target"].tolist() == [1.0, 2.0, 3.0]
+    assert series[1]["target"].tolist() == [4.5, 5.5]
+
+
+def test_write_forecast_table_emits_matrix_columns():
+    body = write_forecast_table(
+        [
+            {"mean": [1.0, 2.0], "quantiles": {"0.1": [0.5, 1.5]}},
+            {"mean": [3.0, 4.0], "quantiles": {"0.1": [2.5, 3.5]}},
+        ],
+        [{"target": [1.0], "item_id": "a"}, {"target": [2.0], "item_id": "b"}],
+    )
+
+    frame = pl.read_ipc_stream(io.BytesIO(body))
+    assert frame.columns == ["item_id", "mean", "q0.1"]
+    assert frame["mean"].to_numpy().tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+
+def test_invoke_accepts_and_returns_arrow_streams():
+    with create_test_client("chronos", ["forecast_quantile"]) as client:
+        response = client.post(
+            "/models/current/invoke",
+            params={"task": "forecast_quantile", "horizon": "2", "quantiles": "[0.1, 0.5, 0.9]"},
+            headers={
+                **AUTH,
+                "Content-Type": ARROW_STREAM_MEDIA_TYPE,
+                "Accept": ARROW_STREAM_MEDIA_TYPE,
+            },
+            content=arrow_bytes(pl.DataFrame({"item_id": ["sku-1"], "target": [[1.0, 2.0, 3.0]]})),
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == ARROW_STREAM_MEDIA_TYPE
+        frame = pl.read_ipc_stream(io.BytesIO(response.content))
+        assert frame["item_id"].to_list() == ["sku-1"]
+        assert frame["mean"].to_numpy().tolist() == [[0.0, 1.0]]
+        assert frame["q0.9"].to_numpy().tolist() == [[1.0, 2.0]]
+
+
+def test_invoke_arrow_requires_task():
+    with create_test_client("chronos", ["forecast_quantile"]) as client:
+        response = client.post(
+            "/models/current/invoke",
+            headers={**AUTH, "Content-Type": ARROW_STREAM_MEDIA_TYPE},
+            content=arrow_bytes(pl.DataFrame({"target": [[1.0, 2.0]]})),
+        )
+        assert response.status_code == 400
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.batching import MicroBatcher
+from app.providers.base import ModelProvider
+from app.providers.shared import series_batch_key
+from app.schemas import ModelDescriptor
+
+
+class BatchRecordingProvider(ModelProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.loaded = True
+        self.calls: list[dict] = []
+
+    def load(self, model_path: str, device: str) -> None:
+        self.loaded = True
+
+    def descriptor(self) -> ModelDescriptor:
+        return ModelDescriptor(id="batch", name="Batch", version="test", description="Batching test provider.")
+
+    def task_schemas(self):
+        return {"forecast_point": {"input": {"type": "object"}, "output": {"type": "object"}}}
+
+    def batch_request(self, task: str, payload: dict):
+        if "series" not in payload:
+            return None
+        return series_batch_key(task, payload), payload
+
+    def invoke(self, task: str, payload: dict):
+        self.calls.append(payload)
+        horizon = int(payload["horizon"])
+        return {
+            "forecasts": [
+                {"mean": [item["target"][-1]] * horizon, "quantiles": {}}
+                for item in payload["series"]
+            ]
+        }
+
+
+def series_payload(value: float, horizon: int = 2) -> dict:
+    return {"series": [{"target": [value, value]}], "horizon": horizon}
+
+
+def test_batcher_coalesces_compatible_requests():
+    provider = BatchRecordingProvider()
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(provider, "forecast_point", series_payload(float(idx))) for idx in range(3))
+        )
+
+    outputs = asyncio.run(run())
+    assert len(provider.calls) == 1
+    assert len(provider.calls[0]["series"]) == 3
+    assert [output["forecasts"][0]["mean"] for output in outputs] == [[0.0, 0.0], [1.0, 1.0], [2.0, 2.0]]
+    assert batcher.stats()["batch_size"]["count"] == 1
+
+
+def test_batcher_separates_incompatible_parameters():
+    provider = BatchRecordingProvider()
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit(provider, "forecast_point", series_payload(1.0, horizon=2)),
+            batcher.submit(provider, "forecast_point", series_payload(2.0, horizon=3)),
+        )
+
+    outputs = asyncio.run(run())
+    assert len(provider.calls) == 2
+    assert len(outputs[1]["forecasts"][0]["mean"]) == 3
+
+
+def test_batcher_flushes_when_batch_is_full():
+    provider = BatchRecordingProvider()
+    batcher = MicroBatcher(max_batch_size=2, max_wait_ms=10_000)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(provider, "forecast_point", series_payload(float(idx))) for idx in range(4))
+        )
+
+    asyncio.run(run())
+    assert [len(call["series"]) for call in provider.calls] == [2, 2]
+
+
+class ValidatingProvider(BatchRecordingProvider):
+    def invoke(self, task: str, payload: dict):
+        for item in payload["series"]:
+            if not all(isinstance(value, float) for value in item["target"]):
+                self.calls.append(payload)
+                raise ValueError("Series values must be numbers.")
+        return super().invoke(task, payload)
+
+
+def test_batcher_fails_only_the_malformed_request_in_a_merged_batch():
+    provider = ValidatingProvider()
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=20)
+    bad = {"series": [{"target": ["x"]}], "horizon": 2}
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit(provider, "forecast_point", series_payload(1.0)),
+            batcher.submit(provider, "forecast_point", bad),
+            return_exceptions=True,
+        )
+
+    good, failed = asyncio.run(run())
+    assert good["forecasts"][0]["mean"] == [1.0, 1.0]
+    assert isinstance(failed, ValueError)
+    assert [len(call["series"]) for call in provider.calls] == [2, 1, 1]
+    assert batcher.stats()["split_batches"] == 1
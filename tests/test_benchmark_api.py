@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_benchmark_harness_runs_every_task_offline_and_compares_reports(tmp_path):
+    report_path = tmp_path / "report.json"
+    command = [
+        sys.executable,
+        "scripts/benchmark_api.py",
+        "--provider",
+        "stub",
+        "--concurrency",
+        "2",
+        "--batch-sizes",
+        "3",
+        "--lengths",
+        "32",
+        "--horizons",
+        "4",
+        "--requests",
+        "4",
+        "--output",
+        str(report_path),
+    ]
+    subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+
+    report = json.loads(report_path.read_text())
+    assert report["meta"]["mode"] == "stub"
+    assert [scenario["task"] for scenario in report["scenarios"]] == [
+        "forecast_point",
+        "forecast_quantile",
+        "forecast_ohlcv",
+        "generate_paths",
+    ]
+    for scenario in report["scenarios"]:
+        assert scenario["errors"] == {}
+        assert scenario["latency_ms"]["p50"] <= scenario["latency_ms"]["p99"]
+
+    # A generous tolerance: the comparison itself is under test, not the machine.
+    result = subprocess.run(
+        [*command[:-2], "--compare", str(report_path), "--tolerance", "100"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
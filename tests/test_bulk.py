@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+
+import polars as pl
+import pytest
+
+from app.bulk import BulkJob, run_bulk
+from tests.test_api_v2 import FakeProvider, make_tasks
+
+
+class LastValueProvider(FakeProvider):
+    def __init__(self) -> None:
+        super().__init__(model_id="bulk", tasks=make_tasks("forecast_point"))
+        self.batches: list[int] = []
+
+    def invoke(self, task: str, payload: dict):
+        self.batches.append(len(payload["series"]))
+        horizon = int(payload["horizon"])
+        return {"forecasts": [{"mean": [float(s["target"][-1])] * horizon} for s in payload["series"]]}
+
+
+def write_partitions(root) -> None:
+    for part in range(2):
+        rows = [(f"s{part}-{index}", step, float(index * 10 + step)) for index in range(5) for step in range(4)]
+        frame = pl.DataFrame(rows, schema=["id", "ts", "value"], orient="row")
+        # Shuffled rows: the timestamp column has to restore each series' order.
+        frame.sample(fraction=1.0, shuffle=True, seed=part).write_parquet(root / f"part{part}.parquet")
+
+
+def make_job(tmp_path, **overrides) -> BulkJob:
+    options = {
+        "input_path": str(tmp_path / "input"),
+        "output_dir": str(tmp_path / "output"),
+        "target_column": "value",
+        "series_id_column": "id",
+        "timestamp_column": "ts",
+        "horizon": 3,
+        "batch_size": 2,
+        "hash_buckets": 2,
+    }
+    return BulkJob(**{**options, **overrides})
+
+
+def test_bulk_run_forecasts_every_series_into_parquet_parts(tmp_path):
+    (tmp_path / "input").mkdir()
+    write_partitions(tmp_path / "input")
+    provider = LastValueProvider()
+
+    summary = run_bulk(make_job(tmp_path), lambda: provider, "unused")
+
+    assert summary["units"] == 4 and summary["forecast_units"] == 4 and summary["series"] == 10
+    assert max(provider.batches) <= 2
+    output = pl.read_parquet(tmp_path / "output" / "*.parquet").sort("id")
+    assert output["id"].to_list() == sorted(f"s{part}-{index}" for part in range(2) for index in range(5))
+    for series_id, mean in zip(output["id"], output["mean"]):
+        index = int(series_id.split("-")[1])
+        assert list(mean) == [float(index * 10 + 3)] * 3
+
+
+def test_bulk_run_resumes_only_missing_units(tmp_path):
+    (tmp_path / "input").mkdir()
+    write_partitions(tmp_path / "input")
+    job = make_job(tmp_path)
+    run_bulk(job, LastValueProvider, "unused")
+    removed = sorted(name for name in os.listdir(job.output_dir) if name.startswith("part-"))[1]
+    os.unlink(os.path.join(job.output_dir, removed))
+
+    summary = run_bulk(job, LastValueProvider, "unused")
+
+    assert (summary["forecast_units"], summary["skipped_units"]) == (1, 3)
+    assert os.path.exists(os.path.join(job.output_dir, removed))
+    assert pl.read_parquet(tmp_path / "output" / "*.parquet").height == 10
+
+
+def test_bulk_run_refuses_an_output_dir_from_another_configuration(tmp_path):
+    (tmp_path / "input").mkdir()
+    write_partitions(tmp_path / "input")
+    run_bulk(make_job(tmp_path), LastValueProvider, "unused")
+
+    with pytest.raises(ValueError, match="different configuration"):
+        run_bulk(make_job(tmp_path, horizon=5), LastValueProvider, "unused")
+
+    summary = run_bulk(make_job(tmp_path, horizon=5), LastValueProvider, "unused", restart=True)
+    assert summary["forecast_units"] == 4
+    assert pl.read_parquet(tmp_path / "output" / "*.parquet").schema["mean"] == pl.Array(pl.Float64, 5)
+
+
+def test_empty_hash_buckets_do_not_break_the_output_dataset(tmp_path):
+    (tmp_path / "input").mkdir()
+    pl.DataFrame({"id": ["a", "a", "b", "b"], "ts": [0, 1, 0, 1], "value": [1.0, 2.0, 3.0, 4.0]}).write_parquet(
+        tmp_path / "input" / "small.parquet"
+    )
+    job = make_job(tmp_path, hash_buckets=8)
+
+    summary = run_bulk(job, LastValueProvider, "unused")
+
+    assert summary["series"] == 2
+    output = pl.read_parquet(tmp_path / "output" / "*.parquet").sort("id")
+    assert output["id"].to_list() == ["a", "b"]
+    assert run_bulk(job, LastValueProvider, "unused")["forecast_units"] == 0
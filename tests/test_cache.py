@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.cache import ResultCache, payload_digest
+from app.config import Settings
+from app.main import create_app
+from tests.test_api_v2 import AUTH, FakeProvider, make_tasks
+
+
+class CountingProvider(FakeProvider):
+    def __init__(self) -> None:
+        super().__init__(model_id="timesfm", tasks=make_tasks("forecast_point"))
+        self.invocations = 0
+
+    def invoke(self, task: str, payload: dict):
+        self.invocations += 1
+        return super().invoke(task, payload)
+
+
+def test_payload_digest_matches_lists_and_arrays():
+    as_list = payload_digest("timesfm:1", "forecast_point", {"series": [{"target": [1.0, 2.0]}], "horizon": 2})
+    as_array = payload_digest(
+        "timesfm:1",
+        "forecast_point",
+        {"horizon": 2, "series": [{"target": np.array([1.0, 2.0])}]},
+    )
+    other = payload_digest("timesfm:1", "forecast_point", {"series": [{"target": [1.0, 2.5]}], "horizon": 2})
+    assert as_list == as_array
+    assert as_list != other
+    # Keys are length-prefixed, so one key cannot absorb the next key's value.
+    assert payload_digest("timesfm:1", "forecast_point", {"p": 1, "q": 2}) != payload_digest(
+        "timesfm:1", "forecast_point", {"p:1q": 2}
+    )
+
+
+def test_result_cache_evicts_least_recently_used_by_size():
+    cache = ResultCache(max_bytes=60, ttl_seconds=60)
+    cache.put("a", {"forecasts": [{"mean": [1.0]}]})
+    cache.put("b", {"forecasts": [{"mean": [2.0]}]})
+    assert cache.get("a") is not None
+    cache.put("c", {"forecasts": [{"mean": [3.0]}]})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_result_cache_expires_entries_and_reads_disk_tier(tmp_path):
+    expired = ResultCache(max_bytes=1024, ttl_seconds=0)
+    expired.put("a", {"forecasts": []})
+    assert expired.get("a") is None
+
+    ResultCache(max_bytes=1024, ttl_seconds=60, disk_dir=str(tmp_path)).put("k", {"forecasts": [{"mean": [1.0]}]})
+    restarted = ResultCache(max_bytes=1024, ttl_seconds=60, disk_dir=str(tmp_path))
+    assert restarted.get("k") == {"forecasts": [{"mean": [1.0]}]}
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_is_pruned_to_its_size_bound(tmp_path):
+    cache = ResultCache(max_bytes=1024, ttl_seconds=60, disk_dir=str(tmp_path), disk_max_bytes=100)
+    for index in range(6):
+        cache.put(f"k{index}", {"forecasts": [{"mean": [float(index)]}]})
+        os.utime(tmp_path / f"k{index}.json", (1e9 + index, time.time() - 10 + index))
+
+    stats = cache.stats()
+    assert stats["disk_bytes"] <= 100 and stats["disk_evictions"] > 0
+    assert not (tmp_path / "k0.json").exists() and (tmp_path / "k5.json").exists()
+
+    # A smaller bound takes effect when the cache is next opened.
+    restarted = ResultCache(max_bytes=1024, ttl_seconds=60, disk_dir=str(tmp_path), disk_max_bytes=40)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["k5.json"]
+    assert restarted.stats()["disk_bytes"] == (tmp_path / "k5.json").stat().st_size
+
+
+def test_invoke_serves_repeated_requests_from_cache():
+    provider = CountingProvider()
+    app = create_app(
+        settings=Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:", result_cache_enabled=True),
+        provider=provider,
+    )
+    body = {"task": "forecast_point", "input": {"series": [{"target": [1.0, 2.0]}], "horizon": 2}}
+    with TestClient(app) as client:
+        first = client.post("/models/current/invoke", headers=AUTH, json=body)
+        second = client.post("/models/current/invoke", headers=AUTH, json=body)
+        bypass = client.post("/models/current/invoke", headers={**AUTH, "Cache-Control": "no-cache"}, json=body)
+        stats = client.get("/stats/cache", headers=AUTH).json()
+
+    assert first.json()["output"] == second.json()["output"] == bypass.json()["output"]
+    assert provider.invocations == 2
+    assert stats["hits"] == 1
+
+
+def test_cache_key_changes_with_the_model_descriptor():
+    class PrecisionProvider(CountingProvider):
+        precision = "fp32"
+
+        def descriptor(self):
+            return super().descriptor().model_copy(update={"metadata": {"precision": self.precision}})
+
+    provider = PrecisionProvider()
+    app = create_app(
+        settings=Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:", result_cache_enabled=True),
+        provider=provider,
+    )
+    body = {"task": "forecast_point", "input": {"series": [{"target": [1.0, 2.0]}], "horizon": 2}}
+    with TestClient(app) as client:
+        client.post("/models/current/invoke", headers=AUTH, json=body)
+        provider.precision = "bf16"
+        provider.invalidate_metadata()
+        client.post("/models/current/invoke", headers=AUTH, json=body)
+        client.post("/models/current/invoke", headers=AUTH, json=body)
+
+    assert provider.invocations == 2
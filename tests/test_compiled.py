@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+import torch
+
+from app.providers.timesfm import TimesFMProvider
+
+transformers = pytest.importorskip("transformers")
+
+
+@pytest.fixture(scope="module")
+def tiny_timesfm(tmp_path_factory):
+    torch.manual_seed(0)
+    config = transformers.TimesFmConfig(
+        num_hidden_layers=1,
+        hidden_size=32,
+        intermediate_size=32,
+        head_dim=8,
+        num_attention_heads=4,
+        context_length=128,
+    )
+    path = tmp_path_factory.mktemp("timesfm")
+    transformers.TimesFmModelForPrediction(config).save_pretrained(path)
+    return str(path)
+
+
+def series(length: int, phase: float) -> list[float]:
+    return [math.sin(phase + index / 5.0) for index in range(length)]
+
+
+def forecast(provider: TimesFMProvider, histories: list[list[float]]) -> torch.Tensor:
+    output = provider.invoke("forecast_point", {"series": [{"target": values} for values in histories], "horizon": 8})
+    return torch.tensor([item["mean"] for item in output["forecasts"]])
+
+
+def test_bucketed_compiled_decoder_matches_eager(tiny_timesfm):
+    eager = TimesFMProvider()
+    eager.load(tiny_timesfm, "cpu")
+    compiled = TimesFMProvider(compile_buckets=[(2, 40), (4, 128)], compile_backend="eager")
+    compiled.load(tiny_timesfm, "cpu")
+    assert compiled.compiled.buckets == [(2, 64), (4, 128)]
+    assert [len(payload["series"]) for _, payload in compiled.warmup_requests([], 8)] == [2, 4]
+
+    short = [series(40, 0.1)]
+    assert torch.allclose(forecast(compiled, short), forecast(eager, short), atol=1e-4)
+    # Five rows are split into a full 4-row bucket plus one padded row.
+    batch = [series(100, phase) for phase in range(5)]
+    assert torch.allclose(forecast(compiled, batch), forecast(eager, batch), atol=1e-4)
+
+    stats = compiled.runtime_stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 0
+    assert stats["padded_rows"] == 1 + 3
+    assert set(stats["compiled_buckets"]) == {"2x64", "4x128"}
+    assert compiled.descriptor().metadata["runtime"] == "transformers+compile"
+
+
+def test_length_is_padded_to_a_larger_bucket(tiny_timesfm):
+    eager = TimesFMProvider()
+    eager.load(tiny_timesfm, "cpu")
+    compiled = TimesFMProvider(compile_buckets=[(1, 128)], compile_backend="eager")
+    compiled.load(tiny_timesfm, "cpu")
+
+    # A 40-step series is left-padded and masked up to the 128-step graph,
+    # which is what the model does for the full context anyway.
+    history = [series(40, 0.3)]
+    full_context = eager.model(
+        past_values=[torch.tensor(history[0])],
+        freq=[0],
+        forecast_context_len=128,
+        return_dict=True,
+    ).mean_predictions[:, :8]
+    assert torch.allclose(forecast(compiled, history), full_context, atol=1e-4)
+    assert compiled.runtime_stats()["padded_steps"] == 128 - 64
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.executor import InferenceExecutor, QueueFullError
+
+
+def test_executor_runs_off_the_event_loop():
+    executor = InferenceExecutor(max_workers=1, max_queue_depth=4)
+
+    async def run():
+        return await executor.run(threading.get_ident)
+
+    try:
+        worker_thread = asyncio.run(run())
+    finally:
+        executor.shutdown()
+    assert worker_thread != threading.get_ident()
+    assert executor.stats()["queue_wait_seconds"]["count"] == 1
+
+
+def test_executor_rejects_requests_beyond_queue_depth():
+    executor = InferenceExecutor(max_workers=1, max_queue_depth=1)
+    release = threading.Event()
+
+    async def run():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(QueueFullError):
+            await executor.run(release.wait, 5)
+        release.set()
+        await asyncio.gather(running, queued)
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown()
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.jobs import JobQueue, JobRecord, SQLiteJobStore
+from app.main import create_app
+from app.pool import ModelSpec
+from tests.test_api_v2 import AUTH, FakeProvider, make_tasks
+from tests.test_pool import sized_factory
+
+
+class GatedProvider(FakeProvider):
+    def __init__(self) -> None:
+        super().__init__(model_id="timesfm", tasks=make_tasks("forecast_point"))
+        self.gate = threading.Event()
+        self.horizons: list[int] = []
+
+    def invoke(self, task: str, payload: dict):
+        self.gate.wait(5)
+        self.horizons.append(int(payload["horizon"]))
+        return super().invoke(task, payload)
+
+
+def job_request(horizon: int, count: int = 1, priority: str = "batch") -> dict:
+    series = [{"target": [1.0, 2.0, 3.0]} for _ in range(count)]
+    return {"task": "forecast_point", "priority": priority, "input": {"series": series, "horizon": horizon}}
+
+
+def wait_for(client: TestClient, job_id: str, status: str = "succeeded") -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}", headers=AUTH).json()
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {status}: {job}")
+
+
+def test_job_runs_large_batches_in_chunks_and_serves_the_result():
+    provider = GatedProvider()
+    provider.gate.set()
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:", jobs_chunk_size=64)
+    app = create_app(settings=settings, provider=provider)
+
+    with TestClient(app) as client:
+        response = client.post("/jobs", headers=AUTH, json=job_request(horizon=3, count=150))
+        assert response.status_code == 202
+        assert response.headers["location"].endswith(f"/jobs/{response.json()['id']}")
+
+        job = wait_for(client, response.json()["id"])
+        result = client.get(f"/jobs/{job['id']}/result", headers=AUTH)
+
+    assert job["progress"] == {"completed": 150, "total": 150}
+    assert provider.horizons == [3, 3, 3]
+    body = result.json()
+    assert body["model"] == "timesfm" and body["metadata"]["job_id"] == job["id"]
+    assert len(body["output"]["forecasts"]) == 150
+    assert body["output"]["forecasts"][0]["mean"] == [0, 1, 2]
+
+
+def test_interactive_jobs_run_before_queued_batch_jobs():
+    provider = GatedProvider()
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:")
+    app = create_app(settings=settings, provider=provider)
+
+    with TestClient(app) as client:
+        running = client.post("/jobs", headers=AUTH, json=job_request(horizon=1)).json()
+        wait_for(client, running["id"], "running")
+        queued = client.post("/jobs", headers=AUTH, json=job_request(horizon=2)).json()
+        interactive = client.post("/jobs", headers=AUTH, json=job_request(horizon=3, priority="interactive")).json()
+
+        pending = client.get(f"/jobs/{queued['id']}/result", headers=AUTH)
+        assert pending.status_code == 409
+        assert pending.headers["retry-after"] == "1"
+
+        provider.gate.set()
+        wait_for(client, queued["id"])
+        stats = client.get("/stats/jobs", headers=AUTH).json()
+
+    assert interactive["lane"] == "interactive"
+    assert provider.horizons == [1, 3, 2]
+    assert stats["succeeded"] == 3 and stats["queued"] == {"interactive": 0, "batch": 0}
+
+
+def test_job_errors_are_reported():
+    provider = FakeProvider(model_id="timesfm", tasks=make_tasks("forecast_point", "forecast_quantile"))
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:")
+    app = create_app(settings=settings, provider=provider)
+    with TestClient(app) as client:
+        assert client.post("/jobs", headers=AUTH, json={**job_request(3), "task": "detect"}).status_code == 400
+        assert client.get("/jobs/missing", headers=AUTH).status_code == 404
+
+        # The fake provider raises for this task.
+        request = {**job_request(horizon=3, count=2), "task": "forecast_quantile"}
+        job = wait_for(client, client.post("/jobs", headers=AUTH, json=request).json()["id"], "failed")
+        result = client.get(f"/jobs/{job['id']}/result", headers=AUTH)
+
+    assert "Unsupported fake task" in job["error"]
+    assert result.status_code == 409
+
+
+def test_submitting_a_job_for_an_unbuilt_model_does_not_block_the_loop():
+    factory = sized_factory({})
+
+    def slow_factory(spec: ModelSpec):
+        if spec.model_id == "chronos-small":
+            # Stands in for importing the model runtime.
+            time.sleep(1.0)
+        return factory(spec)
+
+    app = create_app(
+        settings=Settings(
+            models="timesfm, chronos-small=chronos",
+            api_key="test-key",
+            jobs_db_path=":memory:",
+            warmup_shapes="",
+        ),
+        provider_factory=slow_factory,
+    )
+    with TestClient(app) as client:
+        while client.get("/health").json()["status"] != "ready":
+            time.sleep(0.01)
+        submitted: list = []
+        request = {**job_request(horizon=2), "task": "forecast_quantile", "model": "chronos-small"}
+        thread = threading.Thread(target=lambda: submitted.append(client.post("/jobs", headers=AUTH, json=request)))
+        thread.start()
+        time.sleep(0.1)
+        started = time.monotonic()
+        client.get("/health")
+        elapsed = time.monotonic() - started
+        thread.join()
+
+    assert submitted[0].status_code == 202
+    assert elapsed < 0.5
+
+
+
+def test_finished_jobs_survive_an_app_restart(tmp_path):
+    provider = GatedProvider()
+    provider.gate.set()
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=str(tmp_path / "data" / "jobs.db"))
+
+    with TestClient(create_app(settings=settings, provider=provider)) as client:
+        job = wait_for(client, client.post("/jobs", headers=AUTH, json=job_request(horizon=2)).json()["id"])
+    with TestClient(create_app(settings=settings, provider=provider)) as client:
+        result = client.get(f"/jobs/{job['id']}/result", headers=AUTH)
+
+    assert result.status_code == 200
+    assert result.json()["output"]["forecasts"][0]["mean"] == [0, 1]
+
+def test_sqlite_store_requeues_unfinished_jobs_after_a_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = SQLiteJobStore(path)
+    store.add(
+        JobRecord(id="a", task="forecast_point", model=None, lane="batch", total=1, status="running"),
+        b'{"horizon": 2}',
+    )
+    store.close()
+
+    async def runner(record: JobRecord, payload: dict, progress) -> bytes:
+        return b'{"horizon": %d}' % payload["horizon"]
+
+    async def restart() -> None:
+        queue = JobQueue(SQLiteJobStore(path), runner)
+        await queue.start()
+        for _ in range(100):
+            if (await queue.get("a")).status == "succeeded":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(restart())
+    reopened = SQLiteJobStore(path)
+    assert reopened.get("a").status == "succeeded"
+    assert reopened.result("a") == b'{"horizon": 2}'
+    assert reopened.payload("a") is None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pandas as pd
+import pytest
 
 from app.providers.kronos import KronosProvider
 
@@ -27,6 +28,69 @@ class RecordingPredictor:
         return pd.DataFrame(base, index=y_timestamp)
 
 
+class BatchRecordingPredictor(RecordingPredictor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batch_sizes: list[int] = []
+
+    def predict_batch(self, df_list, x_timestamp_list, y_timestamp_list, **kwargs):
+        self.batch_sizes.append(len(df_list))
+        return [
+            self.predict(df=df, x_timestamp=x_ts, y_timestamp=y_ts, **kwargs)
+            for df, x_ts, y_ts in zip(df_list, x_timestamp_list, y_timestamp_list)
+        ]
+
+
+CANDLES = [
+    {
+        "timestamp": "2026-04-01T00:00:00Z",
+        "open": 189.8,
+        "high": 191.1,
+        "low": 188.9,
+        "close": 190.7,
+        "volume": 52340000,
+    },
+    {
+        "timestamp": "2026-04-02T00:00:00Z",
+        "open": 190.9,
+        "high": 192.2,
+        "low": 190.1,
+        "close": 191.8,
+        "volume": 48720000,
+    },
+]
+
+
+def test_kronos_generate_paths_decodes_samples_in_one_batch():
+    provider = KronosProvider()
+    predictor = BatchRecordingPredictor()
+    provider.predictor = predictor
+
+    output = provider.invoke(
+        "generate_paths",
+        {"symbol": "AAPL", "candles": CANDLES, "horizon": 3, "num_samples": 8},
+    )
+
+    assert predictor.batch_sizes == [8]
+    paths = output["forecasts"][0]["paths"]
+    assert len(paths) == 8
+    assert all(len(path) == 3 for path in paths)
+
+
+def test_kronos_generate_paths_respects_max_batch():
+    provider = KronosProvider(max_batch=16)
+    predictor = BatchRecordingPredictor()
+    provider.predictor = predictor
+
+    output = provider.invoke(
+        "generate_paths",
+        {"symbol": "AAPL", "candles": CANDLES, "horizon": 2, "num_samples": 10, "max_batch": 4},
+    )
+
+    assert predictor.batch_sizes == [4, 4, 2]
+    assert len(output["forecasts"][0]["paths"]) == 10
+
+
 def test_kronos_omits_optional_amount_column_when_missing():
     provider = KronosProvider()
     predictor = RecordingPredictor()
@@ -60,3 +124,38 @@ def test_kronos_omits_optional_amount_column_when_missing():
 
     frame = predictor.calls[0]["df"]
     assert list(frame.columns) == ["open", "high", "low", "close", "volume"]
+
+
+def test_kronos_forecasts_every_series_grouped_by_context_length():
+    provider = KronosProvider(max_batch=2)
+    predictor = BatchRecordingPredictor()
+    provider.predictor = predictor
+    third = {**CANDLES[1], "timestamp": "2026-04-03T00:00:00Z"}
+
+    output = provider.invoke(
+        "forecast_ohlcv",
+        {
+            "series": [
+                {"symbol": "AAPL", "candles": CANDLES},
+                {"symbol": "MSFT", "candles": CANDLES},
+                {"symbol": "NVDA", "candles": CANDLES + [third]},
+                {"symbol": "AMZN", "candles": CANDLES},
+            ],
+            "horizon": 2,
+        },
+    )
+
+    assert [forecast["symbol"] for forecast in output["forecasts"]] == ["AAPL", "MSFT", "NVDA", "AMZN"]
+    assert all(len(forecast["candles"]) == 2 for forecast in output["forecasts"])
+    assert predictor.batch_sizes == [2]
+    assert len(predictor.calls) == 4
+
+
+def test_kronos_rejects_empty_series_entries():
+    provider = KronosProvider()
+    provider.predictor = BatchRecordingPredictor()
+
+    for empty in ({}, None, {"symbol": "MSFT", "candles": []}):
+        with pytest.raises(ValueError, match=r"series \[1\] has no candles"):
+            provider.invoke("forecast_ohlcv", {"series": [{"symbol": "AAPL", "candles": CANDLES}, empty], "horizon": 2})
+    assert provider.predictor.calls == []
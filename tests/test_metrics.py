@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.metrics import Histogram, PrometheusText, stage
+from tests.test_api_v2 import AUTH, FakeProvider, make_tasks
+
+
+class StagedProvider(FakeProvider):
+    def invoke(self, task: str, payload: dict):
+        with stage("input"):
+            pass
+        with stage("forward"):
+            output = super().invoke(task, payload)
+        with stage("format"):
+            return output
+
+
+def samples(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def test_histogram_exposition_is_cumulative_with_sum_and_count():
+    histogram = Histogram("latency", (0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    text = PrometheusText()
+    text.histogram("latency_seconds", "Test latency.", [({"route": 'a"b'}, histogram)])
+
+    rendered = text.render()
+    assert "# TYPE unitshub_latency_seconds histogram" in rendered
+    values = samples(rendered)
+    assert values['unitshub_latency_seconds_bucket{route="a\\"b",le="0.1"}'] == 1
+    assert values['unitshub_latency_seconds_bucket{route="a\\"b",le="+Inf"}'] == 3
+    assert values['unitshub_latency_seconds_count{route="a\\"b"}'] == 3
+
+
+def test_metrics_endpoint_reports_routes_tasks_stages_and_payload_shapes():
+    app = create_app(
+        settings=Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:"),
+        provider=StagedProvider(model_id="timesfm", tasks=make_tasks("forecast_point")),
+    )
+    with TestClient(app, raise_server_exceptions=False) as client:
+        body = {"task": "forecast_point", "input": {"series": [{"target": [1.0] * 40}] * 3, "horizon": 12}}
+        assert client.post("/models/current/invoke", headers=AUTH, json=body).status_code == 200
+        bad = {"task": "forecast_point", "input": {"series": [{"target": [1.0]}]}}
+        assert client.post("/models/current/invoke", headers=AUTH, json=bad).status_code == 500
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", headers=AUTH)
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    values = samples(response.text)
+    assert values['unitshub_http_requests_total{method="POST",route="/models/current/invoke",status="200"}'] == 1
+    assert values['unitshub_http_requests_total{method="POST",route="/models/current/invoke",status="500"}'] == 1
+    assert values['unitshub_task_duration_seconds_count{model="timesfm",task="forecast_point"}'] == 2
+    assert values['unitshub_task_errors_total{model="timesfm",task="forecast_point",error="KeyError"}'] == 1
+    for name in ("input", "forward", "format"):
+        assert values[f'unitshub_provider_stage_seconds_count{{model="timesfm",task="forecast_point",stage="{name}"}}'] >= 1
+    assert values['unitshub_request_stage_seconds_count{stage="validate"}'] == 2
+    assert values['unitshub_request_series_sum{task="forecast_point"}'] == 4
+    assert values['unitshub_series_length_bucket{task="forecast_point",le="32"}'] == 1
+    assert values['unitshub_horizon_sum{task="forecast_point"}'] == 12
+    assert values['unitshub_model_loaded{model="timesfm"}'] == 1
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import torch
+
+from app.config import Settings
+from app.providers.chronos import ChronosProvider
+from app.providers.onnx_runtime import OnnxChronosProvider, OnnxTimesFMProvider
+from app.providers.registry import create_provider
+from app.providers.timesfm import TimesFMProvider
+
+
+class RecordingSession:
+    def __init__(self, output_width: int) -> None:
+        self.output_width = output_width
+        self.feeds: list[dict[str, np.ndarray]] = []
+
+    def run(self, output_names, feeds):
+        self.feeds.append(feeds)
+        values = feeds.get("past_values", feeds.get("context"))
+        last = np.nan_to_num(values[:, -1:])
+        if "context" in feeds:
+            # (batch, quantiles, horizon), one quantile per requested level.
+            width = len(feeds["output_patches"]) * 4
+            return [np.repeat(last[:, None, :], width, axis=2).repeat(3, axis=1)]
+        return [np.repeat(last, self.output_width, axis=1)]
+
+
+def test_onnx_runtime_is_selected_by_configuration():
+    settings = Settings(model_runtime="onnx", onnx_intra_op_threads=2, onnx_graph_optimization="extended")
+    provider = create_provider(settings, "timesfm")
+    assert isinstance(provider, OnnxTimesFMProvider)
+    assert provider.intra_op_threads == 2
+    assert provider.runtime == "onnxruntime"
+    assert isinstance(create_provider(settings, "chronos"), OnnxChronosProvider)
+    assert type(create_provider(Settings(), "timesfm")) is TimesFMProvider
+
+
+def test_onnx_timesfm_pads_length_buckets_like_transformers():
+    provider = OnnxTimesFMProvider()
+    provider.session = RecordingSession(128)
+
+    output = provider.invoke(
+        "forecast_point",
+        {"series": [{"target": [1.0] * 10}, {"target": [2.0] * 40}], "horizon": 3, "frequency": "w"},
+    )
+
+    assert [item["mean"] for item in output["forecasts"]] == [[1.0] * 3, [2.0] * 3]
+    # The 32-step bucket is widened to the exported graph's two-patch minimum.
+    (feeds,) = provider.session.feeds
+    assert feeds["past_values"].shape == (2, 64)
+    assert feeds["past_values_padding"][0].tolist() == [1.0] * 54 + [0.0] * 10
+    assert feeds["past_values_padding"][1].tolist() == [1.0] * 24 + [0.0] * 40
+    assert feeds["freq"].tolist() == [[1], [1]]
+
+
+def test_onnx_chronos_left_pads_with_nan_and_limits_horizon():
+    provider = OnnxChronosProvider()
+    provider.session = RecordingSession(0)
+    provider.loaded = True
+    provider.context_len = 16
+    provider.input_patch_size = 4
+    provider.output_patch_size = 4
+    provider.max_output_patches = 2
+    provider.quantiles = [0.1, 0.5, 0.9]
+
+    output = provider.invoke(
+        "forecast_quantile",
+        {"series": [{"target": [1.0] * 20}, {"target": [2.0] * 5}], "horizon": 6, "quantiles": [0.1, 0.5, 0.9]},
+    )
+
+    assert output["forecasts"][1]["mean"] == [2.0] * 6
+    feeds = provider.session.feeds[0]
+    assert feeds["context"].shape == (2, 16)
+    assert np.isnan(feeds["context"][1, :11]).all()
+    assert feeds["group_ids"].tolist() == [0, 1]
+    assert len(feeds["output_patches"]) == 2
+    with pytest.raises(ValueError):
+        provider.invoke("forecast_quantile", {"series": [{"target": [1.0] * 8}], "horizon": 9})
+
+
+def test_exported_timesfm_matches_transformers(tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnxscript")
+    transformers = pytest.importorskip("transformers")
+    from app.onnx_export import export_model
+
+    torch.manual_seed(0)
+    config = transformers.TimesFmConfig(
+        num_hidden_layers=1,
+        hidden_size=32,
+        intermediate_size=32,
+        head_dim=8,
+        num_attention_heads=4,
+        context_length=128,
+    )
+    transformers.TimesFmModelForPrediction(config).save_pretrained(tmp_path)
+    export_model("timesfm", str(tmp_path))
+
+    eager = TimesFMProvider()
+    eager.load(str(tmp_path), "cpu")
+    exported = OnnxTimesFMProvider()
+    exported.load(str(tmp_path), "cpu")
+    payload = {"series": [{"target": [float(idx % 7) for idx in range(length)]} for length in (20, 100)], "horizon": 8}
+
+    expected = [item["mean"] for item in eager.invoke("forecast_point", payload)["forecasts"]]
+    actual = [item["mean"] for item in exported.invoke("forecast_point", payload)["forecasts"]]
+    assert np.allclose(actual, expected, atol=1e-4)
+
+
+def test_exported_chronos_matches_the_pipeline(tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnxscript")
+    chronos2 = pytest.importorskip("chronos.chronos2")
+    from app.onnx_export import export_model
+
+    torch.manual_seed(0)
+    config = chronos2.Chronos2CoreConfig(
+        d_model=32,
+        d_kv=8,
+        d_ff=32,
+        num_layers=1,
+        num_heads=4,
+        dropout_rate=0.0,
+        chronos_config={
+            "context_length": 64,
+            "input_patch_size": 8,
+            "output_patch_size": 8,
+            "input_patch_stride": 8,
+            "quantiles": [round(0.1 * level, 1) for level in range(1, 10)],
+            "max_output_patches": 2,
+            "use_reg_token": True,
+            "use_arcsinh": True,
+        },
+    )
+    config.chronos_pipeline_class = "Chronos2Pipeline"
+    config.architectures = ["Chronos2Model"]
+    chronos2.Chronos2Model(config).save_pretrained(tmp_path)
+    export_model("chronos", str(tmp_path))
+
+    eager = ChronosProvider()
+    eager.load(str(tmp_path), "cpu")
+    exported = OnnxChronosProvider()
+    exported.load(str(tmp_path), "cpu")
+    payload = {
+        "series": [{"target": [float(idx % 5) for idx in range(length)]} for length in (12, 80)],
+        "horizon": 12,
+        "quantiles": [0.1, 0.5, 0.9],
+    }
+
+    expected = eager.invoke("forecast_quantile", payload)["forecasts"]
+    actual = exported.invoke("forecast_quantile", payload)["forecasts"]
+    assert np.allclose([item["mean"] for item in actual], [item["mean"] for item in expected], atol=1e-4)
+    for got, want in zip(actual, expected):
+        for level, values in want["quantiles"].items():
+            assert np.allclose(got["quantiles"][level], values, atol=1e-4)
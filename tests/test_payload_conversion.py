@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import numpy as np
+import torch
+
+from app.providers.chronos import ChronosProvider
+from app.providers.shared import flatten_targets
+
+
+class QuantilePipeline:
+    quantiles = [0.1, 0.5, 0.9]
+
+    def __init__(self) -> None:
+        self.inputs: list[torch.Tensor] = []
+
+    def predict(self, inputs, prediction_length):
+        self.inputs = inputs
+        # Chronos-2 shape: one (variates, quantiles, horizon) tensor per series.
+        return [
+            torch.stack([context[-1:].expand(prediction_length) + offset for offset in (-1.0, 0.0, 1.0)])[None]
+            for context in inputs
+        ]
+
+
+def test_flatten_targets_packs_lists_and_arrays_into_one_buffer():
+    flat, spans = flatten_targets([[1, 2, 3], np.array([4.0, 5.0]), []], tail=2)
+
+    assert flat.dtype == np.float32
+    assert flat.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert spans == [(0, 2), (2, 4), (4, 4)]
+
+
+def test_chronos_contexts_share_one_buffer_and_results_keep_their_shape():
+    provider = ChronosProvider()
+    provider.pipeline = QuantilePipeline()
+    provider.quantiles = list(QuantilePipeline.quantiles)
+    provider.loaded = True
+
+    output = provider.invoke(
+        "forecast_quantile",
+        {"series": [{"target": [1.0, 2.0]}, {"target": [3.0, 4.0, 5.0]}], "horizon": 2, "quantiles": [0.1, 0.9]},
+    )
+
+    first, second = provider.pipeline.inputs
+    assert first.untyped_storage().data_ptr() == second.untyped_storage().data_ptr()
+    assert second.tolist() == [3.0, 4.0, 5.0]
+    assert output["forecasts"] == [
+        {"mean": [2.0, 2.0], "quantiles": {"0.1": [1.0, 1.0], "0.9": [3.0, 3.0]}},
+        {"mean": [5.0, 5.0], "quantiles": {"0.1": [4.0, 4.0], "0.9": [6.0, 6.0]}},
+    ]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.pool import ModelPool, ModelSpec, parse_model_specs, parse_warmup_shapes
+from tests.test_api_v2 import AUTH, FakeProvider, make_tasks
+
+
+class SizedProvider(FakeProvider):
+    def __init__(self, model_id: str, size: int) -> None:
+        super().__init__(model_id=model_id, tasks=make_tasks("forecast_point", "forecast_quantile"))
+        self.loaded = False
+        self.size = size
+        self.load_calls = 0
+        self.invocations: list[tuple[str, int]] = []
+
+    def load(self, model_path: str, device: str) -> None:
+        self.load_calls += 1
+        self.loaded = True
+
+    def invoke(self, task: str, payload: dict):
+        self.invocations.append((task, len(payload.get("series") or [])))
+        return super().invoke(task, payload)
+
+    def memory_bytes(self) -> int:
+        return self.size
+
+
+def sized_factory(created: dict):
+    def factory(spec: ModelSpec) -> SizedProvider:
+        provider = SizedProvider(spec.model_type, size=100)
+        created.setdefault(spec.model_id, []).append(provider)
+        return provider
+
+    return factory
+
+
+def test_parse_model_specs_supports_aliases():
+    specs = parse_model_specs(Settings(models="timesfm, chronos-small=chronos", models_dir="/models"))
+    assert specs == [
+        ModelSpec("timesfm", "timesfm", "/models/timesfm"),
+        ModelSpec("chronos-small", "chronos", "/models/chronos-small"),
+    ]
+    assert parse_model_specs(Settings(model_type="kronos", models_dir="/m")) == [ModelSpec("kronos", "kronos", "/m/kronos")]
+
+
+def test_pool_unloads_least_recently_used_idle_model():
+    specs = [ModelSpec(name, "timesfm", f"/models/{name}") for name in ("default", "a", "b")]
+    pool = ModelPool(specs, sized_factory({}), "cpu", memory_budget_bytes=250)
+
+    pool.load("default")
+    pool.load("a")
+    pool.load("b")
+    assert set(pool.loaded_ids()) == {"default", "b"}
+    assert pool.stats()["evictions"] == 1
+
+    pool.load("a")
+    assert set(pool.loaded_ids()) == {"default", "a"}
+
+
+def test_pool_keeps_leased_models_loaded():
+    specs = [ModelSpec(name, "timesfm", f"/models/{name}") for name in ("default", "a", "b")]
+    pool = ModelPool(specs, sized_factory({}), "cpu", memory_budget_bytes=250)
+
+    pool.load("default")
+    busy = pool.acquire("a")
+    pool.load("b")
+    assert busy.loaded
+    assert set(pool.loaded_ids()) == {"default", "a", "b"}
+    pool.release("a")
+
+    pool.load("default")
+    assert pool.unload("a")
+    assert set(pool.loaded_ids()) == {"default", "b"}
+
+
+def test_hosted_models_are_routed_by_id():
+    created: dict = {}
+    app = create_app(
+        settings=Settings(
+            model_type="timesfm",
+            api_key="test-key",
+            jobs_db_path=":memory:",
+            models="timesfm,chronos-small=chronos",
+        ),
+        provider=FakeProvider(model_id="timesfm", tasks=make_tasks("forecast_point")),
+        provider_factory=sized_factory(created),
+    )
+    body = {"task": "forecast_quantile", "input": {"history": [1.0, 2.0], "horizon": 2}}
+    with TestClient(app) as client:
+        listing = client.get("/models", headers=AUTH).json()
+        assert [model["loaded"] for model in listing["models"]] == [True, False]
+
+        response = client.post("/models/chronos-small/invoke", headers=AUTH, json=body)
+        assert response.status_code == 200
+        assert response.json()["model"] == "chronos-small"
+
+        routed = client.post("/models/current/invoke", headers=AUTH, json={**body, "model": "chronos-small"})
+        assert routed.json()["output"] == response.json()["output"]
+
+        legacy = client.post(
+            "/chronos/forecast",
+            headers=AUTH,
+            json={"series": [1.0, 2.0, 3.0], "horizon": 2, "quantiles": [0.5]},
+        )
+        assert legacy.status_code == 200
+
+        assert client.post("/models/missing/invoke", headers=AUTH, json=body).status_code == 404
+        assert client.get("/health").json()["loaded_models"] == ["timesfm", "chronos-small"]
+
+    assert created["chronos-small"][0].load_calls == 1
+
+
+def test_pool_warms_up_models_after_loading():
+    created: dict = {}
+    pool = ModelPool(
+        [ModelSpec("timesfm", "timesfm", "/models/timesfm")],
+        sized_factory(created),
+        "cpu",
+        warmup_shapes=parse_warmup_shapes("1x32, 4x64"),
+        warmup_horizon=8,
+    )
+    assert pool.status("timesfm")["state"] == "unloaded"
+
+    pool.load("timesfm")
+    assert created["timesfm"][0].invocations == [("forecast_point", 1), ("forecast_point", 4)]
+    status = pool.status("timesfm")
+    assert status["state"] == "ready"
+    assert status["progress"] == 1.0
+
+
+def test_default_model_loads_in_background():
+    created: dict = {}
+    app = create_app(
+        settings=Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:", warmup_shapes="2x16"),
+        provider_factory=sized_factory(created),
+    )
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 5
+        while client.get("/health").json()["status"] != "ready" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        health = client.get("/health").json()
+        assert health["load"]["progress"] == 1.0
+        assert client.get("/health/ready").status_code == 200
+
+    assert created["timesfm"][0].invocations == [("forecast_point", 2)]
+
+
+def test_slow_provider_construction_does_not_block_health():
+    created: dict = {}
+    factory = sized_factory(created)
+
+    def slow_factory(spec: ModelSpec) -> SizedProvider:
+        # Stands in for importing torch and the model runtime.
+        time.sleep(1.0)
+        return factory(spec)
+
+    app = create_app(
+        settings=Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:", warmup_shapes=""),
+        provider_factory=slow_factory,
+    )
+    with TestClient(app) as client:
+        time.sleep(0.1)
+        started = time.monotonic()
+        health = client.get("/health")
+        elapsed = time.monotonic() - started
+        client.get("/metrics", headers=AUTH)
+
+    assert health.status_code == 200
+    assert elapsed < 0.5
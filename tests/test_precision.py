@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+import torch
+
+from app.precision import effective_precision, parse_precisions, quantize_linear_layers, resolve_precision
+
+
+def test_precision_settings_support_per_model_overrides():
+    assert parse_precisions("") == ("fp32", {})
+    assert parse_precisions("bf16, timesfm=int8") == ("bf16", {"timesfm": "int8"})
+    assert resolve_precision("fp32,chronos-small=int8", "chronos-small", "chronos") == "int8"
+    assert resolve_precision("fp32,chronos=bf16", "chronos-large", "chronos") == "bf16"
+    assert resolve_precision("int8", "timesfm") == "int8"
+    with pytest.raises(ValueError):
+        parse_precisions("fp8")
+
+
+def test_reduced_precision_only_applies_on_cpu():
+    assert effective_precision("int8", "cpu") == "int8"
+    assert effective_precision("int8", "cuda") == "fp32"
+
+
+def test_dynamic_int8_quantization_stays_close_to_fp32():
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(32, 64), torch.nn.ReLU(), torch.nn.Linear(64, 8)).eval()
+    inputs = torch.randn(16, 32)
+    expected = model(inputs)
+
+    quantized = quantize_linear_layers(model)
+    assert quantized is model
+    assert isinstance(model[0], torch.ao.nn.quantized.dynamic.Linear)
+    assert torch.allclose(model(inputs), expected, atol=0.05)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.responses import ForecastJSONResponse
+from tests.test_api_v2 import AUTH, FakeProvider, make_tasks
+
+
+class ArrayProvider(FakeProvider):
+    def invoke(self, task: str, payload: dict):
+        values = np.array([[1 / 3, 2 / 3, np.nan], [4.0, 5.0, 6.0]], dtype=np.float32)
+        return {"forecasts": [{"mean": values[0], "quantiles": {"0.5": values[:, 1]}}, {"mean": values[1].tolist()}]}
+
+
+def test_forecast_response_serializes_numpy_and_rounds_floats():
+    matrix = np.arange(6, dtype=np.float64).reshape(2, 3) / 7
+    response = ForecastJSONResponse(
+        {"row": matrix[0], "column": matrix[:, 1], "scalar": np.float32(0.5), "items": [1 / 7, 2 / 7]},
+        float_digits=3,
+    )
+
+    assert json.loads(response.body) == {
+        "row": [0.0, 0.143, 0.286],
+        "column": [0.143, 0.571],
+        "scalar": 0.5,
+        "items": [0.143, 0.286],
+    }
+
+
+def test_invoke_returns_provider_arrays_without_response_model_validation():
+    app = create_app(
+        settings=Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:", response_float_digits=2),
+        provider=ArrayProvider(model_id="timesfm", tasks=make_tasks("forecast_point")),
+    )
+    with TestClient(app) as client:
+        response = client.post(
+            "/models/current/invoke",
+            headers=AUTH,
+            json={"task": "forecast_point", "input": {"series": [{"target": [1.0]}], "horizon": 3}},
+        )
+
+    assert response.status_code == 200
+    first, second = response.json()["output"]["forecasts"]
+    # NaN has no JSON literal; orjson writes null.
+    assert first == {"mean": [0.33, 0.67, None], "quantiles": {"0.5": [0.67, 5.0]}}
+    assert second == {"mean": [4.0, 5.0, 6.0]}
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.sessions import ForecastSession, RingBuffer, SessionStore, UnknownSessionError
+from tests.test_api_v2 import AUTH, FakeProvider, make_tasks
+
+
+class RecordingProvider(FakeProvider):
+    def __init__(self) -> None:
+        super().__init__(model_id="timesfm", tasks=make_tasks("forecast_point"))
+        self.contexts: list[list[float]] = []
+
+    def descriptor(self):
+        return super().descriptor().model_copy(update={"input_modes": ["univariate"]})
+
+    def invoke(self, task: str, payload: dict):
+        self.contexts.append([float(value) for value in payload["series"][0]["target"]])
+        return super().invoke(task, payload)
+
+
+def test_ring_buffer_keeps_the_latest_window_as_one_view():
+    buffer = RingBuffer(4)
+    buffer.extend([1, 2, 3])
+    buffer.extend([4, 5])
+    assert buffer.view().tolist() == [2, 3, 4, 5]
+    buffer.extend(range(6, 16))
+    view = buffer.view()
+    assert view.tolist() == [12, 13, 14, 15]
+    assert view.flags["C_CONTIGUOUS"] and np.shares_memory(view, buffer._data)
+
+
+def test_session_store_evicts_least_recently_used_and_idle_sessions():
+    store = SessionStore(max_sessions=2, ttl_seconds=0)
+    first, second, third = (ForecastSession("forecast_point", None, {}, 8) for _ in range(3))
+    store.add(first)
+    store.add(second)
+    store.get(first.id)
+    store.add(third)
+    with pytest.raises(UnknownSessionError):
+        store.get(second.id)
+    assert store.stats()["evictions"] == 1
+
+    store.ttl_seconds = 0.01
+    time.sleep(0.02)
+    with pytest.raises(UnknownSessionError):
+        store.get(first.id)
+    assert store.stats()["expired"] == 2
+
+
+def test_session_appends_update_the_forecast_from_the_windowed_context():
+    provider = RecordingProvider()
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:")
+    app = create_app(settings=settings, provider=provider)
+
+    with TestClient(app) as client:
+        created = client.post(
+            "/sessions",
+            headers=AUTH,
+            json={"input": {"horizon": 2}, "history": [1.0, 2.0, 3.0, 4.0, 5.0], "window": 4},
+        )
+        assert created.status_code == 201
+        session = created.json()["metadata"]["session"]
+        assert created.json()["output"]["forecasts"][0]["mean"] == [0, 1]
+
+        updated = client.post(f"/sessions/{session['id']}/append", headers=AUTH, json={"values": [6.0]})
+        recorded = client.post(
+            f"/sessions/{session['id']}/append",
+            headers=AUTH,
+            json={"values": [7.0, 8.0], "forecast": False},
+        )
+        forecast = client.get(f"/sessions/{session['id']}/forecast", headers=AUTH)
+        repeated = client.get(f"/sessions/{session['id']}/forecast", headers=AUTH)
+
+        assert client.delete(f"/sessions/{session['id']}", headers=AUTH).status_code == 204
+        assert client.get(f"/sessions/{session['id']}", headers=AUTH).status_code == 404
+
+    assert updated.json()["metadata"]["session"]["observations"] == 6
+    assert recorded.json()["output"] is None
+    assert forecast.json() == repeated.json()
+    # The repeated read is served from the session without another model call.
+    assert provider.contexts == [[2.0, 3.0, 4.0, 5.0], [3.0, 4.0, 5.0, 6.0], [5.0, 6.0, 7.0, 8.0]]
+
+
+def test_sessions_require_a_univariate_task():
+    app = create_app(
+        settings=Settings(model_type="kronos", api_key="test-key", jobs_db_path=":memory:"),
+        provider=FakeProvider(model_id="kronos", tasks=make_tasks("forecast_ohlcv")),
+    )
+    with TestClient(app) as client:
+        response = client.post("/sessions", headers=AUTH, json={"task": "forecast_ohlcv", "input": {"horizon": 2}})
+    assert response.status_code == 400
+
+
+def test_explicit_session_windows_are_capped_and_reported_in_metrics():
+    provider = RecordingProvider()
+    settings = Settings(model_type="timesfm", api_key="test-key", jobs_db_path=":memory:", session_max_window=4)
+    app = create_app(settings=settings, provider=provider)
+
+    with TestClient(app) as client:
+        body = {"input": {"horizon": 2}, "history": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0], "window": 1_000_000}
+        created = client.post("/sessions", headers=AUTH, json=body)
+        metrics = client.get("/metrics", headers=AUTH).text
+
+    assert created.json()["metadata"]["session"]["window"] == 4
+    assert provider.contexts == [[3.0, 4.0, 5.0, 6.0]]
+    assert 'unitshub_series_length_count{task="forecast_point"} 1' in metrics
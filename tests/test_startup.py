@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_server_startup_path_skips_model_runtimes_and_stays_within_budget():
+    # A generous budget: the check is about import-graph regressions, not machine speed.
+    result = subprocess.run(
+        [sys.executable, "scripts/check_import_time.py", "--budget-ms", "4000"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_model_runtime_is_imported_only_for_the_active_provider():
+    code = (
+        "import sys\n"
+        "from app.config import Settings\n"
+        "from app.providers import create_provider\n"
+        "create_provider(Settings(model_type='kronos'))\n"
+        "print(','.join(sorted(m for m in ('app.providers.timesfm', 'app.providers.chronos', 'transformers') if m in sys.modules)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
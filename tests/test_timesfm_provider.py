@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import torch
+
+from app.providers.timesfm import TimesFMProvider
+
+
+class RecordingTimesFm:
+    dtype = torch.float32
+    device = torch.device("cpu")
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, object]] = []
+
+    def __call__(self, past_values, freq, forecast_context_len, return_dict):
+        self.calls.append({"lengths": [len(ts) for ts in past_values], "context_len": forecast_context_len})
+        # Echo the last observed value so results can be matched to inputs.
+        last = torch.stack([ts[-1] for ts in past_values])
+        return SimpleNamespace(mean_predictions=last[:, None].repeat(1, 128))
+
+
+def test_timesfm_handles_mixed_length_series_in_length_buckets():
+    provider = TimesFMProvider()
+    model = RecordingTimesFm()
+    provider.model = model
+
+    output = provider.invoke(
+        "forecast_point",
+        {
+            "series": [
+                {"target": [1.0] * 10},
+                {"target": [2.0] * 200},
+                {"target": [3.0] * 20},
+                {"target": [4.0] * 900},
+            ],
+            "horizon": 3,
+        },
+    )
+
+    assert [forecast["mean"] for forecast in output["forecasts"]] == [
+        [1.0] * 3,
+        [2.0] * 3,
+        [3.0] * 3,
+        [4.0] * 3,
+    ]
+    assert sorted(call["context_len"] for call in model.calls) == [32, 256, 512]
+    long_call = next(call for call in model.calls if call["context_len"] == 512)
+    assert long_call["lengths"] == [512]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from app.weights import map_module_weights, mmap_safetensors, process_memory
+
+
+class TinyModel(torch.nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.proj = torch.nn.Linear(8, 4)
+        self.norm = torch.nn.LayerNorm(4)
+
+    def forward(self, inputs: torch.Tensor) -> torch.Tensor:
+        return self.norm(self.proj(inputs))
+
+
+def test_mmap_safetensors_matches_checkpoint(tmp_path):
+    tensors = {"a": torch.randn(3, 5), "b": torch.arange(7, dtype=torch.int64), "c": torch.randn(2).to(torch.bfloat16)}
+    save_file(tensors, str(tmp_path / "model.safetensors"))
+
+    mapped = mmap_safetensors(str(tmp_path / "model.safetensors"))
+    assert set(mapped) == set(tensors)
+    for name, tensor in tensors.items():
+        assert mapped[name].dtype == tensor.dtype
+        assert torch.equal(mapped[name], tensor)
+
+
+def test_map_module_weights_swaps_matching_parameters(tmp_path):
+    source = TinyModel()
+    save_file(source.state_dict(), str(tmp_path / "model.safetensors"))
+    model = TinyModel()
+    model.load_state_dict(source.state_dict())
+    inputs = torch.randn(2, 8)
+    expected = model(inputs)
+
+    mapped_bytes = map_module_weights(model, str(tmp_path))
+    assert mapped_bytes == sum(p.numel() * p.element_size() for p in model.parameters())
+    assert torch.equal(model(inputs), expected)
+
+    # Mismatched dtypes keep their loaded copy.
+    assert map_module_weights(TinyModel().to(torch.float64), str(tmp_path)) == 0
+
+
+def test_process_memory_reports_shared_and_private_bytes():
+    memory = process_memory()
+    if memory is None:
+        pytest.skip("/proc/self/smaps_rollup is not available")
+    assert memory["rss_bytes"] >= memory["private_bytes"] > 0
+    assert "shared_bytes" in memory
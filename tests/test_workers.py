@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from app.workers import ProcessProvider, WorkerCrashedError, core_sets, pack_series, unpack_series
+from tests.test_api_v2 import FakeProvider, make_tasks
+
+
+def _fail_outside(pid: int) -> None:
+    if os.getpid() != pid:
+        raise RuntimeError("This result can only be read in the worker.")
+
+
+class Unreadable:
+    def __reduce__(self):
+        return _fail_outside, (os.getpid(),)
+
+
+class SummingProvider(FakeProvider):
+    def invoke(self, task: str, payload: dict):
+        if task == "crash":
+            os._exit(3)
+        if task == "unreadable":
+            return {"forecasts": [Unreadable()]}
+        if task == "hang":
+            time.sleep(30)
+        return {
+            "pid": os.getpid(),
+            "forecasts": [{"mean": [float(sum(item["target"]))]} for item in payload["series"]],
+        }
+
+
+def make_summing_provider() -> SummingProvider:
+    return SummingProvider(model_id="timesfm", tasks=make_tasks("forecast_point", "crash", "hang", "unreadable"))
+
+
+def test_core_sets_split_cpus_into_contiguous_ranges():
+    assert core_sets(3, cpus=list(range(8))) == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    assert core_sets(4, cpus=[0, 1]) == [[0, 1]] * 4
+
+
+def test_pack_series_stages_large_targets_in_shared_memory():
+    payload = {"horizon": 2, "series": [{"item_id": "a", "target": list(range(5000))}, {"target": [1.0, 2.0]}]}
+    packed, shm = pack_series(payload)
+    assert shm is not None
+    try:
+        unpacked = unpack_series(packed, shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+    assert unpacked["series"][0]["item_id"] == "a"
+    assert unpacked["series"][0]["target"].tolist() == list(range(5000))
+    assert unpacked["series"][1]["target"].tolist() == [1.0, 2.0]
+
+    small, no_shm = pack_series({"series": [{"target": [1.0]}]})
+    assert no_shm is None and small["series"][0]["target"] == [1.0]
+
+
+def test_process_provider_routes_batches_to_worker_processes():
+    provider = ProcessProvider(make_summing_provider, processes=2)
+    provider.load("/models/unused", "cpu")
+    try:
+        assert provider.descriptor().id == "timesfm"
+        futures = [
+            provider.workers.submit("forecast_point", {"series": [{"target": [float(idx)] * 5000}]})
+            for idx in range(4)
+        ]
+        outputs = [future.result(timeout=30) for future in futures]
+        assert [output["forecasts"][0]["mean"] for output in outputs] == [[0.0], [5000.0], [10000.0], [15000.0]]
+        assert len({output["pid"] for output in outputs}) == 2
+
+        with pytest.raises(WorkerCrashedError):
+            provider.invoke("crash", {"series": [{"target": [1.0]}]})
+        assert provider.invoke("forecast_point", {"series": [{"target": [1.0, 2.0]}]})["forecasts"] == [{"mean": [3.0]}]
+        assert sum(worker["restarts"] for worker in provider.workers.stats()["workers"]) == 1
+    finally:
+        provider.unload()
+
+
+def test_dead_workers_are_detected_under_steady_traffic_and_calls_time_out():
+    provider = ProcessProvider(make_summing_provider, processes=2)
+    provider.load("/models/unused", "cpu")
+    try:
+        crashed = provider.workers.submit("crash", {"series": [{"target": [1.0]}]})
+        # The surviving worker keeps the response queue busy the whole time.
+        deadline = time.monotonic() + 60
+        while not crashed.done() and time.monotonic() < deadline:
+            provider.invoke("forecast_point", {"series": [{"target": [1.0]}]})
+        assert isinstance(crashed.exception(timeout=5), WorkerCrashedError)
+
+        provider.invoke_timeout = 1.0
+        with pytest.raises(TimeoutError):
+            provider.invoke("hang", {"series": [{"target": [1.0]}]})
+    finally:
+        provider.unload()
+
+
+def test_pending_calls_fail_when_the_collector_stops():
+    provider = ProcessProvider(make_summing_provider, processes=2)
+    provider.load("/models/unused", "cpu")
+    try:
+        hanging = provider.workers.submit("hang", {"series": [{"target": [1.0]}]})
+        with pytest.raises(WorkerCrashedError):
+            provider.invoke("unreadable", {"series": [{"target": [1.0]}]})
+        assert isinstance(hanging.exception(timeout=5), WorkerCrashedError)
+        with pytest.raises(WorkerCrashedError):
+            provider.invoke("forecast_point", {"series": [{"target": [1.0]}]})
+    finally:
+        provider.unload()